@@ -0,0 +1,135 @@
+"""Load test lokal ``tbc.api``: throughput dan latensi jalur cache.
+
+Server dijalankan di proses terpisah (``python -m tbc.api``); klien adalah
+thread dengan koneksi keep-alive masing-masing yang mengirim campuran query
+batch (beberapa kode BPS acak per request, JSON dan Arrow). Setelah pemanasan,
+semua query ada di LRU, jadi yang diukur adalah jalur cache. Dengan
+``--etag`` sebagian request mengirim ``If-None-Match`` (jawaban 304).
+
+    python benchmarks/bench_api.py [--clients 8] [--durasi 10] [--query 200] [--etag 0.5]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _port_bebas():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _tunggu(port, batas=120):
+    stop = time.perf_counter() + batas
+    while time.perf_counter() < stop:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("GET", "/v1/versi")
+            body = conn.getresponse().read()
+            conn.close()
+            return json.loads(body)
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server tbc.api tidak siap")
+
+
+def _daftar_query(kode, n, rng):
+    query = []
+    for i in range(n):
+        pilih = rng.choice(kode, size=rng.integers(1, min(8, len(kode)) + 1), replace=False)
+        path = "/v1/tren" if i % 4 == 3 else "/v1/kabupaten"
+        fmt = "&format=arrow" if i % 3 == 2 else ""
+        query.append(f"{path}?kode={','.join(map(str, sorted(pilih)))}{fmt}")
+    return query + ["/v1/provinsi", "/v1/kabupaten"]
+
+
+def _beban(port, query, clients, durasi, etag):
+    latensi, status = [], Counter()
+    lock = threading.Lock()
+    mulai = threading.Barrier(clients + 1)
+    stop = [float("inf")]
+
+    def klien(i):
+        rng = np.random.default_rng(i)
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        etags, lokal, st = {}, [], Counter()
+        mulai.wait()
+        while time.perf_counter() < stop[0]:
+            q = query[rng.integers(len(query))]
+            header = {"X-Tenant": f"tim-{i % 3}"}
+            if q in etags and rng.random() < etag:
+                header["If-None-Match"] = etags[q]
+            t0 = time.perf_counter()
+            conn.request("GET", q, headers=header)
+            resp = conn.getresponse()
+            resp.read()
+            lokal.append(time.perf_counter() - t0)
+            st[resp.status] += 1
+            etags[q] = resp.getheader("ETag")
+        conn.close()
+        with lock:
+            latensi.extend(lokal)
+            status.update(st)
+
+    threads = [threading.Thread(target=klien, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    mulai.wait()
+    t0 = time.perf_counter()
+    stop[0] = t0 + durasi
+    for t in threads:
+        t.join()
+    return np.array(latensi) * 1e3, status, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--durasi", type=float, default=10.0)
+    parser.add_argument("--query", type=int, default=200, help="jumlah query batch berbeda")
+    parser.add_argument("--etag", type=float, default=0.0, help="proporsi request dengan If-None-Match")
+    args = parser.parse_args()
+
+    port = _port_bebas()
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    server = subprocess.Popen([sys.executable, "-m", "tbc.api", "--port", str(port)], cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL)
+    try:
+        versi = _tunggu(port)
+        kode = [w["kode_bps"] for w in versi["wilayah"]]
+        query = _daftar_query(kode, args.query, np.random.default_rng(0))
+
+        _beban(port, query, args.clients, 2.0, 0.0)  # pemanasan: isi LRU
+        lat, status, detik = _beban(port, query, args.clients, args.durasi, args.etag)
+
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        conn.request("GET", "/v1/status")
+        stat = json.loads(conn.getresponse().read())
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"{len(query)} query, {args.clients} klien, {os.cpu_count()} core, If-None-Match {args.etag:.0%}")
+    print(f"{len(lat) / detik:>10.0f} req/s   p50 {np.percentile(lat, 50):.2f} ms   "
+          f"p99 {np.percentile(lat, 99):.2f} ms   status {dict(status)}")
+    cache = stat["cache"]
+    hit, miss = cache.get("respons_hit", 0), cache.get("respons_miss", 0)
+    print(f"cache respons: {hit} hit / {miss} miss ({hit / max(hit + miss, 1):.1%}), "
+          f"304: {cache.get('304', 0)}, tenant {stat['tenant']}")
+
+
+if __name__ == "__main__":
+    main()
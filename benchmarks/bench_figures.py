@@ -0,0 +1,73 @@
+"""Biaya render figure per halaman: ``px`` tiap rerun vs cache spec ``tbc.figures``.
+
+Jalankan dari root repo:
+
+    python benchmarks/bench_figures.py
+
+"render" = bangun figure + serialisasi seperti yang dilakukan ``st.plotly_chart``
+(``return_figure_from_figure_or_data`` lalu ``plotly.io.to_json``).
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import plotly.io
+import plotly.tools
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tbc import data, figures  # noqa: E402
+
+
+def _render(fig):
+    spec = plotly.tools.return_figure_from_figure_or_data(fig, validate_figure=True)
+    return plotly.io.to_json(spec, validate=False)
+
+
+def _time(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    snap = data.snapshot()
+    kab = snap.kabupaten_list[0]
+    halaman = {
+        "Home": (
+            [figures._build_bar, figures._build_hist],
+            [figures.fig_bar, figures.fig_hist],
+        ),
+        "Ukuran Epidemiologi": (
+            [figures._build_scan],
+            [lambda s: figures.fig_scan(s, 1000.0)],
+        ),
+        f"Tren Kasus ({data.ALL_KAB})": (
+            [figures._build_total, figures._build_kab],
+            [figures.fig_total, figures.fig_kab],
+        ),
+        f"Tren Kasus ({kab})": (
+            [figures._build_total, figures._build_kab],
+            [figures.fig_total, lambda s: figures.fig_kab(s, kab)],
+        ),
+    }
+
+    print(f"{'halaman':<40}{'px/rerun':>12}{'cold':>12}{'cached':>12}{'speedup':>10}")
+    for nama, (builders, cached) in halaman.items():
+        before = _time(lambda: [_render(b(snap)) for b in builders])
+        figures.clear()
+        t0 = time.perf_counter()
+        for fn in cached:
+            _render(fn(snap))
+        cold = time.perf_counter() - t0
+        after = _time(lambda: [_render(fn(snap)) for fn in cached])
+        print(f"{nama:<40}{before * 1e3:>10.1f}ms{cold * 1e3:>10.1f}ms{after * 1e3:>10.1f}ms"
+              f"{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Cold start per halaman: waktu impor modul halaman dan first paint.
+
+Tiap halaman dijalankan di proses Python baru (``streamlit.testing`` AppTest)
+supaya impor benar-benar dingin; cache kolumnar workbook dikosongkan kecuali
+``--warm-cache``. Dicatat: impor modul halaman, waktu sampai judul halaman
+terkirim (first paint), total rerun pertama dan rerun kedua, serta apakah
+``tbc.data``/Plotly ikut termuat.
+
+    python benchmarks/bench_halaman.py [--warm-cache] [--json hasil.json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_ANAK = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+
+at = AppTest.from_file("dashboardepi.py", default_timeout=300)
+at.session_state["selected"] = sys.argv[1]
+t0 = time.perf_counter()
+at.run()
+total = time.perf_counter() - t0
+t0 = time.perf_counter()
+at.run()
+rerun = time.perf_counter() - t0
+
+import halaman
+
+hasil = halaman.ukuran().get(sys.argv[1], {})
+print(json.dumps({
+    "import_ms": hasil.get("import_ms"),
+    "first_paint_ms": hasil.get("first_paint_ms_cold"),
+    "total_ms": total * 1e3,
+    "rerun_ms": rerun * 1e3,
+    "tbc_data": "tbc.data" in sys.modules,
+    "plotly": "plotly.express" in sys.modules,
+    "error": [e.message for e in at.exception],
+}))
+"""
+
+
+def ukur(label, env):
+    out = subprocess.run([sys.executable, "-c", _ANAK, label], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--warm-cache", action="store_true", help="pakai cache kolumnar yang sudah ada")
+    parser.add_argument("--json", type=Path)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    import halaman
+
+    hasil = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, PYTHONPATH=str(ROOT), TBC_REFRESH_INTERVAL="0")
+        print(f"{'halaman':<22}{'impor':>10}{'paint':>10}{'total':>10}{'rerun':>10}  data plotly")
+        for label in halaman.MENU:
+            if not args.warm_cache:
+                # cache dingin untuk tiap halaman, bukan hanya yang pertama
+                env["TBC_CACHE_DIR"] = str(Path(tmp) / label / ".cache")
+            r = hasil[label] = ukur(label, env)
+            print(f"{label:<22}{r['import_ms']:>8.0f}ms{r['first_paint_ms']:>8.0f}ms{r['total_ms']:>8.0f}ms"
+                  f"{r['rerun_ms']:>8.0f}ms  {'ya' if r['tbc_data'] else '-':>4} {'ya' if r['plotly'] else '-':>6}"
+                  + (f"  ERROR {r['error']}" if r["error"] else ""))
+    if args.json:
+        args.json.write_text(json.dumps(hasil, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
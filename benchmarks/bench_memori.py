@@ -0,0 +1,103 @@
+"""Memori frame tren long: skema lama (string/object + float64) vs skema ringkas.
+
+Skema lama = ``tahun`` string, ``kabupaten`` object, ``kasus`` float64 plus
+kolom ``tahun_label``. Skema ringkas = ``data.skema_long`` (kategori, int16,
+Int32). Dicatat per ukuran: memori ``memory_usage(deep=True)``, ukuran pickle
+(yang disalin ``st.cache_data`` per panggilan), waktu unpickle (biaya
+copy-on-return), ukuran Arrow IPC, dan waktu ``tren.dari_long``.
+
+    python benchmarks/bench_memori.py [--units 5000 80000] [--tahun 10]
+"""
+
+import argparse
+import pickle
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tbc import data, tren  # noqa: E402
+
+
+def _time(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _melt_lama(df_trend_wide, col_to_year):
+    # Salinan _melt sebelum skema ringkas, sebagai pembanding
+    df_trend_long = pd.melt(df_trend_wide, id_vars=["kabupaten"], value_vars=list(col_to_year.keys()),
+                            var_name="tahun_label", value_name="kasus")
+    df_trend_long["tahun"] = df_trend_long["tahun_label"].str.extract(r"(\d{4})")
+    df_trend_long["tahun"] = df_trend_long["tahun"].astype(str)
+    df_trend_long["kabupaten"] = df_trend_long["kabupaten"].astype(str).str.strip().astype(object)
+    df_trend_long["kasus"] = pd.to_numeric(df_trend_long["kasus"], errors="coerce")
+    return df_trend_long.sort_values(["kabupaten", "tahun"]).reset_index(drop=True)
+
+
+def _wide_sintetis(units, n_tahun):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"kabupaten": [f"Kecamatan {i:06d}" for i in range(units)]})
+    for i in range(n_tahun):
+        df[f"Tahun {2024 - n_tahun + 1 + i}"] = rng.poisson(300, units)
+    return df
+
+
+def _arrow_bytes(df):
+    sink = pa.BufferOutputStream()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().size
+
+
+def ukur(df):
+    blob = pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+    return {
+        "memori": int(df.memory_usage(deep=True).sum()),
+        "pickle": len(blob),
+        "unpickle_s": _time(lambda: pickle.loads(blob)),
+        "arrow": _arrow_bytes(df),
+        "dari_long_s": _time(lambda: tren.dari_long(df)),
+    }
+
+
+def _mb(n):
+    return f"{n / 2**20:>8.2f}MB" if n >= 2**20 else f"{n / 2**10:>8.1f}kB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--units", type=int, nargs="*", default=[5_000, 80_000])
+    parser.add_argument("--tahun", type=int, default=10)
+    args = parser.parse_args()
+
+    wide, _, col_to_year = data.load_trend_data()
+    frames = [("workbook asli", wide, col_to_year)]
+    for units in args.units:
+        w = _wide_sintetis(units, args.tahun)
+        frames.append((f"sintetis {units}x{args.tahun}", w,
+                       {c: re.search(r"(\d{4})", c).group(1) for c in w.columns[1:]}))
+
+    print(f"{'frame':<22}{'skema':<8}{'memori':>10}{'pickle':>10}{'unpickle':>10}{'arrow':>10}{'dari_long':>11}")
+    for nama, w, c2y in frames:
+        hasil = {"lama": ukur(_melt_lama(w, c2y)), "ringkas": ukur(data._melt(w, c2y))}
+        for skema, r in hasil.items():
+            print(f"{nama:<22}{skema:<8}{_mb(r['memori']):>10}{_mb(r['pickle']):>10}"
+                  f"{r['unpickle_s'] * 1e3:>8.2f}ms{_mb(r['arrow']):>10}{r['dari_long_s'] * 1e3:>9.2f}ms")
+        print(f"{'':<22}{'rasio':<8}{hasil['lama']['memori'] / hasil['ringkas']['memori']:>9.1f}x"
+              f"{hasil['lama']['pickle'] / hasil['ringkas']['pickle']:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Latensi ``data.snapshot()`` di bawah beban multi-sesi saat workbook berubah.
+
+Beberapa thread "sesi" memanggil ``snapshot()`` terus-menerus sementara
+workbook tren ditulis ulang beberapa kali. Dibandingkan: build di jalur
+request (``REFRESH_INTERVAL = 0``) vs refresher background dengan swap atomik.
+
+    python benchmarks/bench_refresh.py [--sessions 8] [--updates 3]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def _beban(data, sessions, durasi):
+    latensi = []
+    lock = threading.Lock()
+    stop = time.perf_counter() + durasi
+
+    def sesi():
+        lokal = []
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            data.snapshot()
+            lokal.append(time.perf_counter() - t0)
+            time.sleep(0.005)  # jeda antar rerun
+        with lock:
+            latensi.extend(lokal)
+
+    threads = [threading.Thread(target=sesi) for _ in range(sessions)]
+    for t in threads:
+        t.start()
+    return threads, latensi
+
+
+def run(mode_interval, sessions, updates, work):
+    from tbc import data, figures
+
+    data.REFRESH_INTERVAL = mode_interval
+    data._snapshot_for.cache_clear()
+    data._refreshers.clear()
+    figures.clear()
+    trend = work / data.TREND_FILE
+    data.snapshot()  # build pertama tidak diukur
+
+    threads, latensi = _beban(data, sessions, durasi=updates * 1.5 + 1)
+    for i in range(updates):
+        time.sleep(1.0)
+        # Tulis ulang workbook (isi sama, mtime baru -> versi dicek ulang)
+        shutil.copy(ROOT / data.TREND_FILE, trend)
+        os.utime(trend, ns=(time.time_ns(), time.time_ns() + i + 1))
+        with open(trend, "ab") as f:
+            f.write(b"\0" * (i + 1))  # ubah isi supaya hash berubah
+    for t in threads:
+        t.join()
+    builds = sum(ref.builds for ref in data._refreshers.values())
+    for ref in data._refreshers.values():
+        ref.stop()
+    return np.array(latensi) * 1e3, builds or data._snapshot_for.cache_info().misses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--updates", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work = Path(tmp)
+        for path in ROOT.glob("*.xlsx"):
+            shutil.copy(path, work)
+        for path in ROOT.glob("RBI_50K_2023_Jawa Barat.*"):
+            shutil.copy(path, work)
+        os.environ["TBC_DATA_DIR"] = str(work)
+        os.environ["TBC_CACHE_DIR"] = str(work / ".cache")
+
+        print(f"{'mode':<14}{'rerun':>8}{'build':>7}{'p50':>10}{'p99':>10}{'max':>10}")
+        for label, interval in (("request-path", 0), ("background", 0.25)):
+            ms, builds = run(interval, args.sessions, args.updates, work)
+            print(f"{label:<14}{len(ms):>8}{builds:>7}{np.percentile(ms, 50):>8.2f}ms"
+                  f"{np.percentile(ms, 99):>8.2f}ms{ms.max():>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark cold vs warm load: ``pd.read_excel`` langsung vs cache Arrow.
+
+Jalankan dari root repo:
+
+    python benchmarks/bench_store.py [--rows 5000 50000]
+
+Selain workbook asli, script membuat workbook sintetis ukuran kecamatan/puskesmas
+supaya selisih openpyxl vs memory-map terlihat jelas.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tbc import DATA_DIR  # noqa: E402
+from tbc.store import read_excel_cached  # noqa: E402
+
+
+def _time(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _synthetic_workbook(path, rows):
+    rng = np.random.default_rng(0)
+    pd.DataFrame({
+        "kabupaten": [f"Kecamatan {i:06d}" for i in range(rows)],
+        "kasus_2024": rng.poisson(300, rows),
+        "populasi_2024": rng.integers(10_000, 200_000, rows),
+    }).to_excel(path, index=False)
+
+
+def bench(path, cache_dir):
+    raw = _time(lambda: pd.read_excel(path), repeat=1)
+    t0 = time.perf_counter()
+    read_excel_cached(path, cache_dir=cache_dir)  # cold: parse + tulis cache
+    cold = time.perf_counter() - t0
+    warm = _time(lambda: read_excel_cached(path, cache_dir=cache_dir))
+    return raw, cold, warm
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="*", default=[5_000, 50_000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        files = [DATA_DIR / "datatbc_jabar_2024.xlsx", DATA_DIR / "kasus_tbc_jabar.xlsx"]
+        for rows in args.rows:
+            files.append(tmp / f"sintetis_{rows}.xlsx")
+            _synthetic_workbook(files[-1], rows)
+
+        print(f"{'file':<28}{'read_excel':>12}{'cold':>12}{'warm':>12}{'speedup':>10}")
+        for path in files:
+            raw, cold, warm = bench(path, tmp / "cache")
+            print(f"{path.name:<28}{raw * 1e3:>10.1f}ms{cold * 1e3:>10.1f}ms"
+                  f"{warm * 1e3:>10.2f}ms{raw / warm:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
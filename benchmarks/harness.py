@@ -0,0 +1,216 @@
+"""Harness benchmark headless untuk jalur data dan render dashboard.
+
+Membuat dataset sintetis berbentuk Jawa Barat (27 kabupaten/kota di-scale
+sampai 10k/100k/1M unit, 3–30 tahun), lalu mengukur di luar Streamlit:
+
+- ``load_data`` / ``load_trend_data``: cold (parse + tulis cache) dan warm (Arrow)
+- turunan snapshot: total per tahun, tren multi-tahun (YoY, CAGR, slope)
+- prevalensi dan scan asosiasi (semua titik potong kepadatan)
+- konstruksi figure ``px`` (dibatasi ``--max-figure-units``)
+
+Hasil (detik, throughput baris/detik, memori puncak tracemalloc) ditulis ke
+JSON berurutan stabil supaya bisa di-diff di CI:
+
+    python benchmarks/harness.py --quick --out bench_results.json
+    python benchmarks/harness.py --quick --compare bench_results.json --tolerance 0.5
+
+Workbook Excel hanya dibuat sampai ``--max-excel-units`` unit (openpyxl sangat
+lambat untuk jutaan sel); di atas itu sumber ditulis sebagai CSV dan melewati
+cache Arrow yang sama.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+DEFAULT_UNITS = [27, 10_000, 100_000, 1_000_000]
+DEFAULT_YEARS = [3, 30]
+TAHUN_AKHIR = 2024
+
+
+# ==============================
+# DATASET SINTETIS
+# ==============================
+def make_dataset(n_units, n_years, out_dir, excel, seed=0):
+    """Tulis sumber data (format datatbc & kasus_tbc) untuk ``n_units`` × ``n_years``."""
+    rng = np.random.default_rng(seed)
+    nama = np.array([f"Wilayah {i:07d}" for i in range(n_units)])
+    populasi = rng.lognormal(13.5, 0.8, n_units).astype(np.int64) + 1000
+    rate = rng.gamma(4, 0.001, n_units)
+    luas = rng.lognormal(5.5, 1.2, n_units)
+
+    years = np.arange(TAHUN_AKHIR - n_years + 1, TAHUN_AKHIR + 1)
+    tren = np.exp(rng.normal(0.05, 0.1, (n_units, 1)) * (years - years[0]))
+    kasus = rng.poisson(populasi[:, None] * rate[:, None] * tren)
+
+    df = pd.DataFrame({"kabupaten": nama, "kasus_2024": kasus[:, -1], "populasi_2024": populasi})
+    wide = pd.DataFrame(kasus, columns=[f"Tahun {y}" for y in years])
+    wide.insert(0, "Kabupaten/Kota", nama)
+
+    suffix = ".xlsx" if excel else ".csv"
+    data_path = out_dir / f"data_{n_units}_{n_years}{suffix}"
+    trend_path = out_dir / f"tren_{n_units}_{n_years}{suffix}"
+    for frame, path in ((df, data_path), (wide, trend_path)):
+        if excel:
+            frame.to_excel(path, index=False)
+        else:
+            frame.to_csv(path, index=False)
+    return data_path, trend_path, luas
+
+
+# ==============================
+# PENGUKURAN
+# ==============================
+def measure(fn, repeat, setup=None):
+    """Waktu terbaik dari ``repeat`` kali, lalu satu run ekstra di bawah tracemalloc."""
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+
+    if setup:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def run_scale(n_units, n_years, work, args):
+    from tbc import CACHE_DIR, asosiasi, data, figures, proyeksi, tren
+
+    excel = n_units <= args.max_excel_units
+    data_path, trend_path, luas = make_dataset(n_units, n_years, work, excel)
+    rows_long = n_units * n_years
+
+    def clear_cache():
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+    df = data.load_data(data_path)
+    _, long, _ = data.load_trend_data(trend_path)
+    kepadatan = df["populasi_2024"].to_numpy() / luas
+    tren_kasus = tren.dari_long(long)
+
+    cases = [
+        ("load_data.cold", n_units, lambda: data.load_data(data_path), clear_cache, 1),
+        ("load_data.warm", n_units, lambda: data.load_data(data_path), None, args.repeat),
+        ("load_trend_data.cold", rows_long, lambda: data.load_trend_data(trend_path), clear_cache, 1),
+        ("load_trend_data.warm", rows_long, lambda: data.load_trend_data(trend_path), None, args.repeat),
+        ("turunan.total_per_year", rows_long,
+         lambda: long.groupby("tahun", as_index=False)["kasus"].sum(), None, args.repeat),
+        ("turunan.tren_multi_tahun", rows_long,
+         lambda: tren.dari_long(long), None, args.repeat),
+        ("proyeksi.fit_batch", rows_long,
+         lambda: proyeksi.dari_tren(tren_kasus).prediksi(), None, args.repeat),
+        ("prevalensi", n_units,
+         lambda: df["kasus_2024"] / df["populasi_2024"] * 100000, None, args.repeat),
+        ("asosiasi.scan_semua_ambang", n_units,
+         lambda: asosiasi.scan_ambang(df["kasus_2024"], df["populasi_2024"], kepadatan), None, args.repeat),
+    ]
+    if n_units <= args.max_figure_units:
+        snap = SimpleNamespace(
+            df=df, df_sorted=df.sort_values("kasus_2024", ascending=False), df_trend_long=long)
+        cases += [
+            ("figure.bar", n_units, lambda: figures._build_bar(snap).to_json(), None, args.repeat),
+            ("figure.tren_kab", rows_long, lambda: figures._build_kab(snap).to_json(), None, 1),
+        ]
+
+    results = []
+    for name, rows, fn, setup, repeat in cases:
+        seconds, peak = measure(fn, repeat, setup)
+        results.append({
+            "case": name,
+            "units": n_units,
+            "years": n_years,
+            "rows": rows,
+            "source": "xlsx" if excel else "csv",
+            "seconds": round(seconds, 6),
+            "rows_per_s": round(rows / seconds) if seconds > 0 else None,
+            "peak_mb": round(peak / 2**20, 3),
+        })
+        print(f"{n_units:>9} {n_years:>3}y  {name:<28}{seconds * 1e3:>11.2f} ms"
+              f"{results[-1]['peak_mb']:>10.1f} MB", flush=True)
+    for path in (data_path, trend_path):
+        path.unlink()
+    return results
+
+
+def compare(results, baseline_path, tolerance):
+    """Bandingkan dengan hasil lama; True kalau tidak ada kasus yang melambat > tolerance."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["case"], r["units"], r["years"]): r for r in json.load(f)["results"]}
+    ok = True
+    for r in results:
+        old = baseline.get((r["case"], r["units"], r["years"]))
+        if not old or not old["seconds"]:
+            continue
+        ratio = r["seconds"] / old["seconds"]
+        flag = "REGRESI" if ratio > 1 + tolerance else ""
+        ok &= not flag
+        print(f"{r['units']:>9} {r['years']:>3}y  {r['case']:<28}{ratio:>7.2f}x  {flag}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark headless dashboard TBC Jawa Barat.")
+    parser.add_argument("--units", type=int, nargs="+", default=DEFAULT_UNITS)
+    parser.add_argument("--years", type=int, nargs="+", default=DEFAULT_YEARS)
+    parser.add_argument("--quick", action="store_true", help="hanya 27 dan 10k unit, 3 tahun")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-excel-units", type=int, default=10_000)
+    parser.add_argument("--max-figure-units", type=int, default=1_000)
+    parser.add_argument("--out", type=Path, default=Path("bench_results.json"))
+    parser.add_argument("--compare", type=Path, help="file hasil sebelumnya untuk deteksi regresi")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.units, args.years = [27, 10_000], [3]
+
+    with tempfile.TemporaryDirectory(prefix="tbc-bench-") as tmp:
+        work = Path(tmp)
+        # Cache Arrow benchmark dipisah dari cache aplikasi
+        os.environ["TBC_CACHE_DIR"] = str(work / "cache")
+        results = []
+        for n_units in args.units:
+            for n_years in args.years:
+                results += run_scale(n_units, n_years, work, args)
+
+    results.sort(key=lambda r: (r["units"], r["years"], r["case"]))
+    meta = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+    ok = compare(results, args.compare, args.tolerance) if args.compare else True
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=1, sort_keys=True)
+        f.write("\n")
+    print(f"hasil ditulis ke {args.out}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+# Root repo di sys.path supaya ``pytest`` (bukan hanya ``python -m pytest``) bisa mengimpor ``tbc``.
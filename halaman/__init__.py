@@ -0,0 +1,90 @@
+"""Halaman dashboard, satu modul per halaman dengan fungsi ``tampilkan()``.
+
+Modul halaman baru diimpor saat halaman itu pertama kali dibuka, dan
+snapshot data hanya dibangun oleh halaman yang memakainya. Halaman teks
+(Deskripsi Penyakit, Tentang Penelitian) tidak mengimpor pandas/Plotly dan
+tidak membaca workbook sama sekali.
+
+Per halaman dicatat dua angka (sekali per proses untuk impor, per rerun untuk
+paint), dikirim ke ``tbc.profiling`` dan tersedia lewat ``ukuran()``:
+
+- ``import_ms``: waktu impor modul halaman beserta dependensinya yang belum
+  termuat (0 setelah impor pertama di proses yang sama);
+- ``first_paint_ms``: waktu sejak script mulai sampai elemen pertama halaman
+  (judul) dikirim ke browser.
+"""
+
+import importlib
+import threading
+import time
+
+from tbc import profiling
+
+# label menu -> (modul, ikon sidebar)
+MENU = {
+    "Home": ("home", "🏠"),
+    "Deskripsi Penyakit": ("deskripsi", "🫁"),
+    "Ukuran Epidemiologi": ("epidemiologi", "🔗"),
+    "Tren Kasus": ("tren", "📈"),
+    "Tentang Penelitian": ("tentang", "🧾"),
+}
+
+_ukuran = {}  # label -> {"import_ms", "first_paint_ms", "first_paint_ms_cold"}
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def ukuran():
+    """Salinan angka impor/first paint per halaman untuk proses ini."""
+    with _lock:
+        return {label: dict(nilai) for label, nilai in _ukuran.items()}
+
+
+def muat(label):
+    """Impor modul halaman ``label`` (lazy); waktu impor pertama dicatat."""
+    nama = f"{__name__}.{MENU[label][0]}"
+    t0 = time.perf_counter()
+    with profiling.stage(f"load:import {nama}"):
+        modul = importlib.import_module(nama)
+    ms = (time.perf_counter() - t0) * 1e3
+    with _lock:
+        _ukuran.setdefault(label, {}).setdefault("import_ms", round(ms, 3))
+    return modul
+
+
+def jalankan(label, t_mulai):
+    """Render halaman ``label``; ``t_mulai`` = ``time.perf_counter()`` di awal script."""
+    _local.aktif = (label, t_mulai)
+    try:
+        muat(label).tampilkan()
+    finally:
+        _local.aktif = None
+
+
+def first_paint():
+    """Dipanggil halaman tepat setelah elemen pertamanya (judul) dirender."""
+    aktif = getattr(_local, "aktif", None)
+    if aktif is None:
+        return
+    label, t_mulai = aktif
+    ms = round((time.perf_counter() - t_mulai) * 1e3, 3)
+    with _lock:
+        nilai = _ukuran.setdefault(label, {})
+        nilai.setdefault("first_paint_ms_cold", ms)
+        nilai["first_paint_ms"] = ms
+    profiling.mark(f"render:first paint {label}")
+
+
+def snapshot():
+    """Snapshot data (lazy import ``tbc.data``) + peringatan kalau refresh background gagal."""
+    import streamlit as st
+
+    from tbc import data
+
+    snap = data.snapshot()
+    if data.REFRESH_INTERVAL > 0 and data.refresher().last_error:
+        # Pembaruan data gagal di background: snapshot terakhir yang valid tetap dipakai
+        st.sidebar.warning(f"Pembaruan data tertunda: {data.refresher().last_error}")
+    if snap.validasi.n_error:
+        st.sidebar.warning(f"Validasi data: {snap.validasi.n_error} error — rincian di Home")
+    return snap
@@ -0,0 +1,62 @@
+"""Deskripsi penyakit TBC (teks statis: tanpa data/Plotly)."""
+
+import streamlit as st
+
+from halaman import first_paint
+
+
+def tampilkan():
+    st.title("Deskripsi Penyakit TBC")
+    first_paint()
+    st.markdown("""
+    ### Definisi
+    **Tuberkulosis (TBC)** adalah penyakit **kronis menular** yang disebabkan oleh bakteri *Mycobacterium tuberculosis*. Penyakit ini dapat menyerang berbagai organ tubuh, namun **paru-paru** merupakan organ yang paling sering terinfeksi (*tuberkulosis paru*). Di tingkat global, TBC masih menjadi salah satu **penyakit menular dengan angka kejadian tinggi** dan tantangan besar bagi kesehatan masyarakat.
+
+    ---
+
+    ### Mekanisme Penularan
+    TBC umumnya **menular melalui udara**. Ketika penderita TBC aktif **batuk atau bersin**, mereka dapat memercikkan **lendir atau dahak** yang mengandung bakteri *Mycobacterium tuberculosis* ke udara. Orang lain yang menghirup udara tersebut dapat tertular dan berpotensi mengembangkan penyakit ini.
+
+    ---
+
+    ### Gejala Umum
+    **1. Gejala TBC aktif di paru-paru:**
+    - Batuk parah selama ≥ 3 minggu  
+    - Nyeri di dada  
+    - Batuk darah atau dahak bercampur darah  
+
+    **2. Gejala umum TBC aktif:**
+    - Kelelahan dan lemah tubuh  
+    - Penurunan berat badan  
+    - Hilang nafsu makan  
+    - Demam dan menggigil  
+    - Keringat berlebih di malam hari  
+
+    **3. Gejala TBC di luar paru-paru (tergantung organ):**
+    - Pembengkakan kelenjar getah bening pada TBC kelenjar  
+    - Kencing berdarah pada TBC ginjal 
+    - Nyeri punggung pada TBC tulang belakang 
+    - Sakit kepala dan kejang pada TBC otak
+    - Sakit perut hebat pada TBC usus 
+
+    ---
+
+    ### Faktor Risiko
+    - Daya tahan tubuh yang rendah  
+    - Lingkungan padat dan ventilasi buruk  
+    - Kontak erat dengan penderita TBC aktif  
+    - Kondisi medis lainnya seperti HIV/AIDS 
+    - Kondisi gizi buruk atau kelaparan  
+    - Penggunaan obat-obatan tertentu yang menekan sistem imun  
+    - Kebersihan diri dan sanitasi yang kurang baik
+
+    ---
+
+    ### Referensi
+    1. Pusat Nasional Penanggulangan TBC, “UMUM_PNPK revisi” (2021), … [link](https://www.tbindonesia.or.id/wp-content/uploads/2021/06/UMUM_PNPK_revisi.pdf)  
+    2. Jurnal Global Health Science, “…” (2021) … [link](https://jurnal.globalhealthsciencegroup.com/index.php/JPPP/article/download/1270/998/)  
+    3. Alodokter, “Proses Terjadinya Penularan TBC” … [link](https://www.alodokter.com/proses-terjadinya-penularan-tbc)  
+    4. CDC, “Signs & Symptoms of Tuberculosis” … [link](https://www.cdc.gov/tb/signs-symptoms/index.html)  
+    5. Halodoc, “Faktor Risiko Alami TBC yang Terjadi di Usia Muda” … [link](https://www.halodoc.com/artikel/faktor-risiko-alami-tbc-yang-terjadi-di-usia-muda?srsltid=AfmBOormrXZ4m42UjtNNopy_JPmNehIrRjeq0ZUmVQCrCHnB2ioOwVi0)  
+
+    """)
@@ -0,0 +1,252 @@
+"""Ukuran epidemiologi: prevalensi, pemulusan Bayes, denominator, asosiasi, spasial."""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from halaman import first_paint, snapshot
+from tbc import asosiasi, figures, peta, profiling, spasial, tabel
+
+
+def tampilkan():
+    st.title("📊 Ukuran Epidemiologi — Frekuensi & Asosiasi")
+    first_paint()
+    snap = snapshot()
+    df = snap.df
+
+    # ==============================
+    # 1️⃣ PREVALENSI (Ukuran Frekuensi)
+    # ==============================
+    st.subheader(" Ukuran Frekuensi — Prevalensi")
+
+    st.markdown("""
+    **Definisi:**  
+    Prevalensi menggambarkan proporsi individu dalam populasi yang menderita penyakit pada suatu waktu tertentu.  
+    Dalam konteks ini, dihitung sebagai jumlah kasus TBC per 100.000 penduduk pada tahun 2024 di Jawa Barat.
+
+    **Rumus:**  
+    """)
+    st.latex(r"\text{Prevalensi} = \frac{\text{Kasus TBC (baru+lama)}}{\text{Populasi}}")
+
+    # --- Hitung prevalensi provinsi secara keseluruhan
+    prevalensi_per_100k = snap.ringkasan["prevalensi_per_100k"]
+    prevalensi_persen = snap.ringkasan["prevalensi_persen"]
+
+    # --- Tampilkan hasil
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Prevalensi TBC (per 100.000 penduduk)", f"{prevalensi_per_100k:,.2f}")
+    with col2:
+        st.metric("Prevalensi TBC (%)", f"{prevalensi_persen:.4f}%")
+
+    # --- Dataframe prevalensi per kabupaten/kota
+    tabel.tampilkan(
+        df, (snap.version, "prevalensi"),
+        kolom={
+            "kabupaten": "Kabupaten/Kota",
+            "kasus_2024": "Kasus TBC",
+            "populasi_2024": "Populasi",
+            "prevalensi_per_100k": "Prevalensi per 100k"
+        },
+        sort="prevalensi_per_100k"
+    )
+
+    # --- Prevalensi terlicin (Bayes area kecil)
+    st.markdown("### Prevalensi Terlicin (Bayes Area Kecil)")
+    st.markdown(
+        "Prevalensi mentah wilayah berpenduduk kecil mudah berfluktuasi. Estimasi **Empirical Bayes** "
+        "(Poisson-Gamma) dan **CAR Leroux** menarik nilai ekstrem ke arah rata-rata provinsi "
+        "(CAR: ke arah wilayah tetangga) sesuai besar populasinya."
+    )
+    ambang_rr = st.slider(
+        "Ambang risiko relatif (RR) terhadap rata-rata provinsi", 0.5, 2.0, 1.0, 0.05,
+        help="Kolom peluang menunjukkan P(RR wilayah > ambang | data)"
+    )
+    kolom_bayes = {
+        "kabupaten": "Kabupaten/Kota",
+        "prevalensi_per_100k": "Prevalensi mentah",
+        "eb_per_100k": "EB", "eb_lo": "EB 95% CrI bawah", "eb_hi": "EB 95% CrI atas",
+        "car_per_100k": "CAR", "car_lo": "CAR 95% CrI bawah", "car_hi": "CAR 95% CrI atas",
+        "p_eb_di_atas_ambang": f"P(RR > {ambang_rr:.2f}) EB",
+        "p_car_di_atas_ambang": f"P(RR > {ambang_rr:.2f}) CAR",
+    }
+    tabel.tampilkan(snap.pemulusan.tabel(ambang_rr), (snap.version, "bayes", ambang_rr),
+                    kolom=kolom_bayes, sort="car_per_100k")
+    car = snap.pemulusan.car
+    if car["model"] == "car":
+        st.caption(f"CAR Leroux: ρ posterior ≈ {car['rho']:.2f}, τ ≈ {car['tau']:,.1f}")
+    else:
+        alasan = ("jumlah wilayah melebihi batas model spasial" if spasial.tersedia()
+                  else "tanpa geometri .shp")
+        st.caption(f"Kolom CAR memakai efek acak iid tanpa tetangga ({alasan}): τ ≈ {car['tau']:,.1f}")
+
+    # --- Interpretasi singkat prevalensi
+    st.markdown(f"""
+    ### Interpretasi Hasil
+    Nilai prevalensi TBC di Provinsi Jawa Barat tahun 2024 adalah **{prevalensi_per_100k:,.2f} per 100.000 penduduk**
+    atau setara dengan **{prevalensi_persen:.4f}%** dari total populasi. Artinya, dari setiap 100.000 penduduk, terdapat sekitar **{prevalensi_per_100k/100000*100:.4f}%**
+    yang tercatat sebagai penderita TBC. Nilai ini menunjukkan bahwa beban penyakit TBC di Jawa Barat masih cukup tinggi,
+    sehingga perlu dilakukan pemantauan dan intervensi kesehatan masyarakat secara berkelanjutan.
+    """)
+
+    # --- Denominator BPS menurut umur & jenis kelamin
+    st.markdown("### Denominator Penduduk BPS (Umur & Jenis Kelamin)")
+    tahun_denom = st.selectbox(
+        "Tahun denominator BPS",
+        sorted(snap.denominator.tahun, reverse=True),
+        help="Data proyeksi penduduk BPS per kelompok umur dan jenis kelamin (populasijabar.xlsx)"
+    )
+    df_denom = snap.df_denominator[snap.df_denominator["tahun"] == tahun_denom]
+    tahun_rate = int(snap.df_denominator["tahun_populasi_rate"].iloc[0])
+    kolom_denom = {
+        "kabupaten": "Kabupaten/Kota",
+        "kasus_2024": "Kasus TBC 2024",
+        "populasi_bps": f"Penduduk BPS {tahun_denom}",
+        "rate_kasar_per_100k": f"Rate Kasar 2024 per 100k (penduduk {tahun_rate})",
+        "pct_umur_0_14": "% Umur 0–14",
+        "pct_umur_60_plus": "% Umur ≥ 60",
+        "rasio_jk": "Rasio Jenis Kelamin (L/P×100)",
+    }
+    if "smr" in df_denom.columns:
+        kolom_denom.update({"smr": "SMR", "smr_lo": "SMR 95% CI bawah", "smr_hi": "SMR 95% CI atas"})
+    tabel.tampilkan(df_denom, (snap.version, "denom", tahun_denom), kolom=kolom_denom, sort="rate_kasar_per_100k")
+    st.caption(
+        f"Rate kasar dan SMR kasus 2024 selalu memakai penduduk BPS {tahun_rate} (tahun terdekat yang "
+        "tersedia); pilihan tahun di atas hanya mengubah kolom penduduk dan struktur umur/jenis kelamin."
+    )
+    if "smr" not in df_denom.columns:
+        st.caption(
+            "Kasus TBC belum tersedia per kelompok umur, sehingga rate spesifik umur dan standardisasi "
+            "langsung belum dapat dihitung. SMR (standardisasi tidak langsung) akan tampil bila file "
+            "`rate_referensi_tbc.csv` (kolom `kelompok_umur`, `rate_per_100k`) tersedia."
+        )
+
+    st.markdown("---")
+
+    # ==============================
+    # 2️⃣ UKURAN ASOSIASI
+    # ==============================
+    st.subheader(" Ukuran Asosiasi — PR dan POR")
+
+    st.markdown("""
+    **Pengertian Singkat:**  
+    Ukuran asosiasi digunakan untuk menggambarkan hubungan antara **paparan (exposure)** dan **penyakit (outcome)**.  
+    Dalam konteks ini, paparan yang dianalisis adalah **kepadatan penduduk** terhadap **kejadian TBC**.
+
+    - **Prevalence Ratio (PR):** membandingkan proporsi penderita TBC antara wilayah dengan kepadatan tinggi dan rendah.  
+    - **Prevalence Odds Ratio (POR):** membandingkan peluang (odds) terjadinya TBC antara dua kelompok tersebut.
+    """)
+
+    # --- Tabel 2x2: Kepadatan Penduduk vs TBC (dibentuk dari data)
+    df_wil = snap.df_wilayah
+    kepadatan_rata = float(df_wil["kepadatan"].mean())
+    # Hanya titik potong antar unit: ambang lain memberi tabel 2x2 yang sama
+    # atau satu baris kosong (PR/POR tak terdefinisi)
+    pilihan_ambang = asosiasi.titik_potong(df_wil["kepadatan"]).tolist()
+    ambang = st.select_slider(
+        "Ambang kepadatan penduduk (jiwa/km²) — wilayah di atas ambang dianggap padat",
+        options=pilihan_ambang,
+        value=min(pilihan_ambang, key=lambda x: abs(x - kepadatan_rata)),
+        format_func=lambda x: f"{x:,.0f}",
+        help=f"Titik tengah antara kepadatan kabupaten/kota yang berurutan; default terdekat dengan "
+             f"rata-rata ({kepadatan_rata:,.0f} jiwa/km²)"
+    )
+    stratifikasi = st.checkbox("Stratifikasi Mantel-Haenszel menurut jenis wilayah (Kabupaten/Kota)")
+
+    hasil = asosiasi.scan_ambang(
+        df_wil["kasus_2024"], df_wil["populasi_2024"], df_wil["kepadatan"], [ambang],
+        strata=df_wil["tipadm"] if stratifikasi else None
+    ).iloc[0]
+    a, b, c, d = (int(hasil[k]) for k in "abcd")
+
+    data_asosiasi = {
+        "Kepadatan Wilayah": [f"Tinggi (X > {ambang:,.0f})", f"Rendah (X ≤ {ambang:,.0f})", "Total"],
+        "TBC (+)": [a, c, a + c],
+        "TBC (−)": [b, d, b + d],
+        "Total": [a + b, c + d, a + b + c + d]
+    }
+
+    df_asosiasi = pd.DataFrame(data_asosiasi)
+    st.dataframe(df_asosiasi, hide_index=True, use_container_width=True)
+
+    # --- Ringkasan hasil ukuran asosiasi
+    st.markdown("### Ringkasan Hasil Ukuran Asosiasi")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(label="Prevalence Ratio (PR)", value=f"{hasil['pr']:.2f}")
+        st.caption(f"95% CI {hasil['pr_lo']:.2f} – {hasil['pr_hi']:.2f}")
+    with col2:
+        st.metric(label="Prevalence Odds Ratio (POR)", value=f"{hasil['por']:.2f}")
+        st.caption(f"95% CI {hasil['por_lo']:.2f} – {hasil['por_hi']:.2f}")
+    with col3:
+        st.metric(label="Chi-square (df = 1)", value=f"{hasil['chi2']:,.1f}")
+        st.caption(f"p = {hasil['p_value']:.3g}")
+
+    if stratifikasi:
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric(label="PR Mantel-Haenszel", value=f"{hasil['pr_mh']:.2f}")
+            st.caption(f"95% CI {hasil['pr_mh_lo']:.2f} – {hasil['pr_mh_hi']:.2f}")
+        with col2:
+            st.metric(label="POR Mantel-Haenszel", value=f"{hasil['por_mh']:.2f}")
+            st.caption(f"95% CI {hasil['por_mh_lo']:.2f} – {hasil['por_mh_hi']:.2f}")
+
+    # --- PR untuk semua kemungkinan ambang (satu pass tervektorisasi)
+    with st.expander("PR untuk semua titik potong kepadatan"):
+        fig_scan = figures.fig_scan(snap, ambang)
+        with profiling.stage("render:plotly_chart scan"):
+            st.plotly_chart(fig_scan, use_container_width=True)
+
+    # --- Rumus matematis
+    st.markdown("**Rumus yang digunakan:**")
+    st.latex(r"PR = \frac{\frac{a}{a + b}}{\frac{c}{c + d}}")
+    st.latex(r"POR = \frac{a \times d}{b \times c}")
+
+    # --- Interpretasi hasil (PR/POR tak terdefinisi kalau ada sel 2x2 bernilai nol)
+    if not (np.isfinite(hasil["pr"]) and np.isfinite(hasil["por"])):
+        st.markdown(f"""
+    ### Interpretasi Hasil
+    Dengan ambang kepadatan **{ambang:,.0f} jiwa/km²**, nilai PR dan POR **tidak dapat dihitung** karena salah satu
+    sel tabel 2x2 bernilai nol. Pilih ambang lain.
+    """)
+    else:
+        pr_txt = f"{hasil['pr']:.2f}".replace(".", ",")
+        por_txt = f"{hasil['por']:.2f}".replace(".", ",")
+        arah = "lebih besar" if hasil["pr"] >= 1 else "lebih kecil"
+        hubungan = "positif" if hasil["pr"] > 1 else "negatif"
+        st.markdown(f"""
+    ### Interpretasi Hasil
+    Dengan ambang kepadatan **{ambang:,.0f} jiwa/km²**, nilai Prevalence Ratio (PR) sebesar {pr_txt}, yang berarti penduduk yang tinggal di wilayah dengan kepadatan tinggi memiliki risiko sekitar {pr_txt} kali {arah} untuk terpapar Tuberkulosis (TBC) dibandingkan dengan penduduk di wilayah yang kurang padat. Nilai **Prevalence Odds Ratio (POR)** sebesar **{por_txt}**, menunjukkan bahwa peluang terjadinya TBC pada wilayah berpenduduk padat sekitar **{por_txt} kali** dibandingkan wilayah berpenduduk jarang. Nilai PR dan POR yang {"lebih besar" if hubungan == "positif" else "lebih kecil"} dari satu menandakan adanya **hubungan {hubungan} antara kepadatan penduduk dan risiko TBC**.
+    """)
+
+    # ==============================
+    # AUTOKORELASI SPASIAL & HOTSPOT
+    # ==============================
+    st.subheader(" Autokorelasi Spasial dan Hotspot Prevalensi")
+
+    if spasial.tersedia():
+        permutasi = st.select_slider("Jumlah permutasi", options=[99, 999, 4999, 9999], value=999)
+        hasil_spasial = spasial.hasil_snapshot(snap, permutasi)
+        moran, scan = hasil_spasial.moran, hasil_spasial.scan
+        df_spasial = hasil_spasial.df
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric(label="Moran's I global", value=f"{moran['I']:.3f}")
+            st.caption(f"E[I] = {moran['EI']:.3f} · p permutasi = {moran['p_sim']:.3f}")
+        with col2:
+            st.metric(label="Hotspot / Coldspot Gi*",
+                      value=f"{(df_spasial['hotspot'] == 'Hotspot').sum()} / {(df_spasial['hotspot'] == 'Coldspot').sum()}")
+            st.caption("Signifikan pada α = 0,05 (permutasi bersyarat)")
+        with col3:
+            st.metric(label="Klaster scan Kulldorff (RR)", value=f"{scan['rr']:.2f}")
+            st.caption(f"{len(scan['anggota'])} wilayah · LLR = {scan['llr']:,.1f} · p = {scan['p_value']:.3f}")
+
+        fig_hotspot = figures.fig_hotspot(snap, permutasi, peta.DEFAULT_RESOLUSI)
+        with profiling.stage("render:plotly_chart hotspot"):
+            st.plotly_chart(fig_hotspot, use_container_width=True)
+        tabel.tampilkan(df_spasial, (snap.version, "spasial", permutasi), sort="gi_star_z")
+    else:
+        # Ketetanggaan butuh poligon .shp (di repo saat ini hanya DBF/indeks)
+        st.info("Analisis spasial membutuhkan geometri batas wilayah RBI (.shp) yang belum tersedia.")
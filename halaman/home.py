@@ -0,0 +1,88 @@
+"""Home: ringkasan kasus, top kabupaten, distribusi, peta."""
+
+import streamlit as st
+
+from halaman import first_paint, snapshot
+from tbc import DATA_DIR, figures, peta, profiling, tabel
+
+
+def tampilkan():
+    st.title("Dashboard Kasus TBC — Jawa Barat (2024)")
+    st.caption("Sumber data: Dinkes Jawa Barat & BPS 2024 | Analisis per kabupaten/kota")
+    first_paint()
+    snap = snapshot()
+    df = snap.df
+
+    # --- Statistik ringkas
+    ringkasan = snap.ringkasan
+    total_kasus = ringkasan["total_kasus"]
+    mean_kasus = ringkasan["mean_kasus"]
+    median_kasus = ringkasan["median_kasus"]
+    range_kasus = f"{ringkasan['min_kasus']} – {ringkasan['max_kasus']}"
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Total Kasus TBC (2024)", f"{total_kasus:,}")
+    col2.metric("Rata-rata Kasus per Kabupaten/Kota", f"{mean_kasus:,.0f}")
+    col3.metric("Median Kasus", f"{median_kasus:,}")
+    col4.metric("Rentang Kasus", range_kasus)
+
+    st.markdown("---")
+
+    # --- Peringkat kabupaten (halaman pertama = 10 kasus tertinggi)
+    st.subheader("Peringkat Kabupaten/Kota menurut Jumlah Kasus (2024)")
+    tabel.tampilkan(
+        df, (snap.version, "top"),
+        kolom={
+            "kabupaten": "Kabupaten/Kota",
+            "kasus_2024": "Kasus 2024",
+            "populasi_2024": "Populasi",
+            "prevalensi_per_100k": "Prevalensi per 100k",
+            "prevalensi_car_per_100k": "Prevalensi terlicin (CAR)"
+        },
+        sort="kasus_2024", per_hal=10
+    )
+
+    # --- Bar chart kasus per kabupaten
+    st.subheader("Distribusi Kasus TBC per Kabupaten/Kota")
+    fig_bar = figures.fig_bar(snap)
+    with profiling.stage("render:plotly_chart bar"):
+        st.plotly_chart(fig_bar, use_container_width=True)
+
+    # --- Histogram distribusi
+    st.subheader(" Distribusi Kasus (Histogram)")
+    fig_hist = figures.fig_hist(snap)
+    with profiling.stage("render:plotly_chart hist"):
+        st.plotly_chart(fig_hist, use_container_width=True)
+
+    # PETA PREVALENSI TBC
+    st.subheader("Peta Persebaran Prevalensi TBC di Jawa Barat (2024)")
+
+    if peta.tersedia():
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            indikator = st.selectbox("Indikator peta", list(snap.indikator_peta))
+        with col2:
+            resolusi = st.radio("Detail batas wilayah", list(peta.RESOLUSI),
+                                index=list(peta.RESOLUSI).index(peta.DEFAULT_RESOLUSI), horizontal=True)
+        fig_peta = figures.fig_peta(snap, indikator, resolusi)
+        with profiling.stage("render:plotly_chart peta"):
+            st.plotly_chart(fig_peta, use_container_width=True)
+    else:
+        # Geometri .shp belum ada di repo: pakai peta statis
+        st.image(str(DATA_DIR / "leafletshp.png"), caption="Peta Prevalensi TBC Jawa Barat 2024", use_container_width=True)
+
+    # --- Validasi sumber data
+    validasi = snap.validasi
+    with st.expander(f"Validasi & rekonsiliasi data ({validasi.n_error} error, "
+                     f"{validasi.n_peringatan} peringatan)"):
+        st.caption("Nama wilayah di tiap file dipetakan ke kode BPS (RBI); join antar tabel memakai kode itu.")
+        if len(validasi.masalah):
+            tabel.tampilkan(validasi.masalah, (snap.version, "validasi"), sort="tingkat", naik=True,
+                            kolom_cari="nama")
+        else:
+            st.success("Semua pemeriksaan skema dan rentang lolos.")
+        tidak_tepat = validasi.pemetaan[validasi.pemetaan["metode"] != "tepat"]
+        if len(tidak_tepat):
+            st.markdown("**Nama yang tidak cocok persis**")
+            tabel.tampilkan(tidak_tepat, (snap.version, "pemetaan"), sort="skor", naik=True,
+                            kolom_cari="nama_asli")
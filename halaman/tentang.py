@@ -0,0 +1,61 @@
+"""Tentang penelitian (teks statis: tanpa data/Plotly)."""
+
+import streamlit as st
+
+from halaman import first_paint
+
+
+def tampilkan():
+    st.title("ℹ️ Tentang Penelitian")
+    first_paint()
+
+    st.markdown("""
+    ## Dashboard Kasus TBC — Jawa Barat (2024)
+
+    **Judul:**  
+    *Analisis Epidemiologi Kasus Tuberkulosis di Provinsi Jawa Barat Tahun 2024*
+
+    **Disusun oleh:**  
+    - 👩‍🎓 Ghaitsa Shafiyyah  
+    - 👩‍🎓 Gina Kustiana  
+    - 👨‍🎓 Charles Joshua Nathaniel Waruwu  
+
+    **Dosen Pembimbing:** Dr. I Gede Nyoman Mindra Jaya, M.Si  
+    **Institusi:** Universitas Padjadjaran  
+    **Tahun:** 2025  
+
+    ---
+
+    ### Tujuan Penelitian
+    Penelitian ini bertujuan untuk menyajikan **analisis deskriptif** kasus Tuberkulosis (TBC) di tingkat kabupaten/kota
+    Provinsi Jawa Barat, termasuk ukuran frekuensi penyakit (*prevalensi per 100.000 penduduk*), ukur
+    serta tren kasus selama tahun **2022–2024**.
+
+    ---
+
+    ### Sumber Data
+    - **Dinas Kesehatan Provinsi Jawa Barat** — Data kasus TBC tahun 2022–2024  
+    - **BPS Kabupaten Bandung** — Jumlah Penduduk menurut Kabupaten/Kota di Provinsi Jawa Barat (2024) 
+    ---
+
+    ### Metodologi Singkat
+    - **Desain penelitian:** Cross-sectional
+    - **Unit analisis:** Kabupaten/Kota  
+    - **Periode analisis:** Tahun 2024  
+    
+    ---
+                
+    ### Acknowledgement
+    Penyusunan dashboard ini turut dibantu oleh **ChatGPT (OpenAI, model GPT-5)** dalam proses penulisan kode dan perancangan visualisasi. Seluruh hasil akhir telah diperiksa, disunting, dan disesuaikan oleh penulis.
+                
+    ---
+
+    ### Hak Cipta & Lisensi
+    Dashboard ini dibuat untuk keperluan **akademik dan edukasi**.  
+    Seluruh data bersumber dari **publikasi resmi instansi pemerintah**.  
+
+    © 2025 — *Ghaitsa Shafiyyah, Gina Kustiana, Charles Joshua Nathaniel Waruwu*.  
+    
+    
+    
+    """)
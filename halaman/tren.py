@@ -0,0 +1,70 @@
+"""Tren kasus multi-tahun per kabupaten/kota."""
+
+import streamlit as st
+
+from halaman import first_paint, snapshot
+from tbc import data, figures, profiling, tabel
+
+
+def tampilkan():
+    snap = snapshot()
+    tren_kasus = snap.tren["Jumlah Kasus"]
+    st.title(f"Tren Kasus TBC — Jawa Barat ({tren_kasus.periode})")
+    first_paint()
+    st.caption("Sumber data: Dinkes Jawa Barat | Jumlah kasus TBC per tahun di tingkat kabupaten/kota")
+
+    # --- Dropdown filter kabupaten
+    kab_filter = st.selectbox(
+        "Pilih Kabupaten/Kota untuk melihat tren spesifik:",
+        [data.ALL_KAB] + list(snap.kabupaten_list)
+    )
+
+    # --- Total provinsi per tahun
+    st.subheader(" Total Kasus TBC Provinsi Jawa Barat per Tahun")
+    fig_total = figures.fig_total(snap)
+    with profiling.stage("render:plotly_chart total"):
+        st.plotly_chart(fig_total, use_container_width=True)
+    prediksi = snap.proyeksi.prediksi()
+    total = prediksi["total"]
+    st.metric(f"Proyeksi Total Kasus {prediksi['tahun']}", f"{total['mean']:,.0f}",
+              help=f"Interval prediksi 95%: {total['lo']:,.0f} – {total['hi']:,.0f}")
+
+    # --- Grafik tren per kabupaten
+    st.subheader(f" Tren Kasus per Kabupaten/Kota ({tren_kasus.periode})")
+
+    fig_kab = figures.fig_kab(snap, None if kab_filter == data.ALL_KAB else kab_filter)
+    with profiling.stage("render:plotly_chart kab"):
+        st.plotly_chart(fig_kab, use_container_width=True)
+
+    if kab_filter != data.ALL_KAB and kab_filter in tren_kasus.unit:
+        i = tren_kasus.unit_index(kab_filter)
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric(f"YoY {tren_kasus.tahun[-1]}", f"{tren_kasus.yoy[i, -1]:+.1f}%")
+        col2.metric(f"CAGR {tren_kasus.periode}", f"{tren_kasus.cagr[i]:+.1f}%")
+        col3.metric("Slope", f"{tren_kasus.slope[i]:+,.0f} kasus/tahun")
+        if kab_filter in snap.proyeksi.unit:
+            j = snap.proyeksi.unit_index(kab_filter)
+            col4.metric(f"Proyeksi {prediksi['tahun']}", f"{prediksi['mean'][j]:,.0f}",
+                        help=f"Interval prediksi 95%: {prediksi['lo'][j]:,.0f} – {prediksi['hi'][j]:,.0f}")
+
+    # --- Ringkasan tren semua kabupaten
+    st.subheader(f"Perubahan dan Tren Kasus ({tren_kasus.periode})")
+    indikator_tren = st.selectbox("Indikator", list(snap.tren))
+    tren_pilih = snap.tren[indikator_tren]
+    tabel.tampilkan(tren_pilih.tabel, (snap.version, "tren", indikator_tren), sort=tren_pilih.pct_col)
+    st.caption(
+        f"CAGR = pertumbuhan tahunan majemuk {tren_pilih.periode}; slope = kemiringan regresi linear "
+        f"per tahun; rata-rata bergerak {tren_pilih.window} tahun terakhir."
+        + (" Penduduk diambil dari tahun data BPS terdekat." if indikator_tren != "Jumlah Kasus" else "")
+    )
+
+    # --- Proyeksi semua kabupaten
+    st.subheader(f"Proyeksi Kasus {prediksi['tahun']}")
+    tabel_proyeksi = snap.proyeksi.tabel()
+    tabel.tampilkan(tabel_proyeksi, (snap.version, "proyeksi"), sort="% Perubahan")
+    st.caption(
+        f"Model log-linear quasi-Poisson per kabupaten/kota (dispersi φ = {snap.proyeksi.phi:,.1f}), "
+        f"slope ditarik ke tren provinsi ({snap.proyeksi.beta * 100:+.1f}%/tahun skala log) sesuai "
+        "ketidakpastiannya. Interval prediksi 95% mencakup ketidakpastian parameter dan variasi "
+        "tahunan; total provinsi = jumlah proyeksi kabupaten/kota."
+    )
@@ -0,0 +1,10 @@
+"""Lapisan data dan analitik untuk Dashboard Epidemiologi TBC Jawa Barat."""
+
+import os
+from pathlib import Path
+
+# Folder data (workbook, DBF RBI). Default: root repo, bisa dioverride lewat env.
+DATA_DIR = Path(os.environ.get("TBC_DATA_DIR", Path(__file__).resolve().parent.parent))
+
+# Folder cache kolumnar (Arrow IPC) hasil ingest workbook.
+CACHE_DIR = Path(os.environ.get("TBC_CACHE_DIR", DATA_DIR / ".cache"))
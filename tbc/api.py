@@ -0,0 +1,405 @@
+"""API baca (JSON/Arrow) untuk angka yang sama dengan dashboard, tanpa Streamlit.
+
+Proses terpisah yang berjalan di samping dashboard dan memakai lapisan data
+yang sama (``data.snapshot()``: cache Arrow workbook, refresher background,
+validasi kode BPS). Hanya GET/HEAD; semua data agregat dan read-only, jadi
+cache respons dipakai bersama oleh semua tenant.
+
+Endpoint (``format=json`` default, ``format=arrow`` atau header
+``Accept: application/vnd.apache.arrow.file`` untuk Arrow IPC):
+
+- ``/v1/versi``: versi data, daftar wilayah dan tahun;
+- ``/v1/provinsi``: ringkasan 2024, total kasus per tahun + % perubahan, proyeksi total;
+- ``/v1/kabupaten``: satu baris per kabupaten/kota (kasus, prevalensi kasar
+  dan terlicin, tren, proyeksi);
+- ``/v1/tren``: kasus per kabupaten × tahun + YoY;
+- ``/v1/status``: hit/miss cache dan jumlah request per tenant (tidak di-cache).
+
+Query batch: ``kode=3201,3273`` dan/atau ``nama=Bogor,Kota Bandung`` (boleh
+diulang), ``kolom=kasus_2024,prevalensi_per_100k`` untuk memilih kolom. Nama
+dicocokkan lewat indeks ``validasi`` ("Kab. Bogor" = "Bogor").
+
+Respons di-key oleh (versi data, path, query ternormalisasi, format) di LRU
+dalam proses; ETag = hash key itu, jadi ``If-None-Match`` dijawab 304 tanpa
+menyusun atau mengambil body. Tenant dibaca dari header ``X-Tenant`` (hanya untuk
+statistik).
+
+    python -m tbc.api --port 8600
+    curl 'localhost:8600/v1/kabupaten?nama=Bogor,Kota+Depok&kolom=kasus_2024,prevalensi_per_100k'
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+from collections import Counter, OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from tbc import data, tren, validasi
+
+MAX_RESPONSES = int(os.environ.get("TBC_API_CACHE", "1024"))
+MAX_TENANT = 64  # tenant berbeda yang dihitung terpisah; sisanya masuk "lainnya"
+DEFAULT_PORT = 8600
+ARROW = "application/vnd.apache.arrow.file"
+JSON = "application/json; charset=utf-8"
+KOLOM_KUNCI = ("kode_bps", "kabupaten")
+
+
+class Galat(Exception):
+    """Request tidak valid; ``status`` dikirim sebagai kode HTTP."""
+
+    def __init__(self, status, pesan):
+        super().__init__(pesan)
+        self.status = status
+
+
+# ==============================
+# CACHE RESPONS
+# ==============================
+_cache = OrderedDict()  # key -> (etag, body, content type)
+_lock = threading.Lock()
+_statistik = Counter()
+_per_tenant = Counter()
+_frames = {}  # nama -> frame turunan, hanya untuk versi data _frames_versi
+_frames_versi = [None]
+
+
+def _cached(key, compute, jenis="respons"):
+    with _lock:
+        value = _cache.get(key)
+        if value is not None:
+            _cache.move_to_end(key)
+            _statistik[f"{jenis}_hit"] += 1
+            return value
+        _statistik[f"{jenis}_miss"] += 1
+    value = compute()
+    with _lock:
+        _cache[key] = value
+        while len(_cache) > MAX_RESPONSES:
+            _cache.popitem(last=False)
+    return value
+
+
+def clear():
+    with _lock:
+        _cache.clear()
+        _frames.clear()
+        _frames_versi[0] = None
+
+
+def _hitung_tenant(tenant):
+    # X-Tenant bebas diisi klien: batasi panjang dan jumlah kunci supaya statistik tidak tumbuh tanpa batas
+    tenant = tenant[:64]
+    with _lock:
+        if tenant not in _per_tenant and len(_per_tenant) >= MAX_TENANT:
+            tenant = "lainnya"
+        _per_tenant[tenant] += 1
+
+
+def _etag(key):
+    return '"' + hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:24] + '"'
+
+
+# ==============================
+# FRAME PER VERSI DATA
+# ==============================
+def _per_versi(snap, nama, build):
+    # Slot terpisah dari LRU respons (frame tidak terdesak oleh query batch);
+    # hanya versi terbaru yang disimpan, versi lama dibuang saat data berganti
+    with _lock:
+        if _frames_versi[0] == snap.version and nama in _frames:
+            _statistik["frame_hit"] += 1
+            return _frames[nama]
+        _statistik["frame_miss"] += 1
+    frame = build(snap)
+    with _lock:
+        if _frames_versi[0] != snap.version:
+            _frames.clear()
+            _frames_versi[0] = snap.version
+        _frames[nama] = frame
+    return frame
+
+
+def _build_kabupaten(snap):
+    df = snap.df_wilayah[["kode_bps", "kabupaten", "tipadm", "kasus_2024", "populasi_2024",
+                          "prevalensi_per_100k", "luas_km2", "kepadatan"]]
+    df = df.merge(snap.df[["kode_bps", "prevalensi_car_per_100k"]], on="kode_bps", how="left")
+    tren_kasus = snap.tren["Jumlah Kasus"]
+    # kasus_2024 tetap dari file data (angka dashboard); tahun lain dari tren
+    kolom = {f"kasus_{t}": tren_kasus.nilai[:, j] for j, t in enumerate(tren_kasus.tahun)
+             if f"kasus_{t}" not in df.columns}
+    kolom["persen_perubahan"] = tren_kasus.perubahan
+    kolom["cagr_persen"] = tren_kasus.cagr
+    if tren_kasus.tahun:
+        kolom[f"yoy_{tren_kasus.tahun[-1]}_persen"] = tren_kasus.yoy[:, -1]
+    df = df.merge(pd.DataFrame({"kode_bps": tren_kasus.kode, **kolom}), on="kode_bps", how="left")
+    p = snap.proyeksi.prediksi()
+    df = df.merge(pd.DataFrame({
+        "kode_bps": snap.proyeksi.kode,
+        f"proyeksi_{p['tahun']}": p["mean"],
+        f"proyeksi_{p['tahun']}_bawah": p["lo"],
+        f"proyeksi_{p['tahun']}_atas": p["hi"],
+    }), on="kode_bps", how="left")
+    return df.sort_values("kode_bps").reset_index(drop=True)
+
+
+def _build_tren(snap):
+    df = snap.df_trend_long[["kode_bps", "kabupaten", "tahun", "kasus"]]
+    kasus = df["kasus"].astype("float64")
+    sebelum = kasus.groupby(df["kode_bps"]).shift()
+    return df.assign(
+        kabupaten=df["kabupaten"].astype(str),
+        yoy_persen=(kasus / sebelum - 1) * 100,
+    ).sort_values(["kode_bps", "tahun"]).reset_index(drop=True)
+
+
+def _build_provinsi(snap):
+    total = snap.total_per_year.astype({"kasus": "float64"})
+    return total.assign(yoy_persen=total["kasus"].pct_change() * 100)
+
+
+def _build_indeks(snap):
+    return validasi.build_indeks(snap.df_wilayah, snap.denominator)
+
+
+# ==============================
+# QUERY
+# ==============================
+def _daftar(query, nama):
+    nilai = [v.strip() for isi in query.get(nama, []) for v in isi.split(",")]
+    return [v for v in nilai if v]
+
+
+def _kode(snap, query):
+    """Kode BPS terurut dari ``kode=`` + ``nama=``; ``None`` = semua wilayah."""
+    kode = set()
+    for k in _daftar(query, "kode"):
+        if not k.isdigit():
+            raise Galat(400, f"kode bukan angka: {k}")
+        kode.add(int(k))
+    nama = _daftar(query, "nama")
+    if nama:
+        peta = _per_versi(snap, "indeks", _build_indeks).cocokkan(nama)
+        gagal = peta[peta["metode"] != "tepat"]
+        if len(gagal):
+            saran = [f"{r.nama_asli} (mungkin '{r.kabupaten}')" if r.metode == "fuzzy" else r.nama_asli
+                     for r in gagal.itertuples()]
+            raise Galat(400, f"nama wilayah tidak dikenali: {', '.join(saran)}")
+        kode.update(int(k) for k in peta["kode_bps"])
+    if not kode:
+        return None
+    dikenal = set(snap.df_wilayah["kode_bps"].astype(int))
+    asing = sorted(kode - dikenal)
+    if asing:
+        raise Galat(400, f"kode BPS tidak ada di data: {', '.join(map(str, asing))}")
+    return tuple(sorted(kode))
+
+
+def _kolom(frame, query):
+    kolom = _daftar(query, "kolom")
+    if not kolom:
+        return None
+    asing = [k for k in kolom if k not in frame.columns]
+    if asing:
+        raise Galat(400, f"kolom tidak dikenal: {', '.join(asing)}; tersedia: {', '.join(frame.columns)}")
+    return tuple(dict.fromkeys([*(k for k in KOLOM_KUNCI if k in frame.columns), *kolom]))
+
+
+def _format(query, accept):
+    fmt = (query.get("format") or ["arrow" if ARROW in (accept or "") else "json"])[-1]
+    if fmt not in ("json", "arrow"):
+        raise Galat(400, f"format tidak dikenal: {fmt} (json/arrow)")
+    return fmt
+
+
+# ==============================
+# ENCODE
+# ==============================
+def _json(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+
+def _json_default(x):
+    if isinstance(x, np.generic):
+        return x.item()
+    raise TypeError(type(x).__name__)
+
+
+def _records(frame):
+    # to_json: NaN/<NA> -> null, numpy -> angka JSON
+    return json.loads(frame.to_json(orient="records", force_ascii=False))
+
+
+def _arrow(frame):
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _tabel(snap, frame, kode, kolom, fmt):
+    if kode is not None:
+        frame = frame[frame["kode_bps"].isin(kode)]
+    if kolom is not None:
+        frame = frame[list(kolom)]
+    frame = frame.reset_index(drop=True)
+    if fmt == "arrow":
+        return _arrow(frame), ARROW
+    return _json({"versi": list(snap.version), "data": _records(frame)}), JSON
+
+
+# ==============================
+# ENDPOINT
+# ==============================
+def _versi(snap, query, fmt):
+    if fmt == "arrow":
+        raise Galat(400, "/v1/versi hanya tersedia sebagai JSON")
+    wilayah = snap.df_wilayah[["kode_bps", "kabupaten", "tipadm"]].sort_values("kode_bps")
+    key = (snap.version, "/v1/versi", fmt)
+    return key, lambda: (_json({
+        "versi": list(snap.version),
+        "tahun": [int(t) for t in snap.total_per_year["tahun"]],
+        "wilayah": _records(wilayah),
+        "validasi": {"error": snap.validasi.n_error, "peringatan": snap.validasi.n_peringatan},
+    }), JSON)
+
+
+def _provinsi(snap, query, fmt):
+    key = (snap.version, "/v1/provinsi", fmt)
+
+    def build():
+        per_tahun = _per_versi(snap, "provinsi", _build_provinsi)
+        if fmt == "arrow":
+            return _arrow(per_tahun), ARROW
+        p = snap.proyeksi.prediksi()
+        kasus = per_tahun["kasus"].to_numpy(dtype=float)
+        # Sama dengan tren._pct: tahun awal 0 -> tidak terdefinisi
+        pct = float(tren._pct(kasus[-1:], kasus[:1])[0]) if len(kasus) else np.nan
+        return _json({
+            "versi": list(snap.version),
+            "ringkasan": dict(snap.ringkasan),
+            "per_tahun": _records(per_tahun),
+            "persen_perubahan": pct if np.isfinite(pct) else None,
+            "proyeksi": {"tahun": p["tahun"], **p["total"]},
+        }), JSON
+    return key, build
+
+
+def _endpoint_tabel(nama, build):
+    def endpoint(snap, query, fmt):
+        frame = _per_versi(snap, nama, build)
+        kode, kolom = _kode(snap, query), _kolom(frame, query)
+        key = (snap.version, f"/v1/{nama}", kode, kolom, fmt)
+        return key, lambda: _tabel(snap, frame, kode, kolom, fmt)
+    return endpoint
+
+
+ENDPOINT = {
+    "/v1/versi": _versi,
+    "/v1/provinsi": _provinsi,
+    "/v1/kabupaten": _endpoint_tabel("kabupaten", _build_kabupaten),
+    "/v1/tren": _endpoint_tabel("tren", _build_tren),
+}
+
+
+def status():
+    with _lock:
+        return {
+            "cache": {"entri": len(_cache), "maks": MAX_RESPONSES, **_statistik},
+            "tenant": dict(_per_tenant),
+        }
+
+
+def jawab(path, query, accept=None, if_none_match=None):
+    """``(status, header, body)`` untuk satu GET; dipakai handler HTTP dan test lokal."""
+    if path == "/v1/status":
+        return 200, {"Content-Type": JSON, "Cache-Control": "no-store"}, _json(status())
+    endpoint = ENDPOINT.get(path.rstrip("/") or "/")
+    if endpoint is None:
+        raise Galat(404, f"path tidak dikenal: {path}; tersedia: {', '.join([*ENDPOINT, '/v1/status'])}")
+    try:
+        snap = data.snapshot()
+    except Exception as e:  # workbook belum bisa dibaca: klien boleh coba lagi
+        raise Galat(503, f"data belum tersedia: {e}") from e
+
+    key, build = endpoint(snap, query, _format(query, accept))
+    etag = _etag(key)
+    header = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+    if if_none_match and etag in (t.strip() for t in if_none_match.split(",")):
+        with _lock:
+            _statistik["304"] += 1
+        return 304, header, b""
+    _, body, content_type = _cached(key, lambda: (etag, *build()))
+    return 200, {**header, "Content-Type": content_type}, body
+
+
+# ==============================
+# SERVER
+# ==============================
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: load test tidak membuka koneksi per request
+    disable_nagle_algorithm = True  # header dan body ditulis terpisah: tanpa ini +40 ms (delayed ACK)
+    server_version = "tbc-api/1"
+    verbose = False
+
+    def do_GET(self):
+        self._layani(kirim_body=True)
+
+    def do_HEAD(self):
+        self._layani(kirim_body=False)
+
+    def _layani(self, kirim_body):
+        url = urlsplit(self.path)
+        _hitung_tenant(self.headers.get("X-Tenant", "anonim"))
+        try:
+            kode, header, body = jawab(url.path, parse_qs(url.query), self.headers.get("Accept"),
+                                       self.headers.get("If-None-Match"))
+        except Galat as e:
+            kode, header, body = e.status, {"Content-Type": JSON}, _json({"error": str(e)})
+        self.send_response(kode)
+        for nama, nilai in header.items():
+            self.send_header(nama, nilai)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if kirim_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+def serve(host="127.0.0.1", port=DEFAULT_PORT, verbose=False):
+    Handler.verbose = verbose
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API baca JSON/Arrow untuk agregat dashboard TBC.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--verbose", action="store_true", help="log setiap request")
+    args = parser.parse_args(argv)
+
+    data.snapshot()  # build pertama sebelum menerima request
+    server = serve(args.host, args.port, args.verbose)
+    print(f"tbc.api di http://{args.host}:{server.server_address[1]}/v1/ (Ctrl+C untuk berhenti)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
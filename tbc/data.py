@@ -0,0 +1,364 @@
+"""Lapisan akses data bersama untuk semua halaman dashboard.
+
+Semua loader dan agregat turunan (total provinsi, tabel ranking, jumlah per
+tahun, ukuran tren multi-tahun, proyeksi kasus) dihitung sekali per versi data lalu disimpan dalam satu
+``Snapshot``. Kode halaman cukup mengambil ``snapshot()`` dan mengiris hasilnya,
+tanpa ``sort_values``/``groupby`` ulang di setiap rerun Streamlit.
+"""
+
+import functools
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+from tbc import pemulusan, populasi, profiling, proyeksi, spasial, tren, validasi
+from tbc.refresh import Refresher
+from tbc.rbi import load_wilayah, rbi_path
+from tbc.store import data_version, read_excel_cached, resolve
+
+DATA_FILE = "datatbc_jabar_2024.xlsx"
+TREND_FILE = "kasus_tbc_jabar.xlsx"
+
+# Folder state tbc.linelist; kalau diisi, kasus diambil dari agregat line-list
+# (populasi tetap dari DATA_FILE).
+LINELIST_STATE = os.environ.get("TBC_LINELIST_STATE")
+
+ALL_KAB = "Semua Kabupaten/Kota"
+
+# Interval (detik) pemantauan file sumber oleh thread refresh; 0 = tanpa
+# thread, versi dicek dan snapshot dibangun di jalur request.
+REFRESH_INTERVAL = float(os.environ.get("TBC_REFRESH_INTERVAL", "5"))
+
+
+# ==============================
+# LOADER
+# ==============================
+def load_data(path=DATA_FILE):
+    df = read_excel_cached(path)
+    df["prevalensi_per_100k"] = (df["kasus_2024"] / df["populasi_2024"]) * 100000
+    return df
+
+
+def load_trend_data(path=TREND_FILE):
+    df_trend_wide = read_excel_cached(path, header=0)
+    df_trend_wide.columns = df_trend_wide.columns.map(lambda x: str(x).strip())
+
+    # Rename kolom kabupaten
+    for candidate in ["Kabupaten/Kota", "Kabupaten", "kabupaten", "Kota/Kabupaten"]:
+        if candidate in df_trend_wide.columns:
+            df_trend_wide = df_trend_wide.rename(columns={candidate: "kabupaten"})
+            break
+
+    # Deteksi kolom tahun seperti "Tahun 2022"
+    tahun_cols = [c for c in df_trend_wide.columns if re.search(r"\d{4}", c)]
+
+    # Mapping kolom → angka tahun (ekstrak 4 digit)
+    col_to_year = {c: re.search(r"(\d{4})", c).group(1) for c in tahun_cols}
+
+    # Long format
+    with profiling.stage("transform:melt tren"):
+        df_trend_long = _melt(df_trend_wide, col_to_year)
+    return df_trend_wide, df_trend_long, col_to_year
+
+
+def _melt(df_trend_wide, col_to_year):
+    """Tren long dengan skema ringkas (lihat ``skema_long``)."""
+    df_trend_long = pd.melt(
+        df_trend_wide,
+        id_vars=[c for c in ("kode_bps", "kabupaten") if c in df_trend_wide.columns],
+        value_vars=list(col_to_year.keys()),
+        var_name="tahun",
+        value_name="kasus"
+    )
+    return skema_long(df_trend_long, col_to_year)
+
+
+def skema_long(df_trend_long, col_to_year):
+    """Skema ringkas frame tren long, dipakai bersama oleh semua sesi.
+
+    - ``kabupaten``: kategori (nama unik disimpan sekali, kode int8 per baris);
+    - ``kode_bps``: int16 (kode BPS kabupaten/kota 4 digit);
+    - ``tahun``: int16, langsung dari label kolom ("Tahun 2022" -> 2022);
+    - ``kasus``: Int32 (nullable; tahun kosong = <NA>); Int64 kalau ada nilai di
+      luar rentang int32, float32 kalau sumber berisi angka pecahan.
+    """
+    kab = df_trend_long["kabupaten"].astype(str).str.strip()
+    kasus = pd.to_numeric(df_trend_long["kasus"], errors="coerce")
+    terisi = kasus.dropna()
+    bulat = bool((terisi % 1 == 0).all())
+    muat_int32 = terisi.empty or bool(terisi.abs().max() <= np.iinfo(np.int32).max)
+    kolom = {
+        "kabupaten": kab.astype(pd.CategoricalDtype(sorted(kab.unique()))),
+        "tahun": df_trend_long["tahun"].map({c: int(y) for c, y in col_to_year.items()}).astype("int16"),
+        "kasus": kasus.astype(("Int32" if muat_int32 else "Int64") if bulat else "float32"),
+    }
+    if "kode_bps" in df_trend_long.columns:
+        kolom["kode_bps"] = df_trend_long["kode_bps"].astype("int16")
+    df_trend_long = pd.DataFrame({c: kolom[c] for c in ("kode_bps", "kabupaten", "tahun", "kasus") if c in kolom})
+    return df_trend_long.sort_values(["kabupaten", "tahun"]).reset_index(drop=True)
+
+
+# ==============================
+# SNAPSHOT
+# ==============================
+@dataclass(frozen=True)
+class Snapshot:
+    """Semua data + agregat untuk satu versi data. Anggap read-only.
+
+    pandas menjalankan copy-on-write, jadi irisan/filter di kode halaman tidak
+    pernah mengubah frame yang dipakai bersama antar sesi.
+    """
+
+    version: tuple
+    df: pd.DataFrame
+    df_sorted: pd.DataFrame  # urut kasus_2024 menurun
+    df_wilayah: pd.DataFrame  # df + kode_bps, tipadm, luas_km2, kepadatan
+    df_peta: pd.DataFrame  # kode_bps, kabupaten + kolom indikator peta
+    pemulusan: pemulusan.Pemulusan  # prevalensi terlicin EB & CAR + interval kredibel
+    indikator_peta: MappingProxyType  # label indikator -> kolom df_peta
+    denominator: populasi.Denominator  # penduduk BPS per kode × tahun × umur × jk
+    df_denominator: pd.DataFrame  # rate per kabupaten untuk tiap tahun denominator
+    ringkasan: MappingProxyType
+    df_trend_wide: pd.DataFrame
+    df_trend_long: pd.DataFrame
+    kabupaten_list: tuple
+    total_per_year: pd.DataFrame
+    tren: MappingProxyType  # label indikator -> tren.Tren
+    proyeksi: proyeksi.Proyeksi  # fit batch proyeksi kasus per kabupaten
+    validasi: validasi.Validasi  # pemetaan nama -> kode BPS + masalah skema/rentang
+    df_rank: pd.DataFrame  # tabel tren kasus, urut % perubahan menurun
+    pct_col: str
+
+
+def _ringkasan(df):
+    total_kasus = df["kasus_2024"].sum()
+    total_populasi = df["populasi_2024"].sum()
+    prevalensi_rasio = total_kasus / total_populasi
+    return MappingProxyType({
+        "total_kasus": int(total_kasus),
+        "mean_kasus": round(df["kasus_2024"].mean(), 1),
+        "median_kasus": int(df["kasus_2024"].median()),
+        "min_kasus": df["kasus_2024"].min(),
+        "max_kasus": df["kasus_2024"].max(),
+        "total_populasi": int(total_populasi),
+        "prevalensi_per_100k": prevalensi_rasio * 100000,
+        "prevalensi_persen": prevalensi_rasio * 100,
+    })
+
+
+def _tren(df_trend_long, df_wilayah, denom):
+    """Tren per indikator: jumlah kasus, dan rate per 100k kalau kode BPS tersedia."""
+    kasus = tren.dari_long(df_trend_long)
+    hasil = {"Jumlah Kasus": kasus}
+
+    kode = pd.Series(kasus.kode, dtype="int64")
+    ada = kode.isin(denom.kode).to_numpy()
+    if ada.any():
+        # Penduduk tiap tahun tren dari tahun denominator terdekat
+        pos = [denom.tahun.index(denom.tahun_terdekat(y)) for y in kasus.tahun]
+        pop = np.full(kasus.nilai.shape, np.nan)
+        pop[ada] = denom.cube.sum(axis=(2, 3))[denom.idx_kode(kode[ada])][:, pos]
+        hasil["Kasus per 100k Penduduk"] = tren.hitung(
+            kasus.unit, kasus.tahun, populasi.crude_rate(kasus.nilai, pop), window=kasus.window, kode=kasus.kode)
+    return MappingProxyType(hasil)
+
+
+def _peta(df_wilayah, tren_kasus, hasil_pemulusan):
+    per_kode = pd.DataFrame({"kode_bps": tren_kasus.kode,
+                             **{f"kasus_{y}": tren_kasus.nilai[:, j] for j, y in enumerate(tren_kasus.tahun)}})
+    if len(tren_kasus.tahun) >= 2:
+        per_kode["cagr_kasus"] = tren_kasus.cagr
+    df_peta = df_wilayah[["kode_bps", "kabupaten", "prevalensi_per_100k"]].merge(
+        hasil_pemulusan.df[["kode_bps", "car_per_100k", "eb_per_100k"]], on="kode_bps", how="left"
+    ).merge(per_kode, on="kode_bps", how="left")
+    indikator = {
+        "Prevalensi per 100k (2024)": "prevalensi_per_100k",
+        "Prevalensi terlicin CAR per 100k (2024)": "car_per_100k",
+        "Prevalensi terlicin EB per 100k (2024)": "eb_per_100k",
+    }
+    indikator.update({f"Kasus {y}": f"kasus_{y}" for y in reversed(tren_kasus.tahun)})
+    if len(tren_kasus.tahun) >= 2:
+        indikator[f"CAGR Kasus {tren_kasus.periode} (%)"] = "cagr_kasus"
+    return df_peta, MappingProxyType(indikator)
+
+
+def _denominator_table(df_wilayah, denom, tahun_kasus=2024):
+    # Semua unit × tahun sekaligus dari cube [kode, tahun, umur, jk]. Struktur
+    # umur/jk mengikuti tiap tahun, tetapi rate dan SMR kasus ``tahun_kasus``
+    # selalu memakai penduduk tahun terdekat (``tahun_populasi_rate``), bukan
+    # penduduk baris itu — kasus 2024 dibagi penduduk 2020 bukan rate 2024.
+    cube = denom.cube[denom.idx_kode(df_wilayah["kode_bps"])].astype(float)  # (u, y, a, s)
+    pop = cube.sum(axis=(2, 3))
+    batas = denom.batas_umur()
+    laki = [i for i, j in enumerate(denom.jk) if j.upper().startswith("LAKI")]
+    n_unit, n_tahun = pop.shape
+    tahun_rate = denom.tahun_terdekat(tahun_kasus)
+    pos_rate = denom.tahun.index(tahun_rate)
+    kasus = df_wilayah[f"kasus_{tahun_kasus}"].to_numpy()
+
+    df_denom = pd.DataFrame({
+        "kode_bps": np.repeat(df_wilayah["kode_bps"].to_numpy(), n_tahun),
+        "kabupaten": np.repeat(df_wilayah["kabupaten"].to_numpy(), n_tahun),
+        "tahun": np.tile(denom.tahun, n_unit),
+        f"kasus_{tahun_kasus}": np.repeat(kasus, n_tahun),
+        "populasi_bps": pop.ravel().astype(np.int64),
+        "tahun_populasi_rate": tahun_rate,
+        "rate_kasar_per_100k": np.repeat(populasi.crude_rate(kasus, pop[:, pos_rate]), n_tahun),
+        "pct_umur_0_14": (cube[:, :, batas < 15].sum(axis=(2, 3)) / pop * 100).ravel(),
+        "pct_umur_60_plus": (cube[:, :, batas >= 60].sum(axis=(2, 3)) / pop * 100).ravel(),
+        "rasio_jk": (cube[..., laki].sum(axis=(2, 3)) / (pop - cube[..., laki].sum(axis=(2, 3))) * 100).ravel(),
+    })
+
+    ref = populasi.load_rate_referensi(denom)
+    if ref is not None:
+        hasil = populasi.indirect_standardized(kasus, cube[:, pos_rate].sum(axis=-1), ref)
+        for key in ("expected", "smr", "smr_lo", "smr_hi", "rate_isr"):
+            df_denom[key] = np.repeat(np.asarray(hasil[key]), n_tahun)
+    return df_denom
+
+
+def build_snapshot(data_path=DATA_FILE, trend_path=TREND_FILE, version=None, linelist_state=None):
+    if version is None:
+        version = _version(data_path, trend_path, linelist_state)
+
+    denom = populasi.load_denominator()
+    wilayah = load_wilayah()
+    df = load_data(data_path)
+    masalah_linelist = ()
+    if not _agregat_linelist(linelist_state):
+        linelist_state = None
+    if linelist_state:
+        from tbc.linelist import Agregat
+
+        agregat = Agregat.muat(linelist_state)
+        # Nama line-list dipetakan ke kode BPS sebelum kasus ditempel ke workbook populasi
+        df, masalah_linelist = agregat.load_data(df, indeks=validasi.build_indeks(wilayah, denom))
+        df_trend_wide, df_trend_long, col_to_year = agregat.load_trend_data()
+    else:
+        df_trend_wide, df_trend_long, col_to_year = load_trend_data(trend_path)
+
+    with profiling.stage("transform:validasi"):
+        hasil_validasi = validasi.validasi(
+            version, df, df_trend_wide, list(col_to_year), wilayah, denom,
+            file_data=Path(data_path).name if not linelist_state else "line-list",
+            file_tren=Path(trend_path).name if not linelist_state else "line-list",
+            masalah_tambahan=masalah_linelist,
+        )
+    # Tren long dibentuk ulang dari frame tervalidasi: nama kanonik + kode_bps
+    df_trend_long = _melt(hasil_validasi.df_trend_wide, col_to_year)
+
+    with profiling.stage("transform:agregat snapshot"):
+        return _derive(version, hasil_validasi, df_trend_long, denom)
+
+
+def _derive(version, hasil_validasi, df_trend_long, denom):
+    df, df_trend_wide, df_wilayah = hasil_validasi.df, hasil_validasi.df_trend_wide, hasil_validasi.df_wilayah
+    # --- Total provinsi per tahun
+    # Total dijumlah sebagai int64/float64: Int32 per unit bisa meluap saat dijumlah se-provinsi
+    kasus = df_trend_long["kasus"].astype("Int64" if df_trend_long["kasus"].dtype.kind in "iu" else "float64")
+    total_per_year = kasus.groupby(df_trend_long["tahun"]).sum().reset_index()
+    total_per_year["tahun"] = total_per_year["tahun"].astype(int)  # pastikan integer, bukan float
+    total_per_year = total_per_year.sort_values("tahun").reset_index(drop=True)
+
+    tren_map = _tren(df_trend_long, df_wilayah, denom)
+    tren_kasus = tren_map["Jumlah Kasus"]
+    with profiling.stage("transform:pemulusan bayes"):
+        hasil_pemulusan = pemulusan.fit(df_wilayah, spasial.load_bobot() if spasial.tersedia() else None)
+    with profiling.stage("transform:proyeksi kasus"):
+        hasil_proyeksi = proyeksi.dari_tren(tren_kasus)
+    df_peta, indikator_peta = _peta(df_wilayah, tren_kasus, hasil_pemulusan)
+    df = df.assign(prevalensi_car_per_100k=df["kode_bps"].map(
+        hasil_pemulusan.df.set_index("kode_bps")["car_per_100k"]))
+    df_sorted = df.sort_values("kasus_2024", ascending=False).reset_index(drop=True)
+
+    return Snapshot(
+        version=version,
+        df=df,
+        df_sorted=df_sorted,
+        df_wilayah=df_wilayah,
+        df_peta=df_peta,
+        indikator_peta=indikator_peta,
+        pemulusan=hasil_pemulusan,
+        denominator=denom,
+        df_denominator=_denominator_table(df_wilayah, denom),
+        ringkasan=_ringkasan(df),
+        df_trend_wide=df_trend_wide,
+        df_trend_long=df_trend_long,
+        kabupaten_list=tuple(df_trend_wide["kabupaten"].unique()),
+        total_per_year=total_per_year,
+        tren=tren_map,
+        proyeksi=hasil_proyeksi,
+        validasi=hasil_validasi,
+        df_rank=tren_kasus.tabel,
+        pct_col=tren_kasus.pct_col,
+    )
+
+
+def _version(data_path, trend_path, linelist_state=LINELIST_STATE):
+    sources = [data_path, trend_path, rbi_path("dbf"), populasi.POPULASI_FILE]
+    if resolve(populasi.RATE_REFERENSI_FILE).exists():
+        sources.append(populasi.RATE_REFERENSI_FILE)  # SMR di df_denominator
+    if spasial.tersedia():
+        sources.append(rbi_path("shp"))  # graf ketetanggaan untuk pemulusan CAR
+    if _agregat_linelist(linelist_state):
+        sources.append(_agregat_linelist(linelist_state))
+    return data_version(*sources)
+
+
+def _agregat_linelist(state):
+    # Sebelum ingest pertama state belum punya agregat: pakai workbook
+    path = Path(state, "agregat.parquet") if state else None
+    return path if path is not None and path.exists() else None
+
+
+@functools.lru_cache(maxsize=4)
+def _snapshot_for(data_path, trend_path, version):
+    return build_snapshot(data_path, trend_path, version=version, linelist_state=LINELIST_STATE)
+
+
+_refreshers = {}
+_refreshers_lock = threading.Lock()
+
+
+def refresher(data_path=DATA_FILE, trend_path=TREND_FILE):
+    """Refresher background (satu per pasangan file sumber per proses)."""
+    key = (str(data_path), str(trend_path))
+    with _refreshers_lock:
+        ref = _refreshers.get(key)
+        if ref is None:
+            ref = _refreshers[key] = Refresher(
+                build=lambda version: _snapshot_for(*key, version),
+                version=lambda: _version(*key),
+                interval=REFRESH_INTERVAL,
+            ).start()
+    return ref
+
+
+def snapshot(data_path=DATA_FILE, trend_path=TREND_FILE):
+    """Snapshot untuk versi data saat ini.
+
+    Dengan ``REFRESH_INTERVAL`` > 0 snapshot diambil dari refresher background:
+    rerun tidak pernah menunggu parse/rebuild kecuali untuk build pertama, dan
+    perubahan workbook terlihat setelah build di background selesai. Dengan 0,
+    versi dicek tiap rerun (``stat()`` file sumber) dan build terjadi di jalur
+    request.
+    """
+    if REFRESH_INTERVAL > 0:
+        ref = refresher(data_path, trend_path)
+        builds = ref.builds
+        with profiling.stage("load:snapshot"):
+            snap = ref.current()
+        profiling.cache("snapshot", ref.builds == builds)
+        return snap
+
+    misses = _snapshot_for.cache_info().misses
+    with profiling.stage("load:snapshot"):
+        snap = _snapshot_for(str(data_path), str(trend_path), _version(data_path, trend_path))
+    profiling.cache("snapshot", _snapshot_for.cache_info().misses == misses)
+    return snap
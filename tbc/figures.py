@@ -0,0 +1,255 @@
+"""Builder figure Plotly dashboard + cache spec JSON per versi data.
+
+``plotly.express`` memvalidasi dan menyusun seluruh figure setiap dipanggil;
+untuk grafik tren semua kabupaten itu ratusan milidetik per rerun. Di sini
+setiap figure dibangun sekali per (versi data, nama, parameter), disimpan
+sebagai JSON, dan pada cache hit direkonstruksi dengan ``_validate=False``.
+Variasi yang hanya beda seleksi (satu kabupaten, garis ambang) diturunkan dari
+spec yang sudah ada dengan mengubah trace/layout langsung, tanpa ``px`` lagi.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+
+import plotly.express as px
+import plotly.graph_objects as go
+
+from tbc import asosiasi, profiling
+
+MAX_FIGURES = 64
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def _spec(key, builder):
+    with _lock:
+        spec = _cache.get(key)
+        if spec is not None:
+            _cache.move_to_end(key)
+    profiling.cache("figure", spec is not None)
+    if spec is None:
+        with profiling.stage(f"render:px {key[1]}"):
+            spec = builder().to_json()
+        with _lock:
+            _cache[key] = spec
+            while len(_cache) > MAX_FIGURES:
+                _cache.popitem(last=False)
+    return json.loads(spec)
+
+
+def _figure(spec):
+    # spec sudah tervalidasi waktu dibangun; st.plotly_chart juga tidak
+    # memvalidasi ulang objek Figure.
+    return go.Figure(spec, _validate=False)
+
+
+def clear():
+    with _lock:
+        _cache.clear()
+
+
+# ==============================
+# HOME
+# ==============================
+def _build_bar(snap):
+    fig_bar = px.bar(
+        snap.df_sorted,
+        x="kabupaten", y="kasus_2024",
+        labels={"kabupaten": "Kabupaten/Kota", "kasus_2024": "Jumlah Kasus"},
+        title="Kasus TBC 2024 per Kabupaten/Kota",
+        color="kasus_2024", color_continuous_scale="Reds"
+    )
+    fig_bar.update_layout(xaxis_tickangle=-45, height=450)
+    return fig_bar
+
+
+def fig_bar(snap):
+    return _figure(_spec((snap.version, "bar"), lambda: _build_bar(snap)))
+
+
+def _build_hist(snap):
+    fig_hist = px.histogram(
+        snap.df, x="kasus_2024",
+        nbins=10,
+        title="Sebaran Jumlah Kasus antar Kabupaten/Kota",
+        labels={"kasus_2024": "Kasus per Kabupaten/Kota"},
+        color_discrete_sequence=["#2E86C1"]
+    )
+    fig_hist.update_layout(height=400)
+    return fig_hist
+
+
+def fig_hist(snap):
+    return _figure(_spec((snap.version, "hist"), lambda: _build_hist(snap)))
+
+
+def _spec_peta(snap, indikator, resolusi):
+    from tbc import peta
+
+    return _spec(
+        (snap.version, "peta", indikator, resolusi),
+        lambda: peta.choropleth(snap.df_peta, snap.indikator_peta[indikator], indikator,
+                                resolusi=resolusi, title=f"{indikator} per Kabupaten/Kota")
+    )
+
+
+def fig_peta(snap, indikator, resolusi):
+    return _figure(_spec_peta(snap, indikator, resolusi))
+
+
+# ==============================
+# UKURAN EPIDEMIOLOGI
+# ==============================
+def _build_scan(snap):
+    df_wil = snap.df_wilayah
+    df_scan = asosiasi.scan_ambang(df_wil["kasus_2024"], df_wil["populasi_2024"], df_wil["kepadatan"])
+    return px.line(
+        df_scan, x="ambang", y=["pr", "pr_lo", "pr_hi"], log_x=True,
+        labels={"ambang": "Ambang kepadatan (jiwa/km²)", "value": "PR", "variable": ""},
+        title="Prevalence Ratio menurut ambang kepadatan"
+    )
+
+
+def fig_scan(snap, ambang):
+    spec = _spec((snap.version, "scan"), lambda: _build_scan(snap))
+    # Garis ambang hanya beda di layout: tambahkan langsung ke spec
+    spec["layout"].setdefault("shapes", []).append({
+        "type": "line", "xref": "x", "yref": "paper", "x0": ambang, "x1": ambang, "y0": 0, "y1": 1,
+        "line": {"dash": "dash", "color": "#ffc300"},
+    })
+    return _figure(spec)
+
+
+def fig_hotspot(snap, permutasi, resolusi):
+    from tbc import peta, spasial
+
+    return _figure(_spec(
+        (snap.version, "hotspot", permutasi, resolusi),
+        lambda: peta.choropleth(spasial.hasil_snapshot(snap, permutasi).df, "gi_star_z", "Gi* z",
+                                resolusi=resolusi, title="Getis-Ord Gi* Prevalensi per 100k",
+                                colorscale="RdBu_r", zmid=0)
+    ))
+
+
+# ==============================
+# TREN KASUS
+# ==============================
+def _sumbu_tahun(tahun):
+    # Tick per tahun bulat mulai tahun pertama data
+    return dict(tickmode="linear", tick0=int(min(tahun)), dtick=1)
+
+
+def _trace_proyeksi(tahun_akhir, y_akhir, p, warna):
+    """Trace spec: garis putus dari titik terakhir ke proyeksi + interval prediksi."""
+    return [
+        {"type": "scatter", "x": [tahun_akhir, p["tahun"]], "y": [y_akhir, p["mean"]],
+         "mode": "lines", "line": {"dash": "dash", "color": warna}, "showlegend": False,
+         "hoverinfo": "skip"},
+        {"type": "scatter", "x": [p["tahun"]], "y": [p["mean"]], "mode": "markers",
+         "name": f"Proyeksi {p['tahun']}", "marker": {"color": warna, "size": 10, "symbol": "diamond"},
+         "error_y": {"type": "data", "symmetric": False,
+                     "array": [p["hi"] - p["mean"]], "arrayminus": [p["mean"] - p["lo"]]},
+         "hovertemplate": f"Proyeksi %{{x}}: %{{y:,.0f}}<br>PI 95%: {p['lo']:,.0f} – {p['hi']:,.0f}<extra></extra>"},
+    ]
+
+
+def _build_total(snap):
+    tahun = snap.total_per_year["tahun"]
+    fig_total = px.line(
+        snap.total_per_year, x="tahun", y="kasus", markers=True,
+        title=f"Total Kasus TBC ({tahun.min()}–{tahun.max()})",
+        labels={"tahun": "Tahun", "kasus": "Jumlah Kasus"},
+        line_shape="linear"
+    )
+    fig_total.update_traces(line_color="#e63946", line_width=3)
+    p = snap.proyeksi.prediksi()
+    for trace in _trace_proyeksi(int(tahun.iloc[-1]), float(snap.total_per_year["kasus"].iloc[-1]),
+                                 {"tahun": p["tahun"], **p["total"]}, "#e63946"):
+        fig_total.add_trace(trace)
+    fig_total.update_layout(
+        height=400,
+        xaxis=_sumbu_tahun(tahun)
+    )
+    return fig_total
+
+
+def fig_total(snap):
+    return _figure(_spec((snap.version, "total"), lambda: _build_total(snap)))
+
+
+def _build_kab(snap):
+    fig_kab = px.line(
+        snap.df_trend_long,
+        x="tahun", y="kasus", color="kabupaten",
+        labels={"tahun": "Tahun", "kasus": "Jumlah Kasus", "kabupaten": "Kabupaten/Kota"},
+        title="Perubahan Kasus TBC per Kabupaten/Kota",
+        line_shape="linear"
+    )
+    fig_kab.update_layout(
+        legend_title_text="Kabupaten/Kota",
+        height=550,
+        xaxis=_sumbu_tahun(snap.df_trend_long["tahun"].astype(int))
+    )
+    return fig_kab
+
+
+def fig_kab(snap, kab_filter=None):
+    """Tren semua kabupaten, atau satu kabupaten (diiris dari spec semua kabupaten)."""
+    spec = _spec((snap.version, "kab"), lambda: _build_kab(snap))
+    if kab_filter is not None:
+        spec["data"] = [trace for trace in spec["data"] if trace.get("name") == kab_filter]
+        for trace in spec["data"]:
+            trace["mode"] = "lines+markers"
+        spec["layout"]["title"]["text"] = f"Tren Kasus TBC — {kab_filter}"
+        hasil = snap.proyeksi
+        if kab_filter in hasil.unit and spec["data"]:
+            i = hasil.unit_index(kab_filter)
+            p = hasil.prediksi()
+            warna = spec["data"][0].get("line", {}).get("color", "#e63946")
+            spec["data"] += _trace_proyeksi(hasil.tahun[-1], float(hasil.nilai[i, -1]), {
+                "tahun": p["tahun"], "mean": float(p["mean"][i]), "lo": float(p["lo"][i]), "hi": float(p["hi"][i])
+            }, warna)
+    return _figure(spec)
+
+
+# ==============================
+# LAPORAN PER KABUPATEN
+# ==============================
+def _build_rank(snap):
+    df = snap.df.sort_values("prevalensi_per_100k")
+    fig_rank = px.bar(
+        df, x="prevalensi_per_100k", y="kabupaten", orientation="h",
+        labels={"prevalensi_per_100k": "Prevalensi per 100k", "kabupaten": ""},
+        title="Peringkat Prevalensi per 100k (2024)"
+    )
+    fig_rank.update_traces(marker_color="#d5d8dc")
+    fig_rank.update_layout(height=700, margin=dict(l=0, r=10, t=40, b=0))
+    return fig_rank
+
+
+def fig_rank_kab(snap, kab, jendela=20):
+    """Peringkat prevalensi dengan ``kab`` disorot; unit banyak dipotong ±``jendela`` di sekitarnya."""
+    spec = _spec((snap.version, "rank"), lambda: _build_rank(snap))
+    trace = spec["data"][0]
+    trace["marker"]["color"] = ["#e63946" if k == kab else "#d5d8dc" for k in trace["y"]]
+    if len(trace["y"]) > 2 * jendela and kab in trace["y"]:
+        i = trace["y"].index(kab)
+        spec["layout"]["yaxis"]["range"] = [i - jendela - 0.5, i + jendela + 0.5]
+    spec["layout"]["title"]["text"] = f"Peringkat Prevalensi per 100k (2024) — {kab}"
+    return _figure(spec)
+
+
+def fig_peta_kab(snap, kab, resolusi):
+    """Inset peta prevalensi dengan batas ``kab`` ditebalkan (array garis, tanpa trace tambahan)."""
+    indikator = next(iter(snap.indikator_peta))
+    spec = _spec_peta(snap, indikator, resolusi)
+    # Urutan lokasi trace = urutan baris df_peta (kode_bps ter-encode biner di spec)
+    pilih = [k == kab for k in snap.df_peta["kabupaten"]]
+    spec["data"][0]["marker"]["line"] = {
+        "color": ["#1b2631" if p else "white" for p in pilih],
+        "width": [3 if p else 0.5 for p in pilih],
+    }
+    spec["layout"]["title"]["text"] = f"{indikator} — {kab}"
+    return _figure(spec)
@@ -0,0 +1,294 @@
+"""Buletin statis (PNG + PDF): satu halaman per kabupaten/kota, tanpa Streamlit.
+
+Memakai snapshot dan builder figure yang sama dengan dashboard. Figure
+dirender ke PNG oleh kaleido di process pool: tiap worker membuka satu server
+kaleido (Chrome) di ``initializer`` dan memakainya untuk semua figure, bukan
+membuka browser per gambar. Key tiap figure = SHA-256 spec JSON + ukuran
+render; figure yang key-nya sama dengan ``manifest.json`` di folder output
+dilewati, jadi run malam berikutnya hanya merender halaman yang datanya
+berubah. Halaman disusun dengan Pillow lalu digabung jadi satu PDF.
+
+Contoh:
+
+    python -m tbc.laporan --out laporan/ --workers 4
+    python -m tbc.laporan --out /tmp/laporan --skala 1 2 4   # wall-clock per jumlah worker
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from importlib import metadata
+from pathlib import Path
+
+from tbc import data, figures, peta
+
+LEBAR = 1600
+TINGGI_JUDUL = 90
+SCALE = 1
+DEFAULT_RESOLUSI = "Ringan"
+DEFAULT_OUT = Path("laporan")
+PDF_BATCH = 16  # halaman yang dibuka sekaligus saat menyusun PDF
+
+
+# ==============================
+# SPESIFIKASI HALAMAN
+# ==============================
+@dataclass(frozen=True)
+class Gambar:
+    """Satu figure yang akan dirender; ``nama`` relatif terhadap folder output."""
+
+    nama: str
+    spec: str  # JSON figure Plotly
+    width: int
+    height: int
+    x: int = 0  # posisi di halaman (di bawah judul)
+    y: int = 0
+
+    @property
+    def key(self):
+        h = hashlib.sha256(self.spec.encode("utf-8"))
+        h.update(f"|{self.width}x{self.height}@{SCALE}|plotly {metadata.version('plotly')}".encode())
+        return h.hexdigest()
+
+
+@dataclass(frozen=True)
+class Halaman:
+    nama: str  # file PNG halaman, relatif terhadap folder output
+    judul: str
+    gambar: tuple
+
+    @property
+    def key(self):
+        return hashlib.sha256("|".join([self.judul, *(g.key for g in self.gambar)]).encode()).hexdigest()
+
+
+def _slug(teks):
+    return re.sub(r"[^a-z0-9]+", "-", teks.lower()).strip("-")
+
+
+def _gambar(nama, fig, width, height, x=0, y=0):
+    return Gambar(nama=nama, spec=fig.to_json(), width=width, height=height, x=x, y=y)
+
+
+def daftar_halaman(snap, kabupaten=None, resolusi=DEFAULT_RESOLUSI):
+    """Sampul provinsi + satu halaman per kabupaten (tren, peringkat, inset peta)."""
+    ada_peta = peta.tersedia()
+    tahun = snap.total_per_year["tahun"]
+    hasil = [Halaman(
+        nama="halaman/00-provinsi.png",
+        judul=f"TBC Jawa Barat {tahun.min()}–{tahun.max()}",
+        gambar=(
+            _gambar("gambar/provinsi-total.png", figures.fig_total(snap), LEBAR, 520),
+            _gambar("gambar/provinsi-bar.png", figures.fig_bar(snap), LEBAR, 700, y=520),
+        ),
+    )]
+    for i, kab in enumerate(kabupaten or snap.kabupaten_list, start=1):
+        slug = _slug(kab)
+        gambar = [
+            _gambar(f"gambar/{slug}-tren.png", figures.fig_kab(snap, kab), LEBAR, 520),
+            _gambar(f"gambar/{slug}-rank.png", figures.fig_rank_kab(snap, kab),
+                    LEBAR // 2 if ada_peta else LEBAR, 700, y=520),
+        ]
+        if ada_peta:
+            gambar.append(_gambar(f"gambar/{slug}-peta.png", figures.fig_peta_kab(snap, kab, resolusi),
+                                  LEBAR // 2, 700, x=LEBAR // 2, y=520))
+        hasil.append(Halaman(nama=f"halaman/{i:03d}-{slug}.png", judul=kab, gambar=tuple(gambar)))
+    return hasil
+
+
+# ==============================
+# RENDER (PROCESS POOL)
+# ==============================
+def _init_worker():
+    # Satu browser per worker, dipakai ulang oleh semua plotly.io.to_image
+    import atexit
+
+    import kaleido
+
+    kaleido.start_sync_server(silence_warnings=True)
+    atexit.register(kaleido.stop_sync_server, silence_warnings=True)
+
+
+def _tulis(path, isi):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    tmp.write_bytes(isi)
+    tmp.replace(path)
+
+
+def _render(tugas):
+    import plotly.graph_objects as go
+    import plotly.io
+
+    spec, width, height, tujuan = tugas
+    t0 = time.perf_counter()
+    fig = go.Figure(json.loads(spec), _validate=False)
+    _tulis(Path(tujuan), plotly.io.to_image(fig, format="png", width=width, height=height, scale=SCALE))
+    return time.perf_counter() - t0
+
+
+def render(gambar, out, workers=None):
+    """Render ``gambar`` ke ``out``; mengembalikan detik render per nama figure."""
+    if not gambar:
+        return {}
+    workers = max(1, min(workers or os.cpu_count() or 1, len(gambar)))
+    tugas = [(g.spec, g.width, g.height, str(out / g.nama)) for g in gambar]
+    # spawn: worker bersih tanpa thread/loop event warisan proses induk
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=ctx, initializer=_init_worker) as pool:
+        detik = pool.map(_render, tugas, chunksize=max(1, len(tugas) // (workers * 4)))
+        return dict(zip((g.nama for g in gambar), detik))
+
+
+# ==============================
+# SUSUN HALAMAN + PDF
+# ==============================
+def _font(size):
+    from PIL import ImageFont
+
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1
+        return ImageFont.load_default()
+
+
+def susun_halaman(halaman, out):
+    from PIL import Image, ImageDraw
+
+    tinggi = TINGGI_JUDUL + max(g.y + g.height for g in halaman.gambar)
+    page = Image.new("RGB", (LEBAR * SCALE, tinggi * SCALE), "white")
+    ImageDraw.Draw(page).text((40 * SCALE, 25 * SCALE), halaman.judul, fill="#1b2631", font=_font(40 * SCALE))
+    for g in halaman.gambar:
+        with Image.open(out / g.nama) as img:
+            page.paste(img.convert("RGB"), (g.x * SCALE, (TINGGI_JUDUL + g.y) * SCALE))
+    path = out / halaman.nama
+    path.parent.mkdir(parents=True, exist_ok=True)
+    page.save(path)
+
+
+def susun_pdf(halaman, out, nama="laporan.pdf", batch=PDF_BATCH):
+    """PDF dari PNG halaman, ditulis per ``batch`` halaman (``append=True``).
+
+    Pillow memuat semua ``append_images`` sebelum menulis, jadi yang ada di
+    memori paling banyak ``batch`` bitmap, bukan seluruh buletin.
+    """
+    import gc
+    from contextlib import ExitStack
+
+    from PIL import Image
+
+    path = out / nama
+    tmp = path.with_name(f".{nama}.{os.getpid()}.tmp")
+    for mulai in range(0, len(halaman), batch):
+        with ExitStack() as stack:
+            pages = [stack.enter_context(Image.open(out / h.nama)) for h in halaman[mulai:mulai + batch]]
+            pages = [p if p.mode == "RGB" else p.convert("RGB") for p in pages]
+            pages[0].save(tmp, format="PDF", save_all=True, append=mulai > 0, append_images=pages[1:],
+                          resolution=150)
+        # Simpan PDF Pillow meninggalkan siklus referensi ke halaman; tanpa
+        # collect bitmap batch lama baru dibebaskan saat GC kebetulan jalan
+        del pages
+        gc.collect()
+    tmp.replace(path)
+    return path
+
+
+# ==============================
+# PIPELINE
+# ==============================
+def _muat_manifest(out):
+    try:
+        with open(out / "manifest.json", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"gambar": {}, "halaman": {}}
+
+
+def buat(halaman, out, workers=None, paksa=False, pdf=True):
+    """Render figure yang berubah, susun halaman yang berubah, lalu PDF."""
+    out = Path(out)
+    manifest = {"gambar": {}, "halaman": {}} if paksa else _muat_manifest(out)
+
+    semua = {g.nama: g for h in halaman for g in h.gambar}
+    ubah = [g for g in semua.values()
+            if manifest["gambar"].get(g.nama) != g.key or not (out / g.nama).exists()]
+    t0 = time.perf_counter()
+    render(ubah, out, workers)
+    t_render = time.perf_counter() - t0
+    manifest["gambar"].update({g.nama: g.key for g in ubah})
+
+    susun = [h for h in halaman
+             if manifest["halaman"].get(h.nama) != h.key or not (out / h.nama).exists()]
+    for h in susun:
+        susun_halaman(h, out)
+        manifest["halaman"][h.nama] = h.key
+
+    key_pdf = hashlib.sha256("|".join(h.key for h in halaman).encode()).hexdigest()
+    if pdf and (manifest.get("pdf") != key_pdf or not (out / "laporan.pdf").exists()):
+        susun_pdf(halaman, out)
+        manifest["pdf"] = key_pdf
+    _tulis(out / "manifest.json", json.dumps(manifest, indent=2).encode("utf-8"))
+    return {
+        "gambar": len(semua),
+        "dirender": len(ubah),
+        "dilewati": len(semua) - len(ubah),
+        "halaman_disusun": len(susun),
+        "detik_render": t_render,
+        "detik_total": time.perf_counter() - t0,
+    }
+
+
+def skala(halaman, daftar_workers):
+    """Wall-clock render semua figure (tanpa skip) untuk tiap jumlah worker."""
+    gambar = list({g.nama: g for h in halaman for g in h.gambar}.values())
+    hasil = []
+    for n in daftar_workers:
+        with tempfile.TemporaryDirectory(prefix="tbc-laporan-") as tmp:
+            t0 = time.perf_counter()
+            render(gambar, Path(tmp), n)
+            hasil.append({"workers": n, "detik": time.perf_counter() - t0})
+    dasar = hasil[0]
+    for r in hasil:
+        r["speedup"] = dasar["detik"] / r["detik"]
+        r["efisiensi"] = r["speedup"] * dasar["workers"] / r["workers"]
+    return hasil
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render buletin TBC per kabupaten/kota ke PNG + PDF.")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT)
+    parser.add_argument("--workers", type=int, default=None, help="default: jumlah core")
+    parser.add_argument("--kabupaten", nargs="+", help="hanya unit ini (default semua)")
+    parser.add_argument("--resolusi", choices=list(peta.RESOLUSI), default=DEFAULT_RESOLUSI)
+    parser.add_argument("--paksa", action="store_true", help="render ulang walau input tidak berubah")
+    parser.add_argument("--tanpa-pdf", action="store_true")
+    parser.add_argument("--skala", type=int, nargs="+", metavar="N",
+                        help="ukur wall-clock render untuk tiap jumlah worker lalu keluar")
+    args = parser.parse_args(argv)
+
+    snap = data.build_snapshot(linelist_state=data.LINELIST_STATE)
+    halaman = daftar_halaman(snap, args.kabupaten, args.resolusi)
+
+    if args.skala:
+        print(f"{sum(len(h.gambar) for h in halaman)} figure, {os.cpu_count()} core")
+        print(f"{'workers':>8}{'detik':>10}{'speedup':>10}{'efisiensi':>11}")
+        for r in skala(halaman, args.skala):
+            print(f"{r['workers']:>8}{r['detik']:>10.2f}{r['speedup']:>10.2f}{r['efisiensi']:>10.0%}")
+        return
+
+    hasil = buat(halaman, args.out, args.workers, paksa=args.paksa, pdf=not args.tanpa_pdf)
+    print(f"{hasil['dirender']} figure dirender, {hasil['dilewati']} dilewati (input sama), "
+          f"{hasil['halaman_disusun']} halaman disusun; render {hasil['detik_render']:.1f} s, "
+          f"total {hasil['detik_total']:.1f} s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
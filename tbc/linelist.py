@@ -0,0 +1,212 @@
+"""Ingest streaming data line-list (satu baris per notifikasi kasus).
+
+File CSV/Parquet dibaca per chunk dengan ukuran tetap lalu dilipat ke agregat
+berjalan per (kabupaten, tahun, minggu). Memori puncak ditentukan ukuran chunk
+dan jumlah grup, bukan ukuran file. Agregat + daftar file yang sudah masuk
+disimpan di ``state``; batch baru cukup menambah total tanpa membaca ulang
+riwayat.
+
+Contoh:
+
+    python -m tbc.linelist notifikasi_2024.csv notifikasi_2025_q1.parquet
+"""
+
+import argparse
+import io
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from tbc import CACHE_DIR
+from tbc.store import fingerprint, write_atomic
+
+DEFAULT_STATE = CACHE_DIR / "linelist"
+DEFAULT_CHUNKSIZE = 250_000
+KUNCI = ["kabupaten", "tahun", "minggu"]
+META_FILES = b"tbc.linelist.files"  # daftar file ter-ingest di metadata parquet
+
+
+def iter_chunks(path, kolom_kabupaten="kabupaten", kolom_tanggal="tanggal", chunksize=DEFAULT_CHUNKSIZE):
+    """Iterasi DataFrame kecil (hanya dua kolom yang dibutuhkan) dari CSV/Parquet."""
+    path = Path(path)
+    columns = [kolom_kabupaten, kolom_tanggal]
+    if path.suffix.lower() in (".parquet", ".pq"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=columns, dtype={kolom_kabupaten: "category"},
+                               chunksize=chunksize)
+
+
+def agregasi_chunk(chunk, kolom_kabupaten="kabupaten", kolom_tanggal="tanggal"):
+    """Jumlah kasus per (kabupaten, tahun, minggu) untuk satu chunk.
+
+    ``minggu`` = minggu ke-n dalam tahun kalender (1–53), supaya setiap minggu
+    selalu jatuh di tahun yang sama dengan tanggalnya.
+    """
+    tanggal = pd.to_datetime(chunk[kolom_tanggal], errors="coerce")
+    valid = tanggal.notna()
+    tanggal = tanggal[valid]
+    kab = chunk.loc[valid, kolom_kabupaten].astype(str).str.strip()
+    keys = pd.DataFrame({
+        "kabupaten": kab.to_numpy(),
+        "tahun": tanggal.dt.year.to_numpy(dtype=np.int16),
+        "minggu": ((tanggal.dt.dayofyear - 1) // 7 + 1).to_numpy(dtype=np.int8),
+    })
+    return keys.groupby(KUNCI, sort=False).size()
+
+
+class Agregat:
+    """Agregat kasus berjalan per (kabupaten, tahun, minggu)."""
+
+    def __init__(self, kasus=None, files=None):
+        index = pd.MultiIndex.from_arrays([[], [], []], names=KUNCI)
+        self.kasus = kasus if kasus is not None else pd.Series([], index=index, dtype="int64")
+        self.files = dict(files or {})  # sha256 -> nama file yang sudah di-ingest
+        self.baris = int(self.kasus.sum())
+
+    def tambah(self, counts):
+        self.kasus = self.kasus.add(counts, fill_value=0).astype("int64")
+        self.baris += int(counts.sum())
+
+    def ingest(self, path, chunksize=DEFAULT_CHUNKSIZE, **kolom):
+        """Lipat satu file ke agregat. Mengembalikan False kalau file sudah pernah masuk."""
+        # Satu path absolut (relatif terhadap CWD) untuk hash dan pembacaan;
+        # fingerprint sendiri menganggap path relatif ada di DATA_DIR
+        path = Path(path).resolve()
+        digest = fingerprint(path)
+        if digest in self.files:
+            return False
+        for chunk in iter_chunks(path, chunksize=chunksize, **kolom):
+            self.tambah(agregasi_chunk(chunk, **kolom))
+        self.files[digest] = path.name
+        return True
+
+    # --- persistensi
+    def simpan(self, state=DEFAULT_STATE):
+        """Tulis agregat lalu manifest ``files.json``, keduanya atomik (temp + replace).
+
+        Daftar file juga disimpan di metadata parquet, jadi agregat dan file
+        yang sudah dihitung selalu berpindah bersama; ``files.json`` (ditulis
+        terakhir) hanya salinan yang mudah dibaca.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        state = Path(state)
+        state.mkdir(parents=True, exist_ok=True)
+        manifest = json.dumps(self.files, indent=1).encode("utf-8")
+        table = pa.Table.from_pandas(self.kasus.rename("kasus").reset_index(), preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), META_FILES: manifest})
+        buf = io.BytesIO()
+        pq.write_table(table, buf)
+        write_atomic(state / "agregat.parquet", buf.getvalue())
+        write_atomic(state / "files.json", manifest)
+
+    @classmethod
+    def muat(cls, state=DEFAULT_STATE):
+        state = Path(state)
+        if not (state / "agregat.parquet").exists():
+            return cls()
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(state / "agregat.parquet")
+        kasus = table.to_pandas().set_index(KUNCI)["kasus"].astype("int64")
+        meta = (table.schema.metadata or {}).get(META_FILES)
+        if meta is None:  # state lama tanpa metadata
+            meta = (state / "files.json").read_bytes()
+        return cls(kasus, json.loads(meta))
+
+    # --- keluaran dengan skema yang sama seperti tbc.data
+    def per_tahun(self):
+        return self.kasus.groupby(level=["kabupaten", "tahun"]).sum()
+
+    def load_trend_data(self):
+        """``(df_trend_wide, df_trend_long, col_to_year)`` seperti ``data.load_trend_data``."""
+        df_trend_wide = self.per_tahun().unstack("tahun", fill_value=0).sort_index(axis=1)
+        col_to_year = {f"Tahun {y}": str(y) for y in df_trend_wide.columns}
+        df_trend_wide.columns = list(col_to_year)
+        df_trend_wide = df_trend_wide.reset_index()
+
+        from tbc.data import _melt
+
+        return df_trend_wide, _melt(df_trend_wide, col_to_year), col_to_year
+
+    def load_data(self, df_populasi, tahun=2024, indeks=None):
+        """``(df, masalah)``: frame seperti ``data.load_data`` + daftar nama line-list bermasalah.
+
+        Populasi diambil dari ``df_populasi``. Dengan ``indeks``
+        (``validasi.Indeks``) nama line-list dan workbook dicocokkan lewat kode
+        BPS; tanpa itu harus sama persis. Wilayah tanpa notifikasi = 0 kasus,
+        tetapi kasus dengan nama yang tidak dikenali dilaporkan di ``masalah``
+        (format ``validasi.Validasi.masalah``), tidak hilang diam-diam. Nama
+        fuzzy sudah dilaporkan validasi tren (frame tren memakai nama yang sama).
+        """
+        try:
+            kasus = self.per_tahun().xs(tahun, level="tahun")
+        except KeyError:  # state kosong atau belum ada notifikasi tahun ini
+            kasus = pd.Series([], index=pd.Index([], dtype=object, name="kabupaten"), dtype="int64")
+        df = df_populasi[["kabupaten", f"populasi_{tahun}"]].copy()
+        if indeks is None:
+            kunci_ll, kunci_df = pd.Series(kasus.index, dtype=object), df["kabupaten"]
+        else:
+            peta = indeks.cocokkan(list(kasus.index)).set_index("nama_asli")
+            kunci_ll = pd.Series(kasus.index, dtype=object).map(peta["kode_bps"])
+            peta_df = indeks.cocokkan(df["kabupaten"]).set_index("nama_asli")
+            kunci_df = df["kabupaten"].astype(str).map(peta_df["kode_bps"])
+        dikenal = kunci_ll.notna().to_numpy() & kunci_ll.isin(kunci_df.dropna()).to_numpy()
+        masalah = [
+            {"file": "line-list", "aturan": "nama_tidak_cocok", "tingkat": "error", "kode_bps": None,
+             "nama": nama, "pesan": f"{n:,} kasus {tahun} tidak cocok dengan wilayah mana pun; diabaikan"}
+            for nama, n in kasus[~dikenal].items()
+        ]
+        if not len(kasus):
+            masalah.append({"file": "line-list", "aturan": "tahun_kosong", "tingkat": "error", "kode_bps": None,
+                            "nama": None, "pesan": f"tidak ada notifikasi {tahun}; semua wilayah 0 kasus"})
+        per_kunci = kasus[dikenal].groupby(kunci_ll[dikenal].to_numpy()).sum()
+        df.insert(1, f"kasus_{tahun}", kunci_df.map(per_kunci).fillna(0).astype("int64"))
+        masalah += [
+            {"file": "line-list", "aturan": "tanpa_notifikasi", "tingkat": "peringatan", "kode_bps": None,
+             "nama": nama, "pesan": f"tidak ada notifikasi {tahun}; dihitung 0 kasus"}
+            for nama in df.loc[df[f"kasus_{tahun}"] == 0, "kabupaten"]
+        ]
+        df["prevalensi_per_100k"] = (df[f"kasus_{tahun}"] / df[f"populasi_{tahun}"]) * 100000
+        return df, masalah
+
+    def mingguan(self, kabupaten=None):
+        """Kasus per minggu (long format), opsional untuk satu kabupaten."""
+        kasus = self.kasus if kabupaten is None else self.kasus.xs(kabupaten, level="kabupaten", drop_level=False)
+        return kasus.rename("kasus").reset_index().sort_values(KUNCI).reset_index(drop=True)
+
+
+def ingest(paths, state=DEFAULT_STATE, chunksize=DEFAULT_CHUNKSIZE, **kolom):
+    """Muat state, lipat file-file baru, simpan. Mengembalikan ``(agregat, file_baru)``."""
+    agregat = Agregat.muat(state)
+    baru = [p for p in paths if agregat.ingest(p, chunksize=chunksize, **kolom)]
+    if baru:
+        agregat.simpan(state)
+    return agregat, baru
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest line-list kasus TBC ke agregat berjalan.")
+    parser.add_argument("files", nargs="+", type=Path, help="file CSV/Parquet line-list")
+    parser.add_argument("--state", type=Path, default=DEFAULT_STATE)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--kolom-kabupaten", default="kabupaten")
+    parser.add_argument("--kolom-tanggal", default="tanggal")
+    args = parser.parse_args(argv)
+
+    agregat, baru = ingest(args.files, state=args.state, chunksize=args.chunksize,
+                           kolom_kabupaten=args.kolom_kabupaten, kolom_tanggal=args.kolom_tanggal)
+    for path in args.files:
+        print(f"{'+' if path in baru else '='} {path}")
+    print(f"total {agregat.baris:,} notifikasi, {len(agregat.kasus):,} sel (kabupaten, tahun, minggu)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""Pemulusan Bayes area kecil untuk prevalensi per kabupaten/kota.
+
+Dua estimator, keduanya tanpa MCMC:
+
+- **Empirical Bayes Poisson-Gamma**: ``yᵢ ~ Poisson(Eᵢ θᵢ)``, ``θᵢ ~ Gamma(α, β)``
+  dengan α, β dari momen global (Marshall). Posterior ``Gamma(α+yᵢ, β+Eᵢ)``
+  tertutup; kuantil/peluang memakai aproksimasi Wilson-Hilferty.
+- **CAR Leroux** (BYM-style): ``log θᵢ = β₀ + φᵢ``, ``φ ~ N(0, (τQ)⁻¹)``,
+  ``Q = ρ(D − W) + (1 − ρ)I``. Untuk tiap titik grid (τ, ρ) mode posterior
+  dicari dengan Newton dan marginal likelihood dengan aproksimasi Laplace
+  (seperti INLA); posterior akhir = campuran Gaussian berbobot. Tanpa graf
+  ketetanggaan (``.shp`` belum ada) model turun ke efek acak iid (ρ = 0).
+
+Dengan graf, tiap titik grid memakai aljabar padat O(n³) (solve/cholesky
+matriks (n+1)²), jadi hanya titik grid yang bobotnya berarti yang dihitung
+(lihat ``car_leroux``) dan di atas ``MAKS_UNIT_CAR`` ``fit`` memakai model
+iid. Model iid tidak butuh matriks padat — Hessian-nya berbentuk panah
+(baris/kolom β₀ + diagonal) dan diselesaikan dengan komplemen Schur dalam
+O(n) per titik grid. Model yang dipakai tercatat di ``Pemulusan.car["model"]``.
+
+Fit dilakukan sekali per versi data di ``Snapshot``; peluang melewati ambang
+RR dihitung dari ringkasan posterior yang sama dan di-cache per ambang.
+"""
+
+import functools
+from dataclasses import dataclass
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+LOG_TAU = np.linspace(-2, 10, 25)
+RHO = np.array([0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 0.99])
+PRIOR_TAU = (1.0, 5e-5)  # Gamma(shape, rate) untuk presisi τ (default INLA)
+PRIOR_BETA0_VAR = 100.0
+BATAS_LOG_POST = 12.0  # titik grid dengan log posterior < puncak − batas (bobot < e⁻¹²) dilewati
+MAKS_UNIT_CAR = 700  # batas unit CAR dengan graf (625 unit ≈ 2 s per fit); di atasnya model iid
+
+_norm = NormalDist()
+_cdf = np.vectorize(_norm.cdf, otypes=[float])
+
+
+# ==============================
+# EMPIRICAL BAYES POISSON-GAMMA
+# ==============================
+def _gamma_ppf(q, shape, rate):
+    # Wilson-Hilferty: (X/shape)^(1/3) ~ Normal
+    z = _norm.inv_cdf(q)
+    c = 1 / (9 * shape)
+    return shape * np.maximum(1 - c + z * np.sqrt(c), 0) ** 3 / rate
+
+
+def _gamma_sf(x, shape, rate):
+    c = 1 / (9 * shape)
+    z = (np.cbrt(x * rate / shape) - (1 - c)) / np.sqrt(c)
+    return 1 - _cdf(z)
+
+
+def empirical_bayes(kasus, expected, alpha=0.05):
+    """Posterior Poisson-Gamma per unit: ``(shape, rate)`` + mean dan CI untuk RR."""
+    y = np.asarray(kasus, dtype=float)
+    e = np.asarray(expected, dtype=float)
+    smr = y / e
+    m = y.sum() / e.sum()
+    s2 = (e * (smr - m) ** 2).sum() / e.sum()
+    var = max(s2 - m / e.mean(), 1e-6 * m ** 2)  # variasi antar-area di luar Poisson
+    a, b = m ** 2 / var, m / var
+    shape, rate = a + y, b + e
+    return {
+        "shape": shape,
+        "rate": rate,
+        "rr": shape / rate,
+        "rr_lo": _gamma_ppf(alpha / 2, shape, rate),
+        "rr_hi": _gamma_ppf(1 - alpha / 2, shape, rate),
+    }
+
+
+# ==============================
+# CAR LEROUX (LAPLACE + GRID)
+# ==============================
+def _laplacian(bobot, n):
+    lap = np.zeros((n, n))
+    if bobot is not None:
+        lap[bobot.baris(), bobot.indices] = -1.0
+        lap[np.diag_indices(n)] = bobot.kardinalitas
+    return lap
+
+
+def _hessian(prec, mu):
+    # −∇² log posterior untuk x = (β₀, φ) dengan η = β₀ + φ
+    hess = prec.copy()
+    hess[0, 0] += mu.sum()
+    hess[0, 1:] += mu
+    hess[1:, 0] += mu
+    hess[1:, 1:][np.diag_indices(len(mu))] += mu
+    return hess
+
+
+def _mode(y, e, prec, x0, iterasi=50):
+    """Mode posterior x = (β₀, φ) dengan Newton; ``prec`` = presisi prior (n+1, n+1)."""
+    x = x0.copy()
+    for _ in range(iterasi):
+        mu = e * np.exp(x[0] + x[1:])
+        grad = np.concatenate([[(y - mu).sum()], y - mu]) - prec @ x
+        step = np.linalg.solve(_hessian(prec, mu), grad)
+        x += step
+        if np.abs(step).max() < 1e-8:
+            break
+    return x, np.linalg.cholesky(_hessian(prec, e * np.exp(x[0] + x[1:])))
+
+
+def _mode_iid(y, e, tau, x0, iterasi=50):
+    """``_mode`` untuk presisi prior diagonal (ρ = 0) dalam O(n).
+
+    Hessian = [[h₀₀, μᵀ], [μ, diag(d)]] dengan d = τ + μ; solve, log-det dan
+    diagonal inversnya lewat komplemen Schur c = h₀₀ − Σ μ²/d. Mengembalikan
+    ``(x, ½ log det H, Var(η))``.
+    """
+    x = x0.copy()
+    for _ in range(iterasi):
+        mu = e * np.exp(x[0] + x[1:])
+        d = tau + mu
+        c = 1 / PRIOR_BETA0_VAR + mu.sum() - (mu * mu / d).sum()
+        g0 = (y - mu).sum() - x[0] / PRIOR_BETA0_VAR
+        g1 = y - mu - tau * x[1:]
+        s0 = (g0 - (mu * g1 / d).sum()) / c
+        step = np.concatenate([[s0], (g1 - mu * s0) / d])
+        x += step
+        if np.abs(step).max() < 1e-8:
+            break
+    mu = e * np.exp(x[0] + x[1:])
+    d = tau + mu
+    c = 1 / PRIOR_BETA0_VAR + mu.sum() - (mu * mu / d).sum()
+    half_logdet = 0.5 * (np.log(c) + np.log(d).sum())
+    # Var(η) = Var(β₀) + Var(φᵢ) + 2Cov dari H⁻¹
+    var = 1 / c + 1 / d + mu * mu / (d * d * c) - 2 * mu / (d * c)
+    return x, half_logdet, var
+
+
+def _titik_car(y, e, lap, logdet_q, rho, log_tau, x0):
+    """Mode, log posterior (Laplace) dan Var(η) untuk satu titik grid (ρ, τ)."""
+    n = len(y)
+    a, b = PRIOR_TAU
+    tau = np.exp(log_tau)
+    prec = np.zeros((n + 1, n + 1))
+    prec[0, 0] = 1 / PRIOR_BETA0_VAR
+    prec[1:, 1:] = tau * (rho * lap + (1 - rho) * np.eye(n))
+    x, chol = _mode(y, e, prec, x0)
+    eta = x[0] + x[1:]
+    log_post = (
+        (y * eta - e * np.exp(eta)).sum()
+        - 0.5 * x @ prec @ x
+        + 0.5 * (n * log_tau + logdet_q - np.log(PRIOR_BETA0_VAR))
+        - np.log(np.diag(chol)).sum()
+        + a * log_tau - b * tau  # prior Gamma pada τ, Jacobian log τ
+    )
+    # Var(η) = Var(β₀) + Var(φᵢ) + 2Cov dari H⁻¹ = L⁻ᵀL⁻¹: cukup diagonal dan
+    # baris β₀, jadi O(n²) dari L⁻¹ tanpa membentuk H⁻¹ penuh
+    inv = np.linalg.inv(chol)
+    cov0 = inv[:, 0] @ inv
+    var = cov0[0] + (inv * inv).sum(axis=0)[1:] + 2 * cov0[1:]
+    return (log_post, eta, var, rho, tau), x
+
+
+def car_leroux(kasus, expected, bobot=None, alpha=0.05):
+    """Posterior log-RR per unit (campuran Laplace di atas grid τ × ρ).
+
+    Dengan ``bobot`` biaya tiap titik grid O(n³) (lihat ``MAKS_UNIT_CAR``);
+    tanpa graf (iid) O(n). Per ρ, grid τ ditelusuri dari puncak ke dua arah
+    dan berhenti begitu log posterior turun lebih dari ``BATAS_LOG_POST`` di
+    bawah puncak global (bobot < e⁻¹²), jadi hanya titik berbobot yang dihitung.
+    Kunci ``model``: ``"car"`` atau ``"iid"``.
+    """
+    y = np.asarray(kasus, dtype=float)
+    e = np.asarray(expected, dtype=float)
+    n = len(y)
+    if bobot is None or not len(bobot.indices):
+        return _iid(y, e, alpha)
+    lap = _laplacian(bobot, n)
+    eig = np.linalg.eigvalsh(lap)
+
+    x = np.zeros(n + 1)
+    x[0] = np.log(y.sum() / e.sum())
+    hasil, puncak, j0 = [], -np.inf, len(LOG_TAU) // 2
+    for rho in RHO:
+        logdet_q = np.log(rho * eig + 1 - rho).sum()
+        irisan = {}  # indeks τ -> (titik, mode)
+        for arah in (range(j0, len(LOG_TAU)), range(j0 - 1, -1, -1)):
+            x_arah, sebelum = (irisan[j0][1] if j0 in irisan else x), -np.inf
+            for j in arah:
+                titik, x_arah = _titik_car(y, e, lap, logdet_q, rho, LOG_TAU[j], x_arah)
+                irisan[j] = (titik, x_arah)
+                puncak = max(puncak, titik[0])
+                # berhenti hanya saat sudah menurun (log posterior unimodal dalam τ)
+                if titik[0] < puncak - BATAS_LOG_POST and titik[0] < sebelum:
+                    break
+                sebelum = titik[0]
+        j0 = max(irisan, key=lambda k: irisan[k][0][0])
+        x = irisan[j0][1]
+        hasil += [irisan[k][0] for k in sorted(irisan)]
+    return {"model": "car", **_campuran(hasil, alpha)}
+
+
+def _iid(y, e, alpha):
+    # Efek acak iid (ρ = 0): grid τ saja, tanpa matriks padat
+    a, b = PRIOR_TAU
+    n = len(y)
+    x = np.zeros(n + 1)
+    x[0] = np.log(y.sum() / e.sum())
+    hasil = []
+    for log_tau in LOG_TAU:
+        tau = np.exp(log_tau)
+        x, half_logdet, var = _mode_iid(y, e, tau, x)
+        eta = x[0] + x[1:]
+        log_post = (
+            (y * eta - e * np.exp(eta)).sum()
+            - 0.5 * (x[0] ** 2 / PRIOR_BETA0_VAR + tau * x[1:] @ x[1:])
+            + 0.5 * (n * log_tau - np.log(PRIOR_BETA0_VAR))
+            - half_logdet
+            + a * log_tau - b * tau  # prior Gamma pada τ, Jacobian log τ
+        )
+        hasil.append((log_post, eta, var, 0.0, tau))
+    return {"model": "iid", **_campuran(hasil, alpha)}
+
+
+def _campuran(hasil, alpha):
+    # hasil: (log posterior, mean η, Var(η), ρ, τ) per titik grid
+    log_post = np.array([h[0] for h in hasil])
+    w = np.exp(log_post - log_post.max())
+    w /= w.sum()
+    mean = np.array([h[1] for h in hasil])  # (grid, n)
+    var = np.array([h[2] for h in hasil])
+    return {
+        "bobot_grid": w,
+        "mean_grid": mean,
+        "var_grid": var,
+        "rho": float(w @ [h[3] for h in hasil]),
+        "tau": float(w @ [h[4] for h in hasil]),
+        **_ringkas_campuran(w, mean, var, alpha),
+    }
+
+
+def _ringkas_campuran(w, mean, var, alpha):
+    # Mean RR eksak dari campuran lognormal; CI dari momen campuran di skala log
+    rr = w @ np.exp(mean + var / 2)
+    m = w @ mean
+    v = w @ (var + mean ** 2) - m ** 2
+    z = _norm.inv_cdf(1 - alpha / 2)
+    return {"rr": rr, "rr_lo": np.exp(m - z * np.sqrt(v)), "rr_hi": np.exp(m + z * np.sqrt(v))}
+
+
+# ==============================
+# HASIL UNTUK SNAPSHOT
+# ==============================
+@dataclass(frozen=True, eq=False)
+class Pemulusan:
+    """Ringkasan posterior per unit; ``tabel(ambang)`` di-cache per ambang RR."""
+
+    df: pd.DataFrame  # kode_bps, kabupaten, kasus, populasi, prevalensi mentah/EB/CAR + CI
+    rate_ref: float  # prevalensi provinsi (per orang)
+    eb: dict
+    car: dict  # termasuk "model": "car" (dengan graf) atau "iid"
+
+    def tabel(self, ambang=1.0):
+        return _tabel(self, float(ambang))
+
+
+@functools.lru_cache(maxsize=16)
+def _tabel(hasil, ambang):
+    df = hasil.df.copy()
+    df["p_eb_di_atas_ambang"] = _gamma_sf(ambang, hasil.eb["shape"], hasil.eb["rate"])
+    car = hasil.car
+    df["p_car_di_atas_ambang"] = car["bobot_grid"] @ (
+        1 - _cdf((np.log(ambang) - car["mean_grid"]) / np.sqrt(car["var_grid"])))
+    return df
+
+
+def fit(df_wilayah, bobot=None, alpha=0.05, per=100000):
+    """Fit EB dan CAR untuk ``df_wilayah`` (kode_bps, kabupaten, kasus_2024, populasi_2024)."""
+    df = df_wilayah[["kode_bps", "kabupaten", "kasus_2024", "populasi_2024", "prevalensi_per_100k"]]
+    df = df.reset_index(drop=True)
+    y = df["kasus_2024"].to_numpy(dtype=float)
+    pop = df["populasi_2024"].to_numpy(dtype=float)
+    rate_ref = y.sum() / pop.sum()
+    e = pop * rate_ref
+
+    w = None
+    if bobot is not None:
+        ada = df["kode_bps"].isin(bobot.kode)
+        df, y, e = df[ada].reset_index(drop=True), y[ada.to_numpy()], e[ada.to_numpy()]
+        # CAR dengan graf = aljabar padat O(n³) per titik grid; di atas batas pakai iid
+        w = bobot.subset(df["kode_bps"]) if len(df) <= MAKS_UNIT_CAR else None
+
+    eb = empirical_bayes(y, e, alpha)
+    car = car_leroux(y, e, w, alpha)
+    df = df.assign(**{
+        f"{nama}_{kolom}": hasil[kunci] * rate_ref * per
+        for nama, hasil in (("eb", eb), ("car", car))
+        for kolom, kunci in (("per_100k", "rr"), ("lo", "rr_lo"), ("hi", "rr_hi"))
+    })
+    return Pemulusan(df=df, rate_ref=rate_ref, eb=eb, car=car)
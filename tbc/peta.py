@@ -0,0 +1,145 @@
+"""Peta choropleth interaktif dari batas wilayah RBI.
+
+Geometri ``.shp`` dibaca sekali, disederhanakan (Douglas-Peucker) ke beberapa
+resolusi, koordinatnya dibulatkan, lalu disimpan sebagai GeoJSON ringkas di
+``CACHE_DIR`` (key: SHA-256 ``.shp`` + ``.dbf``). Render berikutnya hanya
+memuat resolusi yang diminta, jadi payload figure tetap kecil.
+"""
+
+import functools
+import json
+import os
+import threading
+
+import numpy as np
+
+from tbc import CACHE_DIR
+from tbc.rbi import rbi_path, read_dbf, read_shp
+from tbc.store import data_version
+
+# resolusi -> (toleransi derajat, jumlah desimal koordinat)
+RESOLUSI = {
+    "Ringan": (0.01, 3),
+    "Sedang": (0.002, 4),
+    "Detail": (0.0005, 5),
+}
+DEFAULT_RESOLUSI = "Sedang"
+
+
+def tersedia():
+    """True kalau file geometri ``.shp`` RBI ada (di repo saat ini hanya DBF/indeks)."""
+    return rbi_path("shp").exists()
+
+
+def simplify_ring(coords, tolerance):
+    """Douglas-Peucker iteratif; jarak titik-segmen dihitung per segmen dengan NumPy."""
+    n = len(coords)
+    if n <= 4 or tolerance <= 0:
+        return coords
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, n - 1]] = True
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j <= i + 1:
+            continue
+        seg = coords[i + 1:j]
+        start, end = coords[i], coords[j]
+        d = end - start
+        norm = np.hypot(*d)
+        if norm == 0:
+            dist = np.hypot(*(seg - start).T)
+        else:
+            dist = np.abs(d[0] * (seg[:, 1] - start[1]) - d[1] * (seg[:, 0] - start[0])) / norm
+        k = int(np.argmax(dist))
+        if dist[k] > tolerance:
+            mid = i + 1 + k
+            keep[mid] = True
+            stack.extend([(i, mid), (mid, j)])
+    return coords[keep]
+
+
+def _signed_area(ring):
+    x, y = ring[:, 0], ring[:, 1]
+    return 0.5 * np.sum(x[:-1] * y[1:] - x[1:] * y[:-1])
+
+
+def _geometry(rings, tolerance, digits):
+    # Ring searah jarum jam = batas luar (konvensi shapefile), lainnya = lubang.
+    polygons = []
+    for ring in rings:
+        simple = np.round(simplify_ring(ring, tolerance), digits)
+        if len(simple) < 4:
+            continue
+        coords = simple.tolist()
+        if _signed_area(simple) <= 0 or not polygons:
+            polygons.append([coords])
+        else:
+            polygons[-1].append(coords)
+    if not polygons and rings:
+        # Pulau kecil hilang saat disederhanakan: pertahankan ring terbesar.
+        largest = max(rings, key=lambda r: abs(_signed_area(r)))
+        polygons = [[np.round(largest, digits).tolist()]]
+    return {"type": "MultiPolygon", "coordinates": polygons}
+
+
+def build_geojson(tolerance, digits):
+    """FeatureCollection dengan ``properties.kode_bps`` (int) dan ``kabupaten``."""
+    attrs = read_dbf(rbi_path("dbf"))
+    records = read_shp(rbi_path("shp"))
+    features = []
+    for rings, kode, nama in zip(records, attrs["KDPKAB"], attrs["NAMOBJ"]):
+        if not rings:
+            continue
+        kode_bps = int(kode.replace(".", ""))
+        features.append({
+            "type": "Feature",
+            "id": kode_bps,
+            "properties": {"kode_bps": kode_bps, "kabupaten": nama},
+            "geometry": _geometry(rings, tolerance, digits),
+        })
+    return {"type": "FeatureCollection", "features": features}
+
+
+@functools.lru_cache(maxsize=len(RESOLUSI) * 2)
+def _geojson_for(resolusi, version):
+    path = CACHE_DIR / f"peta-{resolusi.lower()}-{'-'.join(version)}.geojson"
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+    geojson = build_geojson(*RESOLUSI[resolusi])
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(geojson, f, separators=(",", ":"))
+    tmp.replace(path)
+    return geojson
+
+
+def geojson(resolusi=DEFAULT_RESOLUSI):
+    """GeoJSON tersederhanakan untuk ``resolusi``; dibangun sekali per versi geometri."""
+    return _geojson_for(resolusi, data_version(rbi_path("shp"), rbi_path("dbf")))
+
+
+def choropleth(df, value_col, label, resolusi=DEFAULT_RESOLUSI, title=None, colorscale="Reds", zmid=None):
+    """Figure choropleth Plotly; ``df`` wajib punya kolom ``kode_bps`` dan ``kabupaten``."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Choropleth(
+        geojson=geojson(resolusi),
+        featureidkey="properties.kode_bps",
+        locations=df["kode_bps"],
+        z=df[value_col],
+        text=df["kabupaten"],
+        colorscale=colorscale,
+        zmid=zmid,
+        marker_line_color="white",
+        marker_line_width=0.5,
+        colorbar_title=label,
+        hovertemplate="<b>%{text}</b><br>" + label + ": %{z:,.1f}<extra></extra>",
+    ))
+    fig.update_geos(fitbounds="locations", visible=False)
+    fig.update_layout(title=title, height=550, margin=dict(l=0, r=0, t=40, b=0))
+    return fig
@@ -0,0 +1,181 @@
+"""Tabel denominator penduduk BPS (``populasijabar.xlsx``) dan rate terstandar.
+
+Sheet ``data`` berisi jumlah penduduk per kabupaten/kota × tahun × kelompok
+umur × jenis kelamin. Tabel dimuat sekali per versi file menjadi array padat
+``[kode, tahun, umur, jk]`` dengan indeks posisi, jadi pengambilan denominator
+untuk semua unit cukup satu operasi indexing.
+
+Fungsi rate menerima array dengan unit di sumbu pertama dan kelompok umur di
+sumbu terakhir, lalu menghitung semua unit sekaligus.
+"""
+
+import functools
+from dataclasses import dataclass
+from statistics import NormalDist
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+from tbc.store import fingerprint, read_excel_cached, resolve
+
+POPULASI_FILE = "populasijabar.xlsx"
+POPULASI_SHEET = "data"
+
+# Opsional: rate referensi per kelompok umur (kolom kelompok_umur, rate_per_100k)
+# untuk standardisasi tidak langsung/SMR. Data kasus saat ini belum per umur.
+RATE_REFERENSI_FILE = "rate_referensi_tbc.csv"
+
+
+@dataclass(frozen=True)
+class Denominator:
+    """Penduduk per ``[kode_bps, tahun, kelompok_umur, jenis_kelamin]``."""
+
+    cube: np.ndarray
+    kode: tuple
+    nama: tuple
+    tahun: tuple
+    umur: tuple
+    jk: tuple
+    _pos_kode: MappingProxyType
+    _pos_tahun: MappingProxyType
+
+    def idx_kode(self, kode):
+        return np.array([self._pos_kode[int(k)] for k in np.atleast_1d(kode)])
+
+    def tahun_terdekat(self, tahun):
+        """Tahun tersedia yang paling dekat (mis. 2024 -> 2023 kalau 2024 belum ada)."""
+        return min(self.tahun, key=lambda y: (abs(y - tahun), -y))
+
+    def populasi(self, tahun, kode=None, per_umur=False, per_jk=False):
+        """Penduduk tahun ``tahun`` untuk ``kode`` (default semua), opsional per strata.
+
+        Bentuk hasil: ``(unit,)``, ``(unit, umur)``, ``(unit, jk)`` atau ``(unit, umur, jk)``.
+        """
+        cube = self.cube[:, self._pos_tahun[tahun]]
+        if kode is not None:
+            cube = cube[self.idx_kode(kode)]
+        if not per_jk:
+            cube = cube.sum(axis=-1)
+        if not per_umur:
+            cube = cube.sum(axis=1)
+        return cube
+
+    def batas_umur(self):
+        """Batas bawah tiap kelompok umur ("05-09" -> 5, "> 75" -> 75)."""
+        return np.array([int("".join(ch for ch in u.split("-")[0] if ch.isdigit())) for u in self.umur])
+
+    def frame(self):
+        """Bentuk long (satu baris per sel) untuk tabel/ekspor."""
+        index = pd.MultiIndex.from_product([self.kode, self.tahun, self.umur, self.jk],
+                                           names=["kode_bps", "tahun", "kelompok_umur", "jenis_kelamin"])
+        return pd.DataFrame({"jumlah_penduduk": self.cube.ravel()}, index=index).reset_index()
+
+
+def build_denominator(df):
+    kode, kode_idx = np.unique(df["kode_kabupaten_kota"].to_numpy(), return_inverse=True)
+    tahun, tahun_idx = np.unique(df["tahun"].to_numpy(), return_inverse=True)
+    umur, umur_idx = np.unique(df["kelompok_umur"].astype(str).str.strip().to_numpy(), return_inverse=True)
+    jk, jk_idx = np.unique(df["jenis_kelamin"].astype(str).str.strip().to_numpy(), return_inverse=True)
+
+    cube = np.zeros((len(kode), len(tahun), len(umur), len(jk)), dtype=np.int64)
+    np.add.at(cube, (kode_idx, tahun_idx, umur_idx, jk_idx), df["jumlah_penduduk"].to_numpy())
+    cube.flags.writeable = False
+
+    nama = df.drop_duplicates("kode_kabupaten_kota").set_index("kode_kabupaten_kota")["nama_kabupaten_kota"]
+    return Denominator(
+        cube=cube,
+        kode=tuple(int(k) for k in kode),
+        nama=tuple(nama.loc[kode]),
+        tahun=tuple(int(y) for y in tahun),
+        umur=tuple(umur),
+        jk=tuple(jk),
+        _pos_kode=MappingProxyType({int(k): i for i, k in enumerate(kode)}),
+        _pos_tahun=MappingProxyType({int(y): i for i, y in enumerate(tahun)}),
+    )
+
+
+@functools.lru_cache(maxsize=2)
+def _denominator_for(path, version):
+    return build_denominator(read_excel_cached(path, sheet_name=POPULASI_SHEET))
+
+
+def load_denominator(path=POPULASI_FILE):
+    """Denominator untuk versi file saat ini; dipakai bersama oleh semua halaman."""
+    return _denominator_for(str(path), fingerprint(path))
+
+
+def load_rate_referensi(denominator, path=None):
+    """Rate referensi per orang, urut sesuai ``denominator.umur``; None kalau file tidak ada."""
+    path = resolve(path or RATE_REFERENSI_FILE)
+    if not path.exists():
+        return None
+    ref = pd.read_csv(path)
+    ref["kelompok_umur"] = ref["kelompok_umur"].astype(str).str.strip()
+    return ref.set_index("kelompok_umur")["rate_per_100k"].reindex(list(denominator.umur)).to_numpy() / 100000
+
+
+# ==============================
+# RATE
+# ==============================
+def _z(alpha):
+    return NormalDist().inv_cdf(1 - alpha / 2)
+
+
+def crude_rate(kasus, populasi, per=100000):
+    kasus = np.asarray(kasus, dtype=float)
+    populasi = np.asarray(populasi, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return kasus / populasi * per
+
+
+def age_specific_rates(kasus, populasi, per=100000):
+    """Rate per kelompok umur; ``kasus``/``populasi`` berbentuk ``(unit, umur)``."""
+    return crude_rate(kasus, populasi, per=per)
+
+
+def direct_standardized(kasus, populasi, standar, per=100000, alpha=0.05):
+    """Rate terstandar langsung untuk semua unit sekaligus.
+
+    ``kasus``/``populasi``: ``(unit, umur)``; ``standar``: penduduk standar ``(umur,)``.
+    CI memakai aproksimasi normal dengan var = Σ wᵢ² dᵢ / nᵢ².
+    """
+    kasus = np.asarray(kasus, dtype=float)
+    populasi = np.asarray(populasi, dtype=float)
+    w = np.asarray(standar, dtype=float)
+    w = w / w.sum()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = (w * kasus / populasi).sum(axis=-1)
+        se = np.sqrt((w ** 2 * kasus / populasi ** 2).sum(axis=-1))
+    z = _z(alpha)
+    return {
+        "rate": rate * per,
+        "rate_lo": np.maximum(rate - z * se, 0) * per,
+        "rate_hi": (rate + z * se) * per,
+    }
+
+
+def indirect_standardized(observed, populasi, rate_referensi, per=100000, alpha=0.05):
+    """SMR (observed/expected) dan rate terstandar tidak langsung.
+
+    ``observed``: ``(unit,)``; ``populasi``: ``(unit, umur)``; ``rate_referensi``:
+    rate per orang ``(umur,)``. CI SMR memakai aproksimasi Byar.
+    """
+    observed = np.asarray(observed, dtype=float)
+    populasi = np.asarray(populasi, dtype=float)
+    ref = np.asarray(rate_referensi, dtype=float)
+    expected = (populasi * ref).sum(axis=-1)
+    z = _z(alpha)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        smr = observed / expected
+        o1 = observed + 1
+        lo = observed * (1 - 1 / (9 * observed) - z / (3 * np.sqrt(observed))) ** 3 / expected
+        hi = o1 * (1 - 1 / (9 * o1) + z / (3 * np.sqrt(o1))) ** 3 / expected
+        crude_ref = (populasi.sum(axis=0) * ref).sum() / populasi.sum()
+    return {
+        "expected": expected,
+        "smr": smr,
+        "smr_lo": np.where(observed > 0, lo, 0.0),
+        "smr_hi": hi,
+        "rate_isr": smr * crude_ref * per,
+    }
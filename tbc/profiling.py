@@ -0,0 +1,192 @@
+"""Instrumentasi performa opsional (timer + memori per tahap, hit/miss cache).
+
+Aktif kalau env ``TBC_PROFILE=1`` atau URL memuat ``?profile=1``. Saat tidak
+aktif, ``stage()`` dan ``cache()`` hanya mengecek satu atribut thread-local.
+
+Tahap diberi prefix ``load:``, ``transform:`` atau ``render:``. Memori diukur
+dengan ``tracemalloc`` (alokasi bersih dan puncak selama tahap). tracemalloc
+bersifat global per proses, jadi angka memori paling akurat kalau hanya satu
+sesi yang diprofilkan pada satu waktu.
+"""
+
+import json
+import os
+import platform
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+ENV_VAR = "TBC_PROFILE"
+QUERY_PARAM = "profile"
+
+_local = threading.local()
+
+# tracemalloc global per proses: hidup selama masih ada run aktif di sesi mana pun
+_aktif = 0
+_aktif_lock = threading.Lock()
+_tracing_milik_kita = False
+
+
+class Run:
+    def __init__(self, label):
+        self.label = label
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self.stages = []
+        self.cache = Counter()
+        self._stack = []
+        self.selesai = False
+
+    def as_dict(self):
+        return {
+            "label": self.label,
+            "started": self.started,
+            "python": platform.python_version(),
+            "stages": self.stages,
+            "cache": [
+                {"cache": name, "hit": self.cache[(name, True)], "miss": self.cache[(name, False)]}
+                for name in sorted({name for name, _ in self.cache})
+            ],
+        }
+
+
+def env_enabled():
+    return os.environ.get(ENV_VAR, "").lower() in ("1", "true", "yes", "on")
+
+
+def _mulai_tracing():
+    global _aktif, _tracing_milik_kita
+    with _aktif_lock:
+        if _aktif == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_milik_kita = True
+        _aktif += 1
+
+
+def _lepas_tracing(run):
+    """Tutup ``run``; tracemalloc dihentikan setelah run aktif terakhir selesai."""
+    global _aktif, _tracing_milik_kita
+    if run.selesai:
+        return
+    run.selesai = True
+    with _aktif_lock:
+        _aktif -= 1
+        if _aktif == 0 and _tracing_milik_kita:
+            # Hanya kalau tracing dinyalakan di sini (bukan python -X tracemalloc)
+            tracemalloc.stop()
+            _tracing_milik_kita = False
+
+
+def begin(label, enabled):
+    """Mulai pencatatan untuk satu rerun (atau matikan kalau ``enabled`` False)."""
+    sebelumnya = current()
+    if sebelumnya is not None:
+        _lepas_tracing(sebelumnya)  # rerun sebelumnya berhenti karena exception
+    if not enabled:
+        _local.run = None
+        return None
+    _mulai_tracing()
+    _local.run = Run(label)
+    return _local.run
+
+
+def current():
+    return getattr(_local, "run", None)
+
+
+@contextmanager
+def stage(name):
+    run = current()
+    if run is None or run.selesai:
+        yield
+        return
+    mem_start, peak_so_far = tracemalloc.get_traced_memory()
+    if run._stack:
+        run._stack[-1]["peak"] = max(run._stack[-1]["peak"], peak_so_far)
+    tracemalloc.reset_peak()
+    frame = {"peak": 0}
+    # Slot dipesan saat mulai supaya urutan tabel = urutan eksekusi
+    record = {"stage": name, "depth": len(run._stack)}
+    run.stages.append(record)
+    run._stack.append(frame)
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - t0
+        current_mem, peak = tracemalloc.get_traced_memory()
+        run._stack.pop()
+        peak = max(peak, frame["peak"]) - mem_start
+        if run._stack:
+            # reset_peak() di tahap anak menghapus puncak induk: teruskan ke atas
+            run._stack[-1]["peak"] = max(run._stack[-1]["peak"], peak + mem_start)
+        record.update({
+            "ms": round(elapsed * 1e3, 3),
+            "alloc_kb": round((current_mem - mem_start) / 1024, 1),
+            "peak_kb": round(max(peak, 0) / 1024, 1),
+        })
+
+
+def mark(name):
+    """Catat titik waktu (ms sejak ``begin()``), mis. elemen pertama halaman terkirim."""
+    run = current()
+    if run is not None and not run.selesai:
+        run.stages.append({
+            "stage": name,
+            "depth": len(run._stack),
+            "ms": round((time.perf_counter() - run._t0) * 1e3, 3),
+            "alloc_kb": None,
+            "peak_kb": None,
+        })
+
+
+def finish():
+    """Catat total waktu rerun sejak ``begin()`` lalu tutup run (tabel tetap bisa ditampilkan)."""
+    run = current()
+    if run is not None and not run.selesai:
+        run.stages.append({
+            "stage": "total",
+            "depth": 0,
+            "ms": round((time.perf_counter() - run._t0) * 1e3, 3),
+            "alloc_kb": None,
+            "peak_kb": round(tracemalloc.get_traced_memory()[1] / 1024, 1),
+        })
+        _lepas_tracing(run)
+    return run
+
+
+def cache(name, hit):
+    run = current()
+    if run is not None:
+        run.cache[(name, bool(hit))] += 1
+
+
+def to_json(run=None):
+    run = run or current()
+    return json.dumps(run.as_dict() if run else {}, indent=2)
+
+
+def panel(run=None):
+    """Panel diagnostik di sidebar Streamlit untuk rerun saat ini."""
+    import pandas as pd
+    import streamlit as st
+
+    run = run or current()
+    if run is None:
+        return
+    result = run.as_dict()
+    with st.sidebar.expander("⏱️ Diagnostik Performa", expanded=False):
+        stages = pd.DataFrame(result["stages"])
+        if not stages.empty:
+            stages["stage"] = stages["depth"].map(lambda d: "· " * d) + stages["stage"]
+            st.dataframe(stages.drop(columns="depth"), hide_index=True, use_container_width=True)
+        if result["cache"]:
+            st.dataframe(pd.DataFrame(result["cache"]), hide_index=True, use_container_width=True)
+        st.download_button(
+            "Unduh JSON",
+            data=to_json(run),
+            file_name=f"profil-{time.strftime('%Y%m%d-%H%M%S', time.localtime(run.started))}.json",
+            mime="application/json",
+        )
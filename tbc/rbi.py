@@ -0,0 +1,106 @@
+"""Batas wilayah RBI 50K (Badan Informasi Geospasial) Jawa Barat.
+
+Membaca tabel atribut dBase (``.dbf``) dan geometri poligon ESRI Shapefile
+(``.shp``) langsung dengan ``struct``/NumPy; tidak butuh GDAL/geopandas.
+"""
+
+import functools
+import struct
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from tbc import DATA_DIR
+from tbc.store import fingerprint
+
+RBI_STEM = "RBI_50K_2023_Jawa Barat"
+
+
+def rbi_path(ext, stem=RBI_STEM):
+    return DATA_DIR / f"{stem}.{ext}"
+
+
+def read_dbf(path, encoding="latin-1"):
+    """Baca file dBase III sederhana (tipe C/N/F/L/D) menjadi DataFrame."""
+    raw = Path(path).read_bytes()
+    n_records, header_len, record_len = struct.unpack("<4xIHH", raw[:12])
+
+    fields = []
+    pos = 32
+    while raw[pos] != 0x0D:
+        name = raw[pos:pos + 11].split(b"\0", 1)[0].decode("ascii")
+        fields.append((name, chr(raw[pos + 11]), raw[pos + 16]))
+        pos += 32
+
+    columns = {name: [] for name, _, _ in fields}
+    for i in range(n_records):
+        rec = raw[header_len + i * record_len:header_len + (i + 1) * record_len]
+        if rec[:1] == b"*":  # record terhapus
+            continue
+        offset = 1
+        for name, ftype, length in fields:
+            value = rec[offset:offset + length].decode(encoding).strip()
+            offset += length
+            if ftype in "NF":
+                value = float(value) if value and not value.startswith("*") else None
+            elif ftype == "L":
+                value = value.upper() in ("Y", "T") if value not in ("", "?") else None
+            columns[name].append(value)
+
+    df = pd.DataFrame(columns)
+    for name, ftype, _ in fields:
+        if ftype in "NF":
+            df[name] = pd.to_numeric(df[name])
+    return df
+
+
+def read_shp(path):
+    """Baca poligon dari file ``.shp`` (tipe Polygon/PolygonZ/PolygonM).
+
+    Mengembalikan list per record; tiap record berupa list ring ``(k, 2)``
+    (lon, lat) sesuai urutan di file. Record null menjadi list kosong.
+    """
+    raw = Path(path).read_bytes()
+    file_code, = struct.unpack(">i", raw[:4])
+    if file_code != 9994:
+        raise ValueError(f"{path} bukan file ESRI Shapefile")
+    file_len = struct.unpack(">i", raw[24:28])[0] * 2
+
+    records = []
+    pos = 100
+    while pos < file_len:
+        _, content_len = struct.unpack(">ii", raw[pos:pos + 8])
+        body = pos + 8
+        shape_type, = struct.unpack("<i", raw[body:body + 4])
+        rings = []
+        if shape_type in (5, 15, 25):
+            n_parts, n_points = struct.unpack("<ii", raw[body + 36:body + 44])
+            parts = np.frombuffer(raw, "<i4", n_parts, body + 44)
+            points = np.frombuffer(raw, "<f8", n_points * 2, body + 44 + 4 * n_parts).reshape(-1, 2)
+            bounds = np.append(parts, n_points)
+            rings = [points[bounds[i]:bounds[i + 1]] for i in range(n_parts)]
+        elif shape_type != 0:
+            raise ValueError(f"tipe shape {shape_type} belum didukung")
+        records.append(rings)
+        pos = body + content_len * 2
+    return records
+
+
+@functools.lru_cache(maxsize=2)
+def _load_wilayah(path, version):
+    dbf = read_dbf(path)
+    wilayah = pd.DataFrame({
+        # "32.04" -> 3204 (kode BPS kabupaten/kota)
+        "kode_bps": dbf["KDPKAB"].str.replace(".", "", regex=False).astype(int),
+        "kabupaten": dbf["NAMOBJ"],
+        "tipadm": dbf["TIPADM"].map({4: "Kabupaten", 5: "Kota"}),
+        "luas_km2": dbf["LUASWH"],
+    })
+    return wilayah.sort_values("kode_bps").reset_index(drop=True)
+
+
+def load_wilayah(path=None):
+    """Kode BPS, nama, jenis (Kabupaten/Kota) dan luas wilayah (km²) dari DBF RBI."""
+    path = Path(path or rbi_path("dbf"))
+    return _load_wilayah(str(path), fingerprint(path))
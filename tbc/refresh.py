@@ -0,0 +1,110 @@
+"""Refresh snapshot di background dengan swap atomik.
+
+Thread daemon memantau versi file sumber (``stat()``; hash hanya kalau
+mtime/ukuran berubah) setiap ``interval`` detik. Kalau versi berubah dan sudah
+stabil selama dua pengecekan berturut-turut (workbook tidak sedang ditulis),
+snapshot baru dibangun di thread itu lalu dipasang dengan satu assignment
+referensi. Sesi yang sedang berjalan tetap memakai snapshot lama (immutable)
+sampai rerun berikutnya, jadi tidak ada request yang menunggu parse Excel.
+
+Hanya build pertama (belum ada snapshot sama sekali) yang berjalan di jalur
+request; build itu single-flight sehingga sesi paralel tidak ikut mem-parse.
+Build yang gagal (mis. file setengah tersimpan) dicatat dan dicoba lagi pada
+pengecekan berikutnya sementara snapshot lama tetap dilayani.
+"""
+
+import logging
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+
+class Refresher:
+    def __init__(self, build, version, interval=5.0, name="tbc-refresh"):
+        self._build = build  # version -> snapshot
+        self._version = version  # () -> tuple versi sumber
+        self.interval = interval
+        self.name = name
+        self._current = None
+        self._pending = None  # versi baru yang menunggu stabil
+        self._build_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_error = None
+        self.last_swap = None
+        self.builds = 0
+
+    # --- jalur request
+    def current(self):
+        """Snapshot terbaru; hanya memblok kalau belum pernah ada snapshot."""
+        snap = self._current
+        if snap is None:
+            with self._build_lock:
+                if self._current is None:
+                    self._swap(self._build(self._version()))
+            snap = self._current
+        return snap
+
+    # --- jalur background
+    def _swap(self, snap):
+        self._current = snap  # assignment referensi: atomik, tanpa lock di pembaca
+        self.last_swap = time.time()
+        self.builds += 1
+
+    def check(self):
+        """Satu siklus pemantauan; mengembalikan True kalau snapshot diganti."""
+        version = self._version()
+        current = self._current
+        if current is None or version == current.version:
+            self._pending = None
+            return False
+        if version != self._pending:
+            # Tunggu satu interval lagi: file mungkin masih ditulis
+            self._pending = version
+            return False
+        if not self._build_lock.acquire(blocking=False):
+            return False
+        try:
+            snap = self._build(version)
+        except Exception as exc:  # noqa: BLE001 - snapshot lama tetap dilayani
+            self.last_error = f"{type(exc).__name__}: {exc}"
+            log.warning("refresh snapshot gagal: %s", self.last_error)
+            return False
+        finally:
+            self._build_lock.release()
+        self._swap(snap)
+        self._pending = None
+        self.last_error = None
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as exc:  # noqa: BLE001 - mis. file sumber sementara hilang
+                self.last_error = f"{type(exc).__name__}: {exc}"
+                log.warning("pengecekan versi gagal: %s", self.last_error)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def status(self):
+        snap = self._current
+        return {
+            "version": snap.version if snap is not None else None,
+            "pending": self._pending,
+            "builds": self.builds,
+            "last_swap": self.last_swap,
+            "last_error": self.last_error,
+            "running": self._thread is not None and self._thread.is_alive(),
+        }
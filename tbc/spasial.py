@@ -0,0 +1,413 @@
+"""Autokorelasi dan klaster spasial di atas graf ketetanggaan batas RBI.
+
+Graf ketetanggaan *queen* (dua wilayah bertetangga kalau berbagi minimal satu
+titik batas) dibangun sekali dari ``.shp`` dengan mengelompokkan titik batas
+yang sudah dibulatkan, lalu disimpan sebagai matriks bobot sparse CSR
+(``indptr``/``indices``) + centroid di ``CACHE_DIR``. Semua statistik bekerja
+langsung di atas CSR dengan NumPy, jadi tetap jalan untuk ribuan poligon
+kecamatan/desa tanpa scipy/libpysal.
+
+- Moran's I global dan lokal (LISA), Getis-Ord Gi*: inferensi permutasi
+  (bersyarat untuk statistik lokal), satu matriks permutasi per chunk
+- Scan spasial Kulldorff (Poisson, jendela lingkaran di sekitar centroid):
+  replikasi Monte Carlo multinomial
+
+Permutasi dipecah per chunk dengan generator turunan ``SeedSequence`` dan
+dijalankan di thread pool; operasi NumPy besar melepas GIL sehingga semua core
+terpakai, dan hasilnya deterministik untuk ``seed`` yang sama berapa pun
+jumlah worker.
+"""
+
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from statistics import NormalDist
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+from tbc import CACHE_DIR, profiling
+from tbc.rbi import rbi_path, read_dbf, read_shp
+from tbc.store import data_version
+
+DEFAULT_PERMUTASI = 999
+DEFAULT_PRESISI = 5  # desimal derajat (~1 m) untuk mencocokkan titik batas bersama
+MAKS_UNIT_SCAN = 100  # batas jumlah unit per jendela scan
+CHUNK = 64  # permutasi per tugas worker
+MAKS_ELEMEN = 4_000_000  # batas elemen array sementara per tugas
+
+
+def tersedia():
+    """True kalau geometri ``.shp`` RBI ada (graf ketetanggaan butuh poligon)."""
+    return rbi_path("shp").exists()
+
+
+# ==============================
+# BOBOT SPASIAL (CSR)
+# ==============================
+@dataclass(frozen=True)
+class Bobot:
+    """Ketetanggaan biner dalam bentuk CSR; baris ke-i = tetangga unit ``kode[i]``."""
+
+    kode: tuple
+    indptr: np.ndarray
+    indices: np.ndarray
+    xy: np.ndarray  # centroid (lon, lat) per unit
+
+    @property
+    def n(self):
+        return len(self.kode)
+
+    @property
+    def kardinalitas(self):
+        return np.diff(self.indptr)
+
+    def baris(self):
+        return np.repeat(np.arange(self.n), self.kardinalitas)
+
+    def subset(self, kode):
+        """Bobot untuk ``kode`` (urutan mengikuti argumen); tetangga di luar ``kode`` dibuang."""
+        pos = {k: i for i, k in enumerate(self.kode)}
+        lama = np.array([pos[int(k)] for k in kode])
+        baru = np.full(self.n, -1)
+        baru[lama] = np.arange(len(lama))
+
+        rows, cols = self.baris(), baru[self.indices]
+        keep = (baru[rows] >= 0) & (cols >= 0)
+        rows, cols = baru[rows[keep]], cols[keep]
+        order = np.lexsort((cols, rows))
+        indptr = np.zeros(len(lama) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(lama)), out=indptr[1:])
+        return _bobot(tuple(int(k) for k in kode), indptr, cols[order], self.xy[lama])
+
+    def lag(self, x, baku=True):
+        """Σⱼ wᵢⱼ xⱼ untuk ``x`` berbentuk ``(n,)`` atau ``(n, p)``; ``baku`` = baris dinormalisasi."""
+        x = np.asarray(x, dtype=float)
+        cs = np.zeros((len(self.indices) + 1,) + x.shape[1:])
+        np.cumsum(x[self.indices], axis=0, out=cs[1:])
+        total = cs[self.indptr[1:]] - cs[self.indptr[:-1]]
+        if not baku:
+            return total
+        k = self.kardinalitas.reshape((-1,) + (1,) * (x.ndim - 1))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(k > 0, total / k, 0.0)
+
+
+def _bobot(kode, indptr, indices, xy):
+    for arr in (indptr, indices, xy):
+        arr.flags.writeable = False
+    return Bobot(kode=kode, indptr=indptr, indices=indices, xy=xy)
+
+
+def _centroid(rings):
+    # Centroid luas dari semua ring (lubang bertanda luas berlawanan)
+    total, cx, cy = 0.0, 0.0, 0.0
+    for ring in rings:
+        x, y = ring[:-1, 0], ring[:-1, 1]
+        x1, y1 = ring[1:, 0], ring[1:, 1]
+        cross = x * y1 - x1 * y
+        total += cross.sum() / 2
+        cx += ((x + x1) * cross).sum() / 6
+        cy += ((y + y1) * cross).sum() / 6
+    if total == 0:
+        pts = np.vstack(rings)
+        return pts.mean(axis=0)
+    return np.array([cx / total, cy / total])
+
+
+def build_bobot(records, kode, presisi=DEFAULT_PRESISI):
+    """Ketetanggaan queen dari ring poligon per record (``rbi.read_shp``)."""
+    n = len(records)
+    sizes = [sum(len(r) for r in rings) for rings in records]
+    pts = np.vstack([np.vstack(rings) for rings in records if rings]) if any(sizes) else np.empty((0, 2))
+    rec = np.repeat(np.arange(n), sizes)
+
+    # Titik batas yang sama (setelah dibulatkan) -> pasangan record tetangga
+    q = np.round(pts * 10 ** presisi).astype(np.int64)
+    _, vid = np.unique(q, axis=0, return_inverse=True)
+    vr = np.unique(np.stack([vid.ravel(), rec], axis=1), axis=0)  # (vertex, record) unik, urut
+    vid, rec = vr[:, 0], vr[:, 1]
+    pairs = []
+    for lag in range(1, len(vid)):
+        same = vid[lag:] == vid[:-lag]
+        if not same.any():
+            break
+        pairs.append(np.stack([rec[:-lag][same], rec[lag:][same]], axis=1))
+    pairs = np.unique(np.vstack(pairs), axis=0) if pairs else np.empty((0, 2), dtype=np.int64)
+    edges = np.unique(np.vstack([pairs, pairs[:, ::-1]]), axis=0)
+
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(edges[:, 0], minlength=n), out=indptr[1:])
+    xy = np.array([_centroid(rings) if rings else (np.nan, np.nan) for rings in records])
+    return _bobot(tuple(int(k) for k in kode), indptr, edges[:, 1].astype(np.int64), xy)
+
+
+@functools.lru_cache(maxsize=2)
+def _bobot_for(version, presisi):
+    path = CACHE_DIR / f"bobot-{presisi}-{'-'.join(version)}.npz"
+    try:
+        with np.load(path) as z:
+            return _bobot(tuple(int(k) for k in z["kode"]), z["indptr"], z["indices"], z["xy"])
+    except (OSError, ValueError, KeyError):
+        pass
+    with profiling.stage("transform:graf ketetanggaan"):
+        kode = read_dbf(rbi_path("dbf"))["KDPKAB"].str.replace(".", "", regex=False).astype(int)
+        bobot = build_bobot(read_shp(rbi_path("shp")), kode, presisi)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp.npz")
+    np.savez(tmp, kode=np.array(bobot.kode), indptr=bobot.indptr, indices=bobot.indices, xy=bobot.xy)
+    tmp.replace(path)
+    return bobot
+
+
+def load_bobot(presisi=DEFAULT_PRESISI):
+    """Bobot ketetanggaan untuk versi geometri saat ini; dibangun sekali lalu di-cache."""
+    return _bobot_for(data_version(rbi_path("shp"), rbi_path("dbf")), presisi)
+
+
+# ==============================
+# PERMUTASI PARALEL
+# ==============================
+def _paralel(fungsi, permutasi, seed, workers):
+    """Jalankan ``fungsi(rng, jumlah)`` per chunk permutasi; hasil digabung di sumbu terakhir."""
+    sizes = [CHUNK] * (permutasi // CHUNK) + ([permutasi % CHUNK] if permutasi % CHUNK else [])
+    rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(len(sizes))]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(sizes) == 1:
+        parts = [fungsi(rng, size) for rng, size in zip(rngs, sizes)]
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(sizes))) as pool:
+            parts = list(pool.map(fungsi, rngs, sizes))
+    return np.concatenate(parts, axis=-1)
+
+
+def _p_sim(obs, sim):
+    """p pseudo satu sisi ke arah yang diamati (lipat seperti PySAL)."""
+    lebih = (sim >= obs[..., None]).sum(axis=-1)
+    p = sim.shape[-1]
+    lebih = np.where(p - lebih < lebih, p - lebih, lebih)
+    return (lebih + 1) / (p + 1)
+
+
+def _p_norm(z):
+    return 2 * (1 - np.vectorize(NormalDist().cdf)(np.abs(z)))
+
+
+def _jumlah_kondisional(z, bobot, rng, jumlah):
+    """Σ nilai tetangga acak (tanpa unit i sendiri) per unit × permutasi: ``(n, jumlah)``.
+
+    Sampel indeks dipakai bersama oleh semua unit dalam satu permutasi lalu
+    digeser agar tidak memuat i, sehingga tiap unit tetap mendapat sampel
+    tanpa pengembalian dari n-1 unit lain.
+    """
+    n = bobot.n
+    k = bobot.kardinalitas
+    kmax = int(k.max())
+    if kmax == 0:
+        return np.zeros((n, jumlah))
+    acak = rng.random((jumlah, n - 1))
+    base = np.argpartition(acak, kmax - 1, axis=1)[:, :kmax] if kmax < n - 1 else acak.argsort(axis=1)
+    aktif = np.arange(kmax)[None, :] < k[:, None]  # (n, kmax)
+
+    out = np.empty((n, jumlah))
+    step = max(1, MAKS_ELEMEN // max(1, jumlah * kmax))
+    for s in range(0, n, step):
+        unit = np.arange(s, min(s + step, n))
+        ids = base[None] + (base[None] >= unit[:, None, None])  # (u, jumlah, kmax)
+        out[unit] = (z[ids] * aktif[unit][:, None, :]).sum(axis=-1)
+    return out
+
+
+# ==============================
+# STATISTIK
+# ==============================
+def moran_global(x, bobot, permutasi=DEFAULT_PERMUTASI, seed=0, workers=None):
+    """Moran's I global (bobot baris-baku) + uji normal dan permutasi."""
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    z = x - x.mean()
+    zz = z @ z
+    k = bobot.kardinalitas
+    s0 = float((k > 0).sum())
+    i_obs = n / s0 * (z @ bobot.lag(z)) / zz
+
+    # Varians di bawah asumsi normal (Cliff & Ord)
+    rows = bobot.baris()
+    w = 1 / k[rows]
+    w_t = 1 / k[bobot.indices]  # struktur simetris: w_ji = 1/k_j
+    s1 = 0.5 * ((w + w_t) ** 2).sum()
+    s2 = ((np.where(k > 0, 1.0, 0.0) + np.bincount(bobot.indices, w, minlength=n)) ** 2).sum()
+    ei = -1 / (n - 1)
+    var = (n ** 2 * s1 - n * s2 + 3 * s0 ** 2) / ((n ** 2 - 1) * s0 ** 2) - ei ** 2
+    z_norm = (i_obs - ei) / np.sqrt(var)
+
+    def sim(rng, jumlah):
+        zp = rng.permuted(np.broadcast_to(z, (jumlah, n)), axis=1).T  # (n, jumlah)
+        return n / s0 * (zp * bobot.lag(zp)).sum(axis=0) / zz
+
+    i_sim = _paralel(sim, permutasi, seed, workers)
+    return MappingProxyType({
+        "I": i_obs,
+        "EI": ei,
+        "z_norm": z_norm,
+        "p_norm": float(_p_norm(z_norm)),
+        "p_sim": float(_p_sim(np.array(i_obs), i_sim)),
+        "permutasi": permutasi,
+    })
+
+
+def lokal(x, bobot, permutasi=DEFAULT_PERMUTASI, seed=0, workers=None, alpha=0.05):
+    """Moran lokal (LISA) dan Getis-Ord Gi* untuk semua unit, permutasi bersyarat.
+
+    Keduanya memakai jumlah tetangga acak yang sama: Moran lokal dengan bobot
+    baris-baku atas deviasi, Gi* dengan bobot biner termasuk unit sendiri.
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    xbar = x.mean()
+    z = x - xbar
+    m2 = z @ z / n
+    k = bobot.kardinalitas.astype(float)
+    sum_z = bobot.lag(z, baku=False)
+
+    sim_z = _paralel(lambda rng, j: _jumlah_kondisional(z, bobot, rng, j), permutasi, seed, workers)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lag = np.where(k > 0, sum_z / k, 0.0)
+        ii = z * lag / m2
+        ii_sim = z[:, None] * np.where(k[:, None] > 0, sim_z / k[:, None], 0.0) / m2
+
+        # Gi*: Σ_{j∈N(i)∪{i}} x_j, diuji terhadap rata-rata global
+        wi = k + 1
+        s = np.sqrt((x ** 2).mean() - xbar ** 2)
+        g_obs = x + sum_z + k * xbar
+        g_sim = x[:, None] + sim_z + (k * xbar)[:, None]
+        g_z = (g_obs - xbar * wi) / (s * np.sqrt((n * wi - wi ** 2) / (n - 1)))
+
+    p_moran = _p_sim(ii, ii_sim)
+    p_gi = _p_sim(g_obs, g_sim)
+    kuadran = np.select(
+        [(z > 0) & (lag > 0), (z < 0) & (lag < 0), (z > 0) & (lag < 0), (z < 0) & (lag > 0)],
+        ["Tinggi-Tinggi", "Rendah-Rendah", "Tinggi-Rendah", "Rendah-Tinggi"], "Tidak terdefinisi")
+    return pd.DataFrame({
+        "lag": lag,
+        "moran_lokal": ii,
+        "p_moran": p_moran,
+        "kuadran_lisa": np.where(p_moran < alpha, kuadran, "Tidak signifikan"),
+        "gi_star_z": g_z,
+        "p_gi_star": p_gi,
+        "hotspot": np.where(p_gi >= alpha, "Tidak signifikan", np.where(g_z > 0, "Hotspot", "Coldspot")),
+    })
+
+
+def _llr(c, e, total):
+    # Log-likelihood ratio Poisson; hanya jendela dengan kasus > harapan
+    with np.errstate(divide="ignore", invalid="ignore"):
+        llr = c * np.log(c / e) + np.where(
+            total - c > 0, (total - c) * np.log((total - c) / (total - e)), 0.0)
+    return np.where((c > e) & (e > 0), llr, 0.0)
+
+
+def _urutan_jendela(xy, k):
+    """Indeks k unit terdekat (termasuk pusat) per pusat, urut jarak: ``(n, k)``."""
+    n = len(xy)
+    out = np.empty((n, k), dtype=np.int64)
+    step = max(1, MAKS_ELEMEN // n)
+    for s in range(0, n, step):
+        d = np.hypot(*(xy[s:s + step, None, :] - xy[None, :, :]).transpose(2, 0, 1))
+        near = np.argpartition(d, k - 1, axis=1)[:, :k] if k < n else np.tile(np.arange(n), (len(d), 1))
+        order = np.take_along_axis(d, near, axis=1).argsort(axis=1, kind="stable")
+        out[s:s + step] = np.take_along_axis(near, order, axis=1)
+    return out
+
+
+def scan_kulldorff(kasus, populasi, xy, permutasi=DEFAULT_PERMUTASI, maks_populasi=0.5,
+                   maks_unit=MAKS_UNIT_SCAN, seed=0, workers=None):
+    """Klaster paling mungkin (Poisson, jendela lingkaran) + p-value Monte Carlo."""
+    kasus = np.asarray(kasus, dtype=float)
+    populasi = np.asarray(populasi, dtype=float)
+    n = len(kasus)
+    total_kasus, total_pop = kasus.sum(), populasi.sum()
+    order = _urutan_jendela(np.asarray(xy, dtype=float), min(n, maks_unit))
+    cum_pop = populasi[order].cumsum(axis=1)
+    valid = cum_pop <= maks_populasi * total_pop
+    valid[:, 0] = True
+    expected = total_kasus * cum_pop / total_pop
+
+    llr = np.where(valid, _llr(kasus[order].cumsum(axis=1), expected, total_kasus), 0.0)
+    pusat, ukuran = np.unravel_index(np.argmax(llr), llr.shape)
+    llr_max = llr[pusat, ukuran]
+
+    prob = populasi / total_pop
+
+    def sim(rng, jumlah):
+        out = np.empty(jumlah)
+        per = max(1, MAKS_ELEMEN // order.size)
+        for s in range(0, jumlah, per):
+            c = rng.multinomial(int(total_kasus), prob, size=min(per, jumlah - s)).astype(float)
+            cum = c[:, order].cumsum(axis=2)  # (sim, pusat, ukuran)
+            out[s:s + len(c)] = np.where(valid, _llr(cum, expected, total_kasus), 0.0).max(axis=(1, 2))
+        return out
+
+    llr_sim = _paralel(sim, permutasi, seed, workers)
+    anggota = order[pusat, :ukuran + 1]
+    c, e = kasus[anggota].sum(), expected[pusat, ukuran]
+    return MappingProxyType({
+        "pusat": int(pusat),
+        "anggota": tuple(int(i) for i in anggota),
+        "observed": c,
+        "expected": e,
+        "rr": (c / e) / ((total_kasus - c) / (total_kasus - e)) if total_kasus > e else np.nan,
+        "llr": llr_max,
+        "p_value": ((llr_sim >= llr_max).sum() + 1) / (permutasi + 1),
+        "permutasi": permutasi,
+    })
+
+
+# ==============================
+# HASIL UNTUK SNAPSHOT
+# ==============================
+@dataclass(frozen=True)
+class HasilSpasial:
+    moran: MappingProxyType
+    scan: MappingProxyType
+    df: pd.DataFrame  # per kabupaten: nilai + statistik lokal + anggota klaster scan
+
+
+def analisis(df_wilayah, bobot, kolom="prevalensi_per_100k", permutasi=DEFAULT_PERMUTASI,
+             alpha=0.05, seed=0, workers=None):
+    """Semua statistik untuk ``df_wilayah`` (kode_bps, kabupaten, kasus_2024, populasi_2024)."""
+    df = df_wilayah[df_wilayah["kode_bps"].isin(bobot.kode)].reset_index(drop=True)
+    w = bobot.subset(df["kode_bps"])
+    x = df[kolom].to_numpy(dtype=float)
+
+    moran = moran_global(x, w, permutasi, seed, workers)
+    hasil = pd.concat([df[["kode_bps", "kabupaten", kolom]],
+                       lokal(x, w, permutasi, seed, workers, alpha)], axis=1)
+    scan = scan_kulldorff(df["kasus_2024"], df["populasi_2024"], w.xy, permutasi, seed=seed, workers=workers)
+    hasil["klaster_scan"] = np.isin(np.arange(len(df)), scan["anggota"])
+    return HasilSpasial(moran=moran, scan=scan, df=hasil)
+
+
+MAX_HASIL = 8
+
+_hasil = {}
+_lock = threading.Lock()
+
+
+def hasil_snapshot(snap, permutasi=DEFAULT_PERMUTASI, alpha=0.05):
+    """``analisis`` untuk snapshot; dihitung sekali per (versi data, permutasi, alpha)."""
+    key = (snap.version, permutasi, alpha)
+    with _lock:
+        hasil = _hasil.get(key)
+    profiling.cache("spasial", hasil is not None)
+    if hasil is None:
+        with profiling.stage(f"transform:spasial {permutasi} permutasi"):
+            hasil = analisis(snap.df_wilayah, load_bobot(), permutasi=permutasi, alpha=alpha)
+        with _lock:
+            _hasil[key] = hasil
+            while len(_hasil) > MAX_HASIL:
+                _hasil.pop(next(iter(_hasil)))
+    return hasil
@@ -0,0 +1,144 @@
+"""Cache kolumnar (Arrow IPC) untuk workbook Excel.
+
+Workbook hanya di-parse ulang oleh openpyxl kalau isinya benar-benar berubah.
+Setiap sheet yang pernah dibaca disimpan sebagai file Arrow IPC di ``CACHE_DIR``
+bersama manifest JSON berisi ``mtime_ns``, ukuran dan SHA-256 file sumber.
+Pembacaan berikutnya cukup memory-map file Arrow tersebut.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from tbc import CACHE_DIR, DATA_DIR, profiling
+
+# Naikkan kalau format file cache berubah supaya cache lama otomatis diabaikan.
+CACHE_FORMAT = 1
+
+
+def resolve(path):
+    """Path relatif dianggap relatif terhadap ``DATA_DIR``."""
+    path = Path(path)
+    return path if path.is_absolute() else DATA_DIR / path
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _read_manifest(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_atomic(path, data):
+    """Tulis ``data`` (bytes) ke ``path`` lewat file sementara + ``os.replace``."""
+    # pid + thread: refresher background dan sesi bisa menulis file yang sama
+    tmp = path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def fingerprint(path, cache_dir=None):
+    """SHA-256 file sumber, memakai mtime+ukuran sebagai jalur cepat.
+
+    Hash hanya dihitung ulang kalau ``mtime_ns`` atau ukuran file berubah.
+    """
+    path = resolve(path)
+    cache_dir = Path(cache_dir or CACHE_DIR)
+    st = path.stat()
+    path_key = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:8]
+    manifest_path = cache_dir / f"{path.name}.{path_key}.fingerprint.json"
+    manifest = _read_manifest(manifest_path)
+    if manifest and manifest["mtime_ns"] == st.st_mtime_ns and manifest["size"] == st.st_size:
+        return manifest["sha256"]
+
+    digest = _sha256(path)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    payload = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": digest}
+    write_atomic(manifest_path, json.dumps(payload).encode("utf-8"))
+    return digest
+
+
+def data_version(*paths, cache_dir=None):
+    """Versi data gabungan untuk beberapa file sumber (dipakai sebagai key cache)."""
+    return tuple(fingerprint(p, cache_dir=cache_dir)[:16] for p in paths)
+
+
+def _cache_stem(path, sheet_name, kwargs):
+    spec = json.dumps([CACHE_FORMAT, sheet_name, sorted(kwargs.items())], default=str)
+    return f"{path.stem}-{hashlib.sha1(spec.encode('utf-8')).hexdigest()[:12]}"
+
+
+def read_arrow(path):
+    """File Arrow IPC (memory-map) sebagai DataFrame."""
+    with pa.memory_map(str(path), "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def write_arrow(path, df):
+    """Simpan ``df`` sebagai file Arrow IPC secara atomik."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    write_atomic(path, sink.getvalue().to_pybytes())
+
+
+def _parse(path, sheet_name, kwargs):
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return pd.read_csv(path, **kwargs)
+    if suffix in (".parquet", ".pq"):
+        return pd.read_parquet(path, **kwargs)
+    return pd.read_excel(path, sheet_name=sheet_name, **kwargs)
+
+
+def read_excel_cached(path, sheet_name=0, cache_dir=None, **kwargs):
+    """Pengganti ``pd.read_excel`` yang membaca dari cache Arrow bila masih valid.
+
+    Cache di-key oleh SHA-256 workbook, sheet dan argumen ``read_excel``.
+    Sumber ``.csv``/``.parquet`` juga diterima (dibaca dengan ``pd.read_csv``/
+    ``pd.read_parquet``; ``sheet_name`` diabaikan).
+    """
+    path = resolve(path)
+    cache_dir = Path(cache_dir or CACHE_DIR)
+    digest = fingerprint(path, cache_dir=cache_dir)
+
+    stem = _cache_stem(path, sheet_name, kwargs)
+    arrow_path = cache_dir / f"{stem}.arrow"
+    meta_path = cache_dir / f"{stem}.json"
+    meta = _read_manifest(meta_path)
+    if meta and meta.get("sha256") == digest and arrow_path.exists():
+        try:
+            with profiling.stage(f"load:arrow {path.name}"):
+                df = read_arrow(arrow_path)
+            profiling.cache("arrow", True)
+            return df
+        except (OSError, pa.ArrowInvalid):
+            pass  # cache rusak -> parse ulang
+
+    profiling.cache("arrow", False)
+    with profiling.stage(f"load:parse {path.name}"):
+        df = _parse(path, sheet_name, kwargs)
+    try:
+        write_arrow(arrow_path, df)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, OSError):
+        # Kolom campuran yang tidak bisa direpresentasikan Arrow: pakai hasil parse saja.
+        return df
+    write_atomic(meta_path, json.dumps({"sha256": digest, "source": path.name}).encode("utf-8"))
+    return df
@@ -0,0 +1,112 @@
+"""Tabel dengan paging, sort dan filter teks di sisi server.
+
+``st.dataframe`` mengirim seluruh frame (Arrow) ke browser di setiap rerun.
+Di sini hanya satu halaman yang dikirim. Permutasi urutan per (key tabel,
+kolom, arah) dan mask filter per (key tabel, teks) dihitung sekali lalu
+di-cache, jadi rerun cukup mengindeks posisi tanpa ``sort_values`` ulang.
+``key`` harus berubah kalau isi frame berubah (mis. memuat versi snapshot).
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+MAX_CACHE = 128
+DEFAULT_PAGE_SIZE = 25
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def _cached(key, compute):
+    with _lock:
+        value = _cache.get(key)
+        if value is not None:
+            _cache.move_to_end(key)
+            return value
+    value = compute()
+    value.flags.writeable = False
+    with _lock:
+        _cache[key] = value
+        while len(_cache) > MAX_CACHE:
+            _cache.popitem(last=False)
+    return value
+
+
+def clear():
+    with _lock:
+        _cache.clear()
+
+
+def urutan(df, key, kolom, naik=True):
+    """Posisi baris ``df`` terurut menurut ``kolom`` (stabil, NaN di akhir)."""
+    def compute():
+        s = df[kolom].reset_index(drop=True)
+        return s.sort_values(ascending=naik, kind="stable", na_position="last").index.to_numpy()
+    return _cached((key, "urut", kolom, naik), compute)
+
+
+def saring(df, key, teks, kolom="kabupaten"):
+    """Mask baris yang ``kolom``-nya memuat ``teks`` (tanpa beda huruf besar/kecil)."""
+    teks = teks.strip().lower()
+    if not teks:
+        return None
+    return _cached((key, "saring", kolom, teks), lambda: (
+        df[kolom].astype(str).str.lower().str.contains(teks, regex=False).to_numpy()))
+
+
+def posisi(df, key, sort=None, naik=True, teks="", kolom_cari="kabupaten"):
+    """Posisi baris setelah filter teks, dalam urutan ``sort``."""
+    pos = urutan(df, key, sort, naik) if sort else np.arange(len(df))
+    mask = saring(df, key, teks, kolom_cari) if kolom_cari in df.columns else None
+    return pos if mask is None else pos[mask[pos]]
+
+
+def halaman(df, key, sort=None, naik=True, teks="", hal=1, per_hal=DEFAULT_PAGE_SIZE, kolom_cari="kabupaten"):
+    """Irisan satu halaman + jumlah baris setelah filter."""
+    pos = posisi(df, key, sort, naik, teks, kolom_cari)
+    mulai = (max(hal, 1) - 1) * per_hal
+    return df.iloc[pos[mulai:mulai + per_hal]], len(pos)
+
+
+def tampilkan(df, key, kolom=None, sort=None, naik=False, per_hal=DEFAULT_PAGE_SIZE, kolom_cari="kabupaten"):
+    """Widget tabel Streamlit: cari, urutkan, pindah halaman; hanya halaman aktif yang dikirim.
+
+    ``key``: tuple unik per isi tabel, ``(versi, nama_tabel, *parameter)``
+    (mis. ``(snap.version, "bayes", ambang)``). Hanya ``nama_tabel`` yang
+    menjadi nama widget, jadi mengubah parameter (slider) tidak membuat widget
+    baru; parameter cukup ada di key cache dan mengembalikan ke halaman 1.
+    ``kolom``: mapping kolom -> label tampilan (default semua kolom apa adanya).
+    """
+    import streamlit as st
+
+    kolom = dict(kolom or {c: c for c in df.columns})
+    nama = str(key[1]) if len(key) > 1 else "tabel"
+
+    col1, col2, col3, col4 = st.columns([3, 3, 2, 2])
+    with col1:
+        teks = st.text_input("Cari kabupaten/kota", key=f"{nama}-cari") if kolom_cari in df.columns else ""
+    with col2:
+        # Opsi = nama kolom (stabil); label boleh memuat nilai widget lain (mis. ambang RR)
+        sort_col = st.selectbox("Urutkan menurut", list(kolom), format_func=kolom.get,
+                                index=list(kolom).index(sort) if sort in kolom else 0, key=f"{nama}-sort")
+    with col3:
+        arah = st.selectbox("Arah", ["Menurun", "Menaik"], index=0 if not naik else 1, key=f"{nama}-arah")
+
+    # Filter/urutan berubah -> kembali ke halaman 1
+    tanda = (key, teks, sort_col, arah)
+    if st.session_state.get(f"{nama}-tanda") != tanda:
+        st.session_state[f"{nama}-tanda"] = tanda
+        st.session_state[f"{nama}-hal"] = 1
+
+    pos = posisi(df, key, sort_col, arah == "Menaik", teks, kolom_cari)
+    total = len(pos)
+    n_hal = max(1, -(-total // per_hal))
+    with col4:
+        hal = st.number_input("Halaman", min_value=1, max_value=n_hal, step=1, key=f"{nama}-hal")
+
+    mulai = (int(hal) - 1) * per_hal
+    page = df.iloc[pos[mulai:mulai + per_hal]]
+    st.dataframe(page[list(kolom)].rename(columns=kolom), hide_index=True, use_container_width=True)
+    st.caption(f"Baris {min(mulai + 1, total)}–{min(mulai + per_hal, total)} dari {total} · halaman {int(hal)}/{n_hal}")
@@ -0,0 +1,175 @@
+"""Mesin tren multi-tahun: YoY, CAGR, rata-rata bergerak, dan slope per unit.
+
+Data tren diubah sekali menjadi matriks ``(unit, tahun)`` lalu semua ukuran
+dihitung per kolom/baris dengan operasi numpy, untuk semua kabupaten sekaligus
+dan rentang tahun berapa pun. Nilai kosong (NaN) diabaikan per unit. Hasilnya
+disimpan di ``Snapshot`` sehingga dihitung sekali per versi data.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_WINDOW = 3
+
+
+@dataclass(frozen=True)
+class Tren:
+    """Ukuran tren untuk satu indikator. Array berbentuk ``(unit,)`` atau ``(unit, tahun)``."""
+
+    unit: tuple
+    tahun: tuple
+    nilai: np.ndarray
+    yoy: np.ndarray  # % perubahan terhadap tahun sebelumnya (kolom pertama NaN)
+    rolling: np.ndarray  # rata-rata bergerak ``window`` tahun ke belakang
+    perubahan: np.ndarray  # % perubahan tahun pertama -> terakhir
+    cagr: np.ndarray  # % pertumbuhan tahunan majemuk
+    slope: np.ndarray  # slope OLS, satuan indikator per tahun
+    window: int
+    tabel: pd.DataFrame  # satu baris per unit, urut % perubahan menurun
+    kode: tuple = ()  # kode_bps per unit (kunci join); kosong kalau sumber tanpa kode
+
+    @property
+    def periode(self):
+        return _periode(self.tahun)
+
+    @property
+    def pct_col(self):
+        return _pct_col(self.tahun)
+
+    def unit_index(self, unit):
+        return self.unit.index(unit)
+
+    def long(self):
+        """Bentuk long (unit × tahun) dengan nilai, YoY dan rata-rata bergerak."""
+        n_unit, n_tahun = self.nilai.shape
+        return pd.DataFrame({
+            "kabupaten": np.repeat(np.array(self.unit, dtype=object), n_tahun),
+            "tahun": np.tile(self.tahun, n_unit),
+            "nilai": self.nilai.ravel(),
+            "yoy_persen": self.yoy.ravel(),
+            f"rata_rata_{self.window}th": self.rolling.ravel(),
+        })
+
+
+def _periode(tahun):
+    return f"{tahun[0]}–{tahun[-1]}" if len(tahun) else ""
+
+
+def _pct_col(tahun):
+    return f"% Perubahan ({_periode(tahun)})"
+
+
+# ==============================
+# UKURAN (vektor, semua unit)
+# ==============================
+def _pct(baru, lama):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(lama > 0, (baru - lama) / lama * 100, np.nan)
+
+
+def yoy(nilai):
+    out = np.full(nilai.shape, np.nan)
+    out[:, 1:] = _pct(nilai[:, 1:], nilai[:, :-1])
+    return out
+
+
+def rolling_mean(nilai, window=DEFAULT_WINDOW):
+    """Rata-rata ``window`` tahun terakhir (min. satu nilai valid) lewat cumsum."""
+    valid = np.isfinite(nilai)
+    isi = np.where(valid, nilai, 0.0)
+    pad = ((0, 0), (1, 0))
+    cum = np.pad(isi.cumsum(axis=1), pad)
+    cnt = np.pad(valid.cumsum(axis=1), pad)
+    n_tahun = nilai.shape[1]
+    awal = np.maximum(np.arange(1, n_tahun + 1) - window, 0)
+    jumlah = cum[:, 1:] - cum[:, awal]
+    banyak = cnt[:, 1:] - cnt[:, awal]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(banyak > 0, jumlah / banyak, np.nan)
+
+
+def cagr(nilai, tahun):
+    """CAGR antara tahun pertama dan terakhir; NaN kalau salah satu ujung <= 0."""
+    if len(tahun) < 2:
+        return np.full(nilai.shape[0], np.nan)
+    awal, akhir = nilai[:, 0], nilai[:, -1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rasio = np.where((awal > 0) & (akhir > 0), akhir / awal, np.nan)
+        return (rasio ** (1 / (tahun[-1] - tahun[0])) - 1) * 100
+
+
+def slope(nilai, tahun):
+    """Slope OLS nilai terhadap tahun per unit, hanya memakai tahun yang terisi."""
+    x = np.asarray(tahun, dtype=float)[None, :]
+    valid = np.isfinite(nilai)
+    n = valid.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_mean = (x * valid).sum(axis=1) / n
+        y_mean = np.where(valid, nilai, 0.0).sum(axis=1) / n
+        dx = np.where(valid, x - x_mean[:, None], 0.0)
+        dy = np.where(valid, nilai - y_mean[:, None], 0.0)
+        sxx = (dx ** 2).sum(axis=1)
+        return np.where((n >= 2) & (sxx > 0), (dx * dy).sum(axis=1) / sxx, np.nan)
+
+
+# ==============================
+# KONSTRUKSI
+# ==============================
+def hitung(unit, tahun, nilai, window=DEFAULT_WINDOW, kode=()):
+    """Bangun ``Tren`` dari matriks ``nilai`` ``(unit, tahun)``; tahun boleh tidak berurutan."""
+    tahun = np.asarray(tahun, dtype=int)
+    order = np.argsort(tahun)
+    tahun = tahun[order]
+    nilai = np.asarray(nilai, dtype=float)[:, order]
+    window = max(1, min(window, len(tahun)))
+
+    hasil = {
+        "yoy": yoy(nilai),
+        "rolling": rolling_mean(nilai, window),
+        "perubahan": _pct(nilai[:, -1], nilai[:, 0]) if len(tahun) else np.full(len(unit), np.nan),
+        "cagr": cagr(nilai, tahun),
+        "slope": slope(nilai, tahun),
+    }
+    nilai.flags.writeable = False
+    for arr in hasil.values():
+        arr.flags.writeable = False
+
+    unit = tuple(unit)
+    tahun = tuple(int(y) for y in tahun)
+    return Tren(unit=unit, tahun=tahun, nilai=nilai, window=window,
+                tabel=_tabel(unit, tahun, nilai, hasil, window), kode=tuple(int(k) for k in kode), **hasil)
+
+
+def _tabel(unit, tahun, nilai, hasil, window):
+    pct_col = _pct_col(tahun)
+    df = pd.DataFrame(nilai, columns=[f"Tahun {y}" for y in tahun])
+    df.insert(0, "kabupaten", list(unit))
+    df[pct_col] = hasil["perubahan"]
+    if len(tahun) >= 2:
+        df[f"YoY {tahun[-1]} (%)"] = hasil["yoy"][:, -1]
+    df["CAGR (%)"] = hasil["cagr"]
+    df["Slope per tahun"] = hasil["slope"]
+    if tahun:
+        df[f"Rata-rata {window} th terakhir"] = hasil["rolling"][:, -1]
+    return df.sort_values(pct_col, ascending=False, kind="stable").reset_index(drop=True)
+
+
+def dari_long(df_long, nilai="kasus", window=DEFAULT_WINDOW):
+    """``Tren`` dari frame long (kolom kabupaten, tahun, ``nilai``; ``kode_bps`` kalau ada).
+
+    Dengan ``kode_bps`` unit di-key kode itu dan ``unit`` berisi nama kanonik.
+    """
+    kunci = "kode_bps" if "kode_bps" in df_long.columns else "kabupaten"
+    wide = (
+        pd.to_numeric(df_long[nilai], errors="coerce")
+        .groupby([df_long[kunci], df_long["tahun"].astype(int)], sort=False, observed=True)
+        .sum(min_count=1)
+        .unstack()
+    )
+    if kunci == "kabupaten":
+        return hitung(wide.index, wide.columns, wide.to_numpy(dtype=float), window=window)
+    nama = df_long.drop_duplicates("kode_bps").set_index("kode_bps")["kabupaten"].astype(str)
+    return hitung(nama.reindex(wide.index), wide.columns, wide.to_numpy(dtype=float),
+                  window=window, kode=wide.index)
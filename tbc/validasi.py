@@ -0,0 +1,313 @@
+"""Validasi skema/rentang dan rekonsiliasi nama wilayah ke kode BPS.
+
+File sumber menyebut wilayah dengan nama bebas ("Bogor", "Kota Bogor",
+"KABUPATEN BOGOR", "Kab. Bogor"). Nama dinormalisasi (huruf besar, tanpa tanda
+baca, prefiks KAB/KABUPATEN/KOTA dipisah menjadi jenis) lalu dicari di indeks
+``(jenis, nama inti) -> kode_bps`` yang dibangun sekali dari DBF RBI dan sheet
+penduduk BPS. Nama tanpa prefiks yang ada sebagai kabupaten dan kota
+("Bogor") dibaca sebagai kabupaten, sesuai konvensi tabel Dinkes. Nama yang
+tidak ketemu dicocokkan fuzzy (``difflib``) ke kunci indeks dan dicatat
+bersama skornya. Normalisasi dan lookup berjalan per nama unik, bukan per
+baris.
+
+Pemeriksaan skema dan rentang (kolom wajib, kasus ≥ 0 dan bulat, populasi > 0,
+kasus ≤ populasi, kode ganda, cakupan wilayah antar file, konsistensi kasus
+tahun terakhir antar file, lonjakan tahunan) dihitung dengan operasi kolom.
+Hasilnya frame ber-key ``kode_bps`` (int) dengan nama kanonik RBI, di-cache
+sebagai Arrow per versi data, sehingga join hilir memakai kunci integer.
+"""
+
+import difflib
+import functools
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from tbc import CACHE_DIR
+from tbc.store import read_arrow, write_arrow, write_atomic
+
+FUZZY_CUTOFF = 0.8
+PREVALENSI_MAKS = 0.05  # > 5% penduduk: hampir pasti salah input
+# Naikkan kalau aturan pemeriksaan atau format hasil berubah supaya cache lama diabaikan.
+ATURAN_VERSI = 2
+LONJAKAN = 5.0  # rasio kasus antar tahun berturut-turut di luar [1/5, 5]
+KOLOM_DATA = ("kabupaten", "kasus_2024", "populasi_2024")
+
+_PREFIKS = r"^(KABUPATEN|KAB|KOTA ADMINISTRASI|KOTA ADM|KOTA)\s+"
+_JENIS = {"KABUPATEN": "KAB", "KAB": "KAB"}  # sisanya (KOTA...) -> "KOTA"
+
+
+# ==============================
+# NORMALISASI + INDEKS
+# ==============================
+def normalisasi(nama):
+    """``(jenis, inti)`` per nama: jenis "KAB"/"KOTA"/"" (tanpa prefiks)."""
+    s = (
+        pd.Series(nama, dtype=object).astype(str)
+        .str.normalize("NFKD").str.upper()
+        .str.replace(r"[^A-Z0-9]+", " ", regex=True)
+        .str.strip()
+    )
+    prefiks = s.str.extract(_PREFIKS, expand=False)
+    jenis = prefiks.map(lambda p: _JENIS.get(p, "KOTA") if isinstance(p, str) else "")
+    inti = s.str.replace(_PREFIKS, "", regex=True)
+    return jenis, inti
+
+
+@dataclass(frozen=True, eq=False)
+class Indeks:
+    """Lookup nama -> kode BPS; ``nama`` = nama kanonik RBI per kode."""
+
+    kunci: dict  # (jenis, inti) -> kode
+    inti: dict  # inti -> tuple kode (semua jenis)
+    nama: dict  # kode -> nama kanonik
+
+    def cocokkan(self, nama):
+        """Frame per nama unik: nama_asli, kode_bps, kabupaten (kanonik), metode, skor."""
+        unik = pd.unique(pd.Series(nama, dtype=object).dropna().astype(str))
+        jenis, inti = normalisasi(unik)
+        baris = []
+        for asli, j, i in zip(unik, jenis, inti):
+            kode, metode, skor = self._cari(j, i)
+            baris.append((asli, kode, self.nama.get(kode), metode, skor))
+        return pd.DataFrame(baris, columns=["nama_asli", "kode_bps", "kabupaten", "metode", "skor"])
+
+    def _cari(self, jenis, inti):
+        if jenis and (jenis, inti) in self.kunci:
+            return self.kunci[jenis, inti], "tepat", 1.0
+        kandidat = self.inti.get(inti, ())
+        if not jenis and kandidat:
+            # Nama tanpa prefiks: kabupaten kalau ada, kalau tidak satu-satunya kode
+            kab = self.kunci.get(("KAB", inti))
+            if kab is not None or len(kandidat) == 1:
+                return (kab if kab is not None else kandidat[0]), "tepat", 1.0
+        return self._fuzzy(jenis, inti)
+
+    def _fuzzy(self, jenis, inti):
+        pilihan = [k for k in self.kunci if not jenis or k[0] == jenis]
+        teks = [k[1] for k in pilihan]
+        cocok = difflib.get_close_matches(inti, teks, n=1, cutoff=FUZZY_CUTOFF)
+        if not cocok:
+            return None, "tidak_cocok", 0.0
+        kunci = [k for k in pilihan if k[1] == cocok[0]]
+        kunci = next((k for k in kunci if k[0] == "KAB"), kunci[0]) if not jenis else kunci[0]
+        return self.kunci[kunci], "fuzzy", round(difflib.SequenceMatcher(None, inti, cocok[0]).ratio(), 3)
+
+
+def build_indeks(wilayah, denominator=None):
+    """Indeks dari DBF RBI (``load_wilayah()``) + nama BPS di sheet penduduk."""
+    kode = wilayah["kode_bps"].astype(int).tolist()
+    jenis_rbi = wilayah["tipadm"].map({"Kabupaten": "KAB", "Kota": "KOTA"}).fillna("")
+    _, inti = normalisasi(wilayah["kabupaten"])
+    kunci = {(j, i): k for j, i, k in zip(jenis_rbi, inti, kode)}
+    if denominator is not None:
+        jenis, inti_bps = normalisasi(denominator.nama)
+        kunci.update({(j, i): k for j, i, k in zip(jenis, inti_bps, denominator.kode)
+                      if j and k in set(kode) and (j, i) not in kunci})
+    per_inti = {}
+    for (_, i), k in kunci.items():
+        per_inti.setdefault(i, [])
+        if k not in per_inti[i]:
+            per_inti[i].append(k)
+    return Indeks(
+        kunci=kunci,
+        inti={i: tuple(k) for i, k in per_inti.items()},
+        nama=dict(zip(kode, wilayah["kabupaten"])),
+    )
+
+
+# ==============================
+# PEMERIKSAAN
+# ==============================
+def _masalah(file, aturan, tingkat, mask, frame, pesan):
+    """Baris masalah untuk setiap baris ``frame`` yang ``mask``-nya True."""
+    mask = np.asarray(mask, dtype=bool)
+    if not mask.any():
+        return []
+    sub = frame[mask]
+    kode = sub["kode_bps"] if "kode_bps" in sub else pd.Series([None] * len(sub))
+    if callable(pesan):
+        pesan = pesan(sub)
+    elif isinstance(pesan, str):
+        pesan = [pesan] * len(sub)
+    return [
+        {"file": file, "aturan": aturan, "tingkat": tingkat, "kode_bps": k, "nama": n, "pesan": p}
+        for k, n, p in zip(kode, sub["kabupaten"], pesan)
+    ]
+
+
+def _petakan(frame, indeks, file, masalah):
+    peta = indeks.cocokkan(frame["kabupaten"])
+    peta.insert(0, "file", file)
+    by_nama = peta.set_index("nama_asli")
+    asli = frame["kabupaten"].astype(str)
+    frame = frame.assign(
+        kode_bps=asli.map(by_nama["kode_bps"]).astype("Int64"),
+        kabupaten=asli.map(by_nama["kabupaten"]),
+    )
+    masalah += [
+        {"file": file, "aturan": "nama_tidak_cocok", "tingkat": "error", "kode_bps": None,
+         "nama": r.nama_asli, "pesan": "nama wilayah tidak dikenali; baris diabaikan"}
+        for r in peta[peta["metode"] == "tidak_cocok"].itertuples()
+    ] + [
+        {"file": file, "aturan": "nama_fuzzy", "tingkat": "peringatan", "kode_bps": r.kode_bps,
+         "nama": r.nama_asli, "pesan": f"dicocokkan ke '{r.kabupaten}' (skor {r.skor:.2f})"}
+        for r in peta[peta["metode"] == "fuzzy"].itertuples()
+    ]
+    ganda = frame["kode_bps"].notna() & frame.duplicated("kode_bps", keep="first")
+    masalah += _masalah(file, "kode_ganda", "error", ganda, frame,
+                        "lebih dari satu baris untuk wilayah yang sama; hanya baris pertama dipakai")
+    frame = frame[frame["kode_bps"].notna() & ~ganda]
+    return frame.astype({"kode_bps": "int64"}).reset_index(drop=True), peta
+
+
+def _cek_skema(df, kolom, file):
+    kurang = [k for k in kolom if k not in df.columns]
+    if kurang:
+        raise ValueError(f"{file}: kolom wajib tidak ada: {', '.join(map(str, kurang))}")
+
+
+def _cek_data(df, masalah, file):
+    kasus = pd.to_numeric(df["kasus_2024"], errors="coerce")
+    pop = pd.to_numeric(df["populasi_2024"], errors="coerce")
+    masalah += _masalah(file, "kasus_kosong", "error", kasus.isna(), df, "kasus_2024 kosong/bukan angka")
+    masalah += _masalah(file, "kasus_negatif", "error", kasus < 0, df, "kasus_2024 negatif")
+    masalah += _masalah(file, "kasus_pecahan", "peringatan", kasus.notna() & (kasus % 1 != 0), df,
+                        "kasus_2024 bukan bilangan bulat")
+    masalah += _masalah(file, "populasi_tidak_valid", "error", ~(pop > 0), df,
+                        "populasi_2024 kosong atau ≤ 0")
+    masalah += _masalah(file, "kasus_melebihi_populasi", "error", kasus > pop, df,
+                        "kasus_2024 lebih besar dari populasi_2024")
+    masalah += _masalah(file, "prevalensi_tinggi", "peringatan", kasus / pop > PREVALENSI_MAKS, df,
+                        lambda s: [f"prevalensi {v:.1%} > {PREVALENSI_MAKS:.0%}"
+                                   for v in s["kasus_2024"] / s["populasi_2024"]])
+
+
+def _cek_tren(wide, tahun_cols, masalah, file):
+    nilai = wide[tahun_cols].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    kosong = np.isnan(nilai)
+    ada_kosong = kosong.any(axis=1)
+    label = np.asarray(tahun_cols, dtype=object)
+    masalah += _masalah(file, "kasus_kosong", "peringatan", ada_kosong, wide,
+                        [f"tahun kosong: {', '.join(label[m])}" for m in kosong[ada_kosong]])
+    masalah += _masalah(file, "kasus_negatif", "error", (nilai < 0).any(axis=1), wide, "ada kasus negatif")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rasio = nilai[:, 1:] / nilai[:, :-1]
+    lonjak = ((rasio > LONJAKAN) | (rasio < 1 / LONJAKAN)) & np.isfinite(rasio)
+    masalah += _masalah(file, "lonjakan_tahunan", "peringatan", lonjak.any(axis=1), wide,
+                        f"rasio kasus antar tahun di luar [1/{LONJAKAN:g}, {LONJAKAN:g}]")
+
+
+def _cek_cakupan(nama_file, kode_file, wilayah, masalah):
+    """Wilayah RBI yang tidak ada di file (join hilir akan menghasilkan NaN)."""
+    hilang = ~wilayah["kode_bps"].isin(list(kode_file))
+    masalah += _masalah(nama_file, "wilayah_hilang", "peringatan", hilang, wilayah,
+                        "wilayah RBI tidak ada di file ini")
+
+
+# ==============================
+# HASIL + CACHE
+# ==============================
+@dataclass(frozen=True)
+class Validasi:
+    """Frame tervalidasi (key ``kode_bps``) + pemetaan nama dan daftar masalah."""
+
+    df: pd.DataFrame  # kasus 2024 + kode_bps, nama kanonik
+    df_trend_wide: pd.DataFrame  # tren wide + kode_bps, nama kanonik
+    df_wilayah: pd.DataFrame  # df ⋈ RBI (tipadm, luas, kepadatan) pada kode_bps
+    pemetaan: pd.DataFrame  # file, nama_asli, kode_bps, kabupaten, metode, skor
+    masalah: pd.DataFrame  # file, aturan, tingkat, kode_bps, nama, pesan
+
+    @property
+    def n_error(self):
+        return int((self.masalah["tingkat"] == "error").sum())
+
+    @property
+    def n_peringatan(self):
+        return int((self.masalah["tingkat"] == "peringatan").sum())
+
+
+_FRAMES = ("df", "df_trend_wide", "df_wilayah", "pemetaan", "masalah")
+_KOLOM_MASALAH = ["file", "aturan", "tingkat", "kode_bps", "nama", "pesan"]
+
+
+def jalankan(df, df_trend_wide, tahun_cols, wilayah, denominator=None, file_data="data", file_tren="tren",
+             masalah_tambahan=()):
+    """Validasi + rekonsiliasi semua file; mengembalikan ``Validasi``.
+
+    ``masalah_tambahan``: baris masalah dari tahap sebelumnya (mis. pemetaan
+    nama line-list), dengan kolom yang sama seperti ``Validasi.masalah``.
+    """
+    indeks = build_indeks(wilayah, denominator)
+    masalah = list(masalah_tambahan)
+
+    _cek_skema(df, KOLOM_DATA, file_data)
+    _cek_skema(df_trend_wide, ["kabupaten", *tahun_cols], file_tren)
+    df, peta_data = _petakan(df, indeks, file_data, masalah)
+    _cek_data(df, masalah, file_data)
+    df_trend_wide, peta_tren = _petakan(df_trend_wide, indeks, file_tren, masalah)
+    _cek_tren(df_trend_wide, list(tahun_cols), masalah, file_tren)
+
+    _cek_cakupan(file_data, df["kode_bps"], wilayah, masalah)
+    _cek_cakupan(file_tren, df_trend_wide["kode_bps"], wilayah, masalah)
+    if denominator is not None:
+        _cek_cakupan("populasi BPS", denominator.kode, wilayah, masalah)
+
+    # Kasus tahun data (kolom "kasus_<tahun>") harus sama dengan kolom tren tahun yang sama
+    kolom_kasus = next((c for c in df.columns if re.fullmatch(r"kasus_\d{4}", str(c))), None)
+    tahun_data = kolom_kasus.rsplit("_", 1)[1] if kolom_kasus else None
+    kolom_tren = [c for c in tahun_cols if re.search(r"\d{4}", str(c)).group() == tahun_data]
+    if kolom_tren:
+        gabung = df[["kode_bps", "kabupaten", kolom_kasus]].merge(
+            df_trend_wide[["kode_bps", kolom_tren[0]]], on="kode_bps")
+        beda = pd.to_numeric(gabung[kolom_tren[0]], errors="coerce") != gabung[kolom_kasus]
+        masalah += _masalah("data × tren", "kasus_tidak_konsisten", "peringatan", beda, gabung,
+                            lambda s: [f"{kolom_kasus} = {a:,} vs tren = {b:,}"
+                                       for a, b in zip(s[kolom_kasus], s[kolom_tren[0]])])
+
+    df_wilayah = df.merge(wilayah.drop(columns="kabupaten"), on="kode_bps", how="left", validate="one_to_one")
+    df_wilayah["kepadatan"] = df_wilayah["populasi_2024"] / df_wilayah["luas_km2"]
+    return Validasi(
+        df=df,
+        df_trend_wide=df_trend_wide,
+        df_wilayah=df_wilayah,
+        pemetaan=pd.concat([peta_data, peta_tren], ignore_index=True),
+        masalah=pd.DataFrame(masalah, columns=_KOLOM_MASALAH).astype({"kode_bps": "Int64"}),
+    )
+
+
+def _cache_dir(version):
+    spec = [ATURAN_VERSI, list(version), list(_FRAMES)]
+    key = hashlib.sha1(json.dumps(spec).encode("utf-8")).hexdigest()[:16]
+    return CACHE_DIR / f"validasi-{key}"
+
+
+@functools.lru_cache(maxsize=4)
+def _muat(version):
+    folder = _cache_dir(version)
+    try:
+        return Validasi(**{nama: read_arrow(folder / f"{nama}.arrow") for nama in _FRAMES})
+    except (OSError, ValueError):
+        return None
+
+
+def validasi(version, df, df_trend_wide, tahun_cols, wilayah, denominator=None, **opsi):
+    """``jalankan()`` dengan cache Arrow per versi data (``version`` dari ``data_version``)."""
+    hasil = _muat(tuple(version))
+    if hasil is not None:
+        return hasil
+    hasil = jalankan(df, df_trend_wide, tahun_cols, wilayah, denominator, **opsi)
+    folder = _cache_dir(version)
+    try:
+        folder.mkdir(parents=True, exist_ok=True)
+        for nama in _FRAMES:
+            write_arrow(folder / f"{nama}.arrow", getattr(hasil, nama))
+        write_atomic(folder / "version.json", json.dumps(list(version)).encode("utf-8"))
+    except OSError:
+        pass  # cache opsional
+    _muat.cache_clear()
+    return hasil
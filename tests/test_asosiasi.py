@@ -0,0 +1,64 @@
+"""Known-answer test untuk tabel 2x2, PR/POR/chi-square dan Mantel-Haenszel."""
+
+import numpy as np
+import pytest
+
+from tbc import asosiasi
+
+
+def test_ukuran_asosiasi_tabel_tangan():
+    # a=20, b=80, c=10, d=90 -> PR = 0.2/0.1, POR = 20·90/(80·10),
+    # chi² = 200·(1800 − 800)² / (100·100·30·170)
+    r = asosiasi.ukuran_asosiasi(20, 80, 10, 90)
+    assert r["pr"] == pytest.approx(2.0)
+    assert r["por"] == pytest.approx(2.25)
+    assert r["chi2"] == pytest.approx(200 * 1000 ** 2 / (100 * 100 * 30 * 170))
+    assert r["p_value"] == pytest.approx(0.04767, abs=1e-4)
+    se_pr = np.sqrt(1 / 20 - 1 / 100 + 1 / 10 - 1 / 100)
+    assert r["pr_lo"] == pytest.approx(2.0 * np.exp(-1.959964 * se_pr), rel=1e-5)
+    assert r["pr_hi"] == pytest.approx(2.0 * np.exp(1.959964 * se_pr), rel=1e-5)
+
+
+def test_ukuran_asosiasi_tak_terdefinisi_tanpa_peringatan():
+    with np.errstate(all="raise"):
+        r = asosiasi.ukuran_asosiasi([0, 5], [0, -1], [0, 2], [0, 1])
+    assert np.isnan(r["chi2"]).all()
+    assert np.isnan(r["p_value"]).all()
+
+
+def test_tabel_2x2_dari_data():
+    kasus = np.array([1, 2, 3, 4])
+    populasi = np.array([10, 20, 30, 40])
+    kepadatan = np.array([5.0, 15.0, 25.0, 35.0])
+    a, b, c, d = asosiasi.tabel_2x2(kasus, populasi, kepadatan, [20.0])[:, 0, 0]
+    # terpapar = unit 3 dan 4 (kepadatan > 20)
+    assert (a, b, c, d) == (7, 63, 3, 27)
+
+
+def test_scan_sama_dengan_ambang_tunggal():
+    rng = np.random.default_rng(0)
+    populasi = rng.integers(1_000, 10_000, 30)
+    kasus = rng.binomial(populasi, 0.01)
+    kepadatan = rng.uniform(100, 5_000, 30)
+    scan = asosiasi.scan_ambang(kasus, populasi, kepadatan)
+    assert len(scan) == 29  # satu titik potong antar unit berurutan
+    baris = scan.iloc[10]
+    tunggal = asosiasi.scan_ambang(kasus, populasi, kepadatan, [baris["ambang"]]).iloc[0]
+    assert tunggal["pr"] == pytest.approx(baris["pr"])
+    terpapar = kepadatan > baris["ambang"]
+    assert tunggal["a"] == kasus[terpapar].sum()
+    assert tunggal["c"] == kasus[~terpapar].sum()
+
+
+def test_mantel_haenszel_satu_strata_sama_dengan_kasar():
+    r = asosiasi.ukuran_asosiasi(20, 80, 10, 90)
+    mh = asosiasi.mantel_haenszel([20], [80], [10], [90])
+    assert mh["pr_mh"] == pytest.approx(r["pr"])
+    assert mh["por_mh"] == pytest.approx(r["por"])
+
+
+def test_mantel_haenszel_strata_homogen():
+    # Dua strata dengan PR = 2 masing-masing -> PR gabungan = 2
+    mh = asosiasi.mantel_haenszel([20, 4], [80, 96], [10, 2], [90, 98])
+    assert mh["pr_mh"] == pytest.approx(2.0)
+    assert mh["pr_mh_lo"] < 2.0 < mh["pr_mh_hi"]
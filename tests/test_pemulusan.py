@@ -0,0 +1,107 @@
+"""Known-answer test untuk pemulusan Bayes (EB Poisson-Gamma, CAR Leroux/iid)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tbc import pemulusan, spasial
+
+
+def grid(k):
+    """Bobot queen untuk grid k×k (sel persegi satuan), kode 1..k²."""
+    records = [[np.array([[j, i], [j + 1, i], [j + 1, i + 1], [j, i + 1], [j, i]], dtype=float)]
+               for i in range(k) for j in range(k)]
+    return spasial.build_bobot(records, range(1, k * k + 1))
+
+
+def test_eb_momen_manual():
+    y = np.array([0.0, 10, 40])
+    e = np.array([10.0, 20, 20])
+    # m = 1, s² = (10·1 + 20·0.25 + 20·1)/50 = 0.7, var = 0.7 − 1/(50/3) = 0.64
+    a = 1 / 0.64
+    eb = pemulusan.empirical_bayes(y, e)
+    np.testing.assert_allclose(eb["shape"], a + y)
+    np.testing.assert_allclose(eb["rate"], a + e)
+    np.testing.assert_allclose(eb["rr"], (a + y) / (a + e))
+    # menyusut ke m = 1 dari SMR mentah
+    assert 0 < eb["rr"][0] < 1 and 1 < eb["rr"][2] < 2
+    assert (eb["rr_lo"] < eb["rr"]).all() and (eb["rr"] < eb["rr_hi"]).all()
+
+
+def test_eb_tanpa_variasi_ekstra_poisson():
+    e = np.array([10.0, 20, 30, 40])
+    eb = pemulusan.empirical_bayes(e * 1.5, e)
+    np.testing.assert_allclose(eb["rr"], 1.5, rtol=1e-4)
+
+
+def test_gamma_wilson_hilferty_invers():
+    shape, rate = np.array([2.0, 15.0, 300.0]), np.array([1.0, 10.0, 250.0])
+    for q in (0.025, 0.5, 0.975):
+        x = pemulusan._gamma_ppf(q, shape, rate)
+        np.testing.assert_allclose(pemulusan._gamma_sf(x, shape, rate), 1 - q, atol=1e-12)
+
+
+def test_mode_iid_sama_dengan_aljabar_padat():
+    rng = np.random.default_rng(3)
+    e = rng.uniform(5, 50, 12)
+    y = rng.poisson(e * rng.lognormal(0, 0.3, 12)).astype(float)
+    tau = 4.0
+    x0 = np.zeros(13)
+    x, half_logdet, var = pemulusan._mode_iid(y, e, tau, x0)
+
+    prec = np.diag(np.r_[1 / pemulusan.PRIOR_BETA0_VAR, np.full(12, tau)])
+    x_padat, chol = pemulusan._mode(y, e, prec, x0)
+    np.testing.assert_allclose(x, x_padat, atol=1e-8)
+    assert half_logdet == pytest.approx(np.log(np.diag(chol)).sum())
+    h_inv = np.linalg.inv(chol @ chol.T)
+    np.testing.assert_allclose(var, h_inv[0, 0] + np.diag(h_inv)[1:] + 2 * h_inv[0, 1:], rtol=1e-8)
+
+
+def test_iid_sama_dengan_car_rho_nol():
+    # Grid τ tanpa graf (O(n)) = jalur padat dengan Q = I
+    rng = np.random.default_rng(0)
+    e = rng.uniform(5, 50, 9)
+    y = rng.poisson(e).astype(float)
+    iid = pemulusan.car_leroux(y, e, None)
+    assert iid["model"] == "iid"
+    lap, x = np.zeros((9, 9)), np.r_[np.log(y.sum() / e.sum()), np.zeros(9)]
+    for k, log_tau in enumerate(pemulusan.LOG_TAU):
+        (log_post, eta, var, _, _), x = pemulusan._titik_car(y, e, lap, 0.0, 0.0, log_tau, x)
+        np.testing.assert_allclose(iid["mean_grid"][k], eta, atol=1e-8)
+        np.testing.assert_allclose(iid["var_grid"][k], var, rtol=1e-8)
+
+
+def test_car_grid_3x3():
+    w = grid(3)
+    e = np.full(9, 20.0)
+    car = pemulusan.car_leroux(e.copy(), e, w)
+    assert car["model"] == "car"
+    assert car["bobot_grid"].sum() == pytest.approx(1.0)
+    # laju identik -> RR ≈ 1 di semua unit, interval memuat 1
+    np.testing.assert_allclose(car["rr"], 1.0, atol=0.02)
+    assert (car["rr_lo"] < 1).all() and (car["rr_hi"] > 1).all()
+
+    y = e.copy()
+    y[[0, 1, 3]] = 40.0  # pojok berisiko tinggi
+    car = pemulusan.car_leroux(y, e, w)
+    assert (car["rr_lo"] < car["rr"]).all() and (car["rr"] < car["rr_hi"]).all()
+    assert car["rr"][[0, 1, 3]].min() > car["rr"][[5, 7, 8]].max()
+
+
+def test_fit_model_dan_batas_unit(monkeypatch):
+    w = grid(3)
+    df = pd.DataFrame({
+        "kode_bps": list(w.kode), "kabupaten": [f"K{k}" for k in w.kode],
+        "kasus_2024": [30, 25, 20, 28, 22, 18, 15, 12, 10], "populasi_2024": [10_000] * 9,
+    })
+    df["prevalensi_per_100k"] = df["kasus_2024"] / df["populasi_2024"] * 100_000
+    hasil = pemulusan.fit(df, w)
+    assert hasil.car["model"] == "car"
+    assert hasil.rate_ref == pytest.approx(180 / 90_000)
+    np.testing.assert_allclose(hasil.df["eb_per_100k"], hasil.eb["rr"] * 200)
+    tabel = hasil.tabel(1.0)
+    assert tabel[["p_eb_di_atas_ambang", "p_car_di_atas_ambang"]].stack().between(0, 1).all()
+
+    monkeypatch.setattr(pemulusan, "MAKS_UNIT_CAR", 8)
+    assert pemulusan.fit(df, w).car["model"] == "iid"
+    assert pemulusan.fit(df).car["model"] == "iid"
@@ -0,0 +1,72 @@
+"""Known-answer test untuk proyeksi quasi-Poisson + pooling DerSimonian-Laird."""
+
+import numpy as np
+import pytest
+
+from tbc import proyeksi
+
+TAHUN = [2022, 2023, 2024]
+
+
+def test_newton_dua_tahun_tertutup():
+    # Dua titik: MLE melewati keduanya, b = ln 2, a = ln √(10·20) di t̄
+    y = np.array([[10.0, 20.0]])
+    a, b, mu, ok = proyeksi._newton(y, np.ones_like(y, dtype=bool), np.array([-0.5, 0.5]))
+    assert ok[0]
+    assert b[0] == pytest.approx(np.log(2))
+    assert a[0] == pytest.approx(np.log(np.sqrt(200)))
+    np.testing.assert_allclose(mu, y)
+
+
+def test_dersimonian_laird_manual():
+    # Q = 0.5 < df = 1 -> τ² = 0, efek tetap
+    assert proyeksi._dersimonian_laird(np.array([0.0, 1.0]), np.array([1.0, 1.0])) == pytest.approx((0.5, 0.0, 0.5))
+    # Q = 2, C = 2 − 2/2 = 1 -> τ² = 1, bobot acak 1/2 masing-masing
+    assert proyeksi._dersimonian_laird(np.array([0.0, 2.0]), np.array([1.0, 1.0])) == pytest.approx((1.0, 1.0, 1.0))
+    # < 2 unit berslope: tanpa varians antar-unit
+    beta, tau2, var = proyeksi._dersimonian_laird(np.array([0.3, 5.0]), np.array([1.0, np.inf]))
+    assert (beta, tau2, var) == (0.3, 0.0, np.inf)
+
+
+def test_seri_konstan_slope_nol():
+    nilai = np.array([[100.0] * 3, [40.0] * 3, [7.0] * 3])
+    hasil = proyeksi.fit(["A", "B", "C"], TAHUN, nilai)
+    np.testing.assert_allclose(hasil.b, 0.0, atol=1e-12)
+    assert hasil.phi == 1.0 and hasil.tau2 == 0.0
+    p = hasil.prediksi(1)
+    assert p["tahun"] == 2025
+    # mean lognormal = exp(η + se²/2), se² = φ/Σμ + (x − x̄)² Var(b) dengan x = 2, x̄ = 0
+    se2 = 1 / nilai.sum(axis=1) + 2 ** 2 * hasil.var_b
+    np.testing.assert_allclose(p["mean"], nilai[:, 0] * np.exp(se2 / 2))
+    assert (p["lo"] < nilai[:, 0]).all() and (nilai[:, 0] < p["hi"]).all()
+    assert p["total"]["mean"] == pytest.approx(p["mean"].sum())
+
+
+def test_laju_sama_semua_unit_dipool_tanpa_tarikan():
+    nilai = np.array([[100.0, 120, 144], [50, 60, 72]])
+    hasil = proyeksi.fit(["A", "B"], TAHUN, nilai)
+    np.testing.assert_allclose(hasil.b, np.log(1.2))
+    np.testing.assert_allclose(hasil.b_mentah, np.log(1.2))
+    assert hasil.beta == pytest.approx(np.log(1.2))
+    assert hasil.tau2 == 0.0
+    tabel = hasil.tabel(1)
+    np.testing.assert_allclose(tabel["Tren tahunan (%)"], 20.0)
+
+
+def test_pooling_menarik_slope_ke_provinsi():
+    nilai = np.array([[100.0, 110, 121], [100, 90, 81], [1000, 1000, 1000], [2, 6, 3]])
+    pool = proyeksi.fit(list("ABCD"), TAHUN, nilai)
+    bebas = proyeksi.fit(list("ABCD"), TAHUN, nilai, pooling=False)
+    np.testing.assert_allclose(bebas.b, pool.b_mentah)
+    # unit dengan sedikit kasus paling kuat ditarik ke β
+    jarak_pool, jarak_bebas = np.abs(pool.b - pool.beta), np.abs(bebas.b - pool.beta)
+    assert (jarak_pool <= jarak_bebas + 1e-12).all()
+    assert jarak_pool[3] / jarak_bebas[3] < jarak_pool[0] / jarak_bebas[0]
+
+
+def test_tahun_terakhir_nol_dan_unit_tanpa_kasus():
+    nilai = np.array([[10.0, 5, 0], [0, 0, 0], [20, 22, 25]])
+    tabel = proyeksi.fit(["A", "B", "C"], TAHUN, nilai).tabel(1).set_index("kabupaten")
+    assert np.isnan(tabel.loc["A", "% Perubahan"]) and np.isnan(tabel.loc["B", "% Perubahan"])
+    assert np.isfinite(tabel.loc["B", "Proyeksi 2025"])  # pseudo-count 0,5
+    assert tabel.index[0] == "C"  # NaN diurutkan di akhir
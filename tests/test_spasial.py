@@ -0,0 +1,110 @@
+"""Known-answer test untuk graf ketetanggaan dan statistik spasial."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from tbc import spasial
+
+
+def kotak(i, j):
+    """Ring persegi satuan (tertutup) untuk sel baris ``i``, kolom ``j``."""
+    return np.array([[j, i], [j + 1, i], [j + 1, i + 1], [j, i + 1], [j, i]], dtype=float)
+
+
+def grid(k):
+    """Bobot queen untuk grid k×k lewat ``build_bobot``; unit urut per baris."""
+    records = [[kotak(i, j)] for i in range(k) for j in range(k)]
+    return spasial.build_bobot(records, range(1, k * k + 1))
+
+
+def padat(bobot):
+    w = np.zeros((bobot.n, bobot.n))
+    w[bobot.baris(), bobot.indices] = 1.0
+    return w
+
+
+def test_grid_queen_3x3():
+    w = grid(3)
+    # sudut 3 tetangga, tepi 5, pusat 8
+    np.testing.assert_array_equal(w.kardinalitas, [3, 5, 3, 5, 8, 5, 3, 5, 3])
+    np.testing.assert_array_equal(w.indices[w.indptr[4]:w.indptr[5]], [0, 1, 2, 3, 5, 6, 7, 8])
+    np.testing.assert_array_equal(w.indices[w.indptr[0]:w.indptr[1]], [1, 3, 4])
+    d = padat(w)
+    np.testing.assert_array_equal(d, d.T)
+    np.testing.assert_allclose(w.xy[4], [1.5, 1.5])
+
+
+def test_lag_baku_dan_biner():
+    w = grid(3)
+    x = np.arange(9.0)
+    np.testing.assert_allclose(w.lag(x, baku=False), padat(w) @ x)
+    np.testing.assert_allclose(w.lag(x), padat(w) @ x / w.kardinalitas)
+    assert w.lag(x)[4] == pytest.approx(4.0)  # rata-rata delapan tetangga pusat
+
+
+def test_subset_membuang_tetangga_di_luar():
+    w = grid(3).subset([5, 1, 2])  # pusat, sudut kiri bawah, tepi bawah
+    np.testing.assert_array_equal(w.kardinalitas, [2, 2, 2])
+    assert w.kode == (5, 1, 2)
+
+
+def test_moran_ekspektasi_permutasi():
+    # Rata-rata I atas SEMUA 9! permutasi = -1/(n-1), untuk W dan x apa pun
+    w = grid(3)
+    x = np.array([3.0, 1, 4, 1, 5, 9, 2, 6, 5])
+    n = len(x)
+    z = x - x.mean()
+    zp = z[np.array(list(itertools.permutations(range(n)))).T]  # (n, 9!)
+    s0 = float((w.kardinalitas > 0).sum())
+    i_perm = n / s0 * (zp * w.lag(zp)).sum(axis=0) / (z @ z)
+    assert i_perm.mean() == pytest.approx(-1 / (n - 1))
+
+    moran = spasial.moran_global(x, w, permutasi=99, seed=1, workers=1)
+    assert moran["EI"] == pytest.approx(-1 / (n - 1))
+    assert moran["I"] == pytest.approx(i_perm[0])  # permutasi identitas = data asli
+    assert 1 / 100 <= moran["p_sim"] <= 1
+
+
+def test_moran_gradien_positif_dan_deterministik():
+    w = grid(5)
+    x = np.repeat(np.arange(5.0), 5)  # naik per baris
+    d = padat(w) / w.kardinalitas[:, None]
+    z = x - x.mean()
+    a = spasial.moran_global(x, w, permutasi=199, seed=7, workers=1)
+    b = spasial.moran_global(x, w, permutasi=199, seed=7, workers=3)
+    assert a["I"] == pytest.approx(z @ d @ z / (z @ z))
+    assert a["I"] > 0 and a["p_sim"] == pytest.approx(1 / 200)
+    assert a["p_sim"] == b["p_sim"]
+
+
+def test_gi_star_hotspot_di_pojok():
+    w = grid(5)
+    x = np.ones(25)
+    x[[0, 1, 5, 6]] = 10.0  # blok 2×2 di pojok
+    hasil = spasial.lokal(x, w, permutasi=999, seed=0, workers=1)
+    assert (hasil.loc[[0, 1, 5, 6], "hotspot"] == "Hotspot").all()
+    assert hasil.loc[24, "hotspot"] != "Hotspot"
+    np.testing.assert_allclose(hasil["lag"], w.lag(x - x.mean()))
+    assert hasil.loc[0, "kuadran_lisa"] == "Tinggi-Tinggi"
+
+
+def test_llr_poisson_manual():
+    # c=30, e=10 dari total 100: 30 ln 3 + 70 ln(70/90)
+    assert spasial._llr(np.array(30.0), np.array(10.0), 100.0) == pytest.approx(
+        30 * np.log(3) + 70 * np.log(70 / 90))
+    assert spasial._llr(np.array(5.0), np.array(10.0), 100.0) == 0.0  # kasus < harapan
+
+
+def test_scan_kulldorff_menemukan_klaster():
+    w = grid(5)
+    populasi = np.full(25, 1000.0)
+    kasus = np.full(25, 5.0)
+    kasus[[18, 19, 23, 24]] = 40.0
+    scan = spasial.scan_kulldorff(kasus, populasi, w.xy, permutasi=199, seed=0, workers=1)
+    assert set(scan["anggota"]) == {18, 19, 23, 24}
+    assert scan["observed"] == 160
+    assert scan["expected"] == pytest.approx(265 * 4 / 25)
+    assert scan["rr"] == pytest.approx((160 / 42.4) / (105 / (265 - 42.4)))
+    assert scan["p_value"] == pytest.approx(1 / 200)
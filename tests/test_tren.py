@@ -0,0 +1,63 @@
+"""Known-answer test untuk mesin tren multi-tahun."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tbc import tren
+
+TAHUN = [2019, 2020, 2021, 2022, 2023, 2024]
+
+
+def test_seri_konstan_slope_nol_cagr_nol():
+    t = tren.hitung(["A"], TAHUN, np.full((1, len(TAHUN)), 250.0))
+    assert t.slope[0] == pytest.approx(0.0)
+    assert t.cagr[0] == pytest.approx(0.0)
+    assert t.perubahan[0] == pytest.approx(0.0)
+    assert np.isnan(t.yoy[0, 0])
+    np.testing.assert_allclose(t.yoy[0, 1:], 0.0)
+
+
+def test_laju_konstan_cagr_sama_dengan_laju():
+    # tumbuh 10% per tahun -> CAGR dan setiap YoY = 10
+    nilai = 100 * 1.1 ** np.arange(len(TAHUN))
+    t = tren.hitung(["A"], TAHUN, nilai[None, :])
+    assert t.cagr[0] == pytest.approx(10.0)
+    np.testing.assert_allclose(t.yoy[0, 1:], 10.0)
+    assert t.perubahan[0] == pytest.approx((1.1 ** 5 - 1) * 100)
+
+
+def test_slope_linear_dan_tahun_kosong():
+    nilai = np.array([[10.0, 13.0, np.nan, 19.0, 22.0, 25.0]])  # 3 per tahun, satu tahun kosong
+    t = tren.hitung(["A"], TAHUN, nilai)
+    assert t.slope[0] == pytest.approx(3.0)
+
+
+def test_cagr_ujung_nol_nan():
+    t = tren.hitung(["A"], TAHUN, np.array([[0.0, 1, 2, 3, 4, 5]]))
+    assert np.isnan(t.cagr[0])
+    assert np.isnan(t.perubahan[0])
+
+
+def test_rolling_mean():
+    t = tren.hitung(["A"], TAHUN, np.array([[1.0, 2, 3, 4, 5, 6]]), window=3)
+    np.testing.assert_allclose(t.rolling[0], [1, 1.5, 2, 3, 4, 5])
+
+
+def test_tahun_tidak_berurutan_diurutkan():
+    t = tren.hitung(["A"], [2024, 2022, 2023], np.array([[30.0, 10.0, 20.0]]))
+    assert t.tahun == (2022, 2023, 2024)
+    assert t.slope[0] == pytest.approx(10.0)
+
+
+def test_dari_long_di_key_kode_bps():
+    df = pd.DataFrame({
+        "kode_bps": [3201, 3201, 3273, 3273],
+        "kabupaten": ["Bogor", "Bogor", "Kota Bandung", "Kota Bandung"],
+        "tahun": [2023, 2024, 2023, 2024],
+        "kasus": [100, 110, 50, 40],
+    })
+    t = tren.dari_long(df)
+    assert t.kode == (3201, 3273)
+    assert t.unit == ("Bogor", "Kota Bandung")
+    np.testing.assert_allclose(t.perubahan, [10.0, -20.0])
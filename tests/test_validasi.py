@@ -0,0 +1,59 @@
+"""Known-answer test untuk normalisasi nama dan rekonsiliasi ke kode BPS."""
+
+import pandas as pd
+
+from tbc import validasi
+
+WILAYAH = pd.DataFrame({
+    "kode_bps": [3201, 3271, 3204, 3273],
+    "kabupaten": ["Bogor", "Kota Bogor", "Bandung", "Kota Bandung"],
+    "tipadm": ["Kabupaten", "Kota", "Kabupaten", "Kota"],
+    "luas_km2": [2991.0, 118.0, 1762.0, 167.0],
+})
+
+
+def test_normalisasi_prefiks_dan_tanda_baca():
+    jenis, inti = validasi.normalisasi(["Kab. Bogor", "KABUPATEN  bogor", "Kota Adm. Bandung", "Bandung"])
+    assert list(jenis) == ["KAB", "KAB", "KOTA", ""]
+    assert list(inti) == ["BOGOR", "BOGOR", "BANDUNG", "BANDUNG"]
+
+
+def test_cocokkan_tepat_tanpa_prefiks_dan_fuzzy():
+    indeks = validasi.build_indeks(WILAYAH)
+    peta = indeks.cocokkan(["Kab. Bogor", "Kota Bogor", "Bogor", "Kota Bandungg", "Jakarta", "Bogor"])
+    peta = peta.set_index("nama_asli")
+    assert len(peta) == 5  # per nama unik
+    assert peta.loc["Kab. Bogor", "kode_bps"] == 3201
+    assert peta.loc["Kota Bogor", "kode_bps"] == 3271
+    # tanpa prefiks dan ada kab + kota: dibaca kabupaten
+    assert (peta.loc["Bogor", "kode_bps"], peta.loc["Bogor", "metode"]) == (3201, "tepat")
+    assert peta.loc["Kota Bandungg", ["kode_bps", "kabupaten", "metode"]].tolist() == [3273, "Kota Bandung", "fuzzy"]
+    assert 0.8 <= peta.loc["Kota Bandungg", "skor"] < 1
+    assert peta.loc["Jakarta", "metode"] == "tidak_cocok" and pd.isna(peta.loc["Jakarta", "kode_bps"])
+
+
+def test_jalankan_join_pada_kode_dan_masalah():
+    df = pd.DataFrame({
+        "kabupaten": ["KAB. BOGOR", "Kota Bogor", "Kota Bandungg", "Jakarta", "Kab Bogor"],
+        "kasus_2024": [100, 30, 50, 5, 99],
+        "populasi_2024": [5_000_000, 1_000_000, 2_500_000, 100, 5_000_000],
+    })
+    wide = pd.DataFrame({
+        "kabupaten": ["Bogor", "Kota Bogor", "Kota Bandung", "Bandung"],
+        "Tahun 2023": [90, 28, 9, 70], "Tahun 2024": [100, 31, 50, 80],
+    })
+    hasil = validasi.jalankan(df, wide, ["Tahun 2023", "Tahun 2024"], WILAYAH)
+
+    assert hasil.df["kode_bps"].tolist() == [3201, 3271, 3273]
+    assert hasil.df["kabupaten"].tolist() == ["Bogor", "Kota Bogor", "Kota Bandung"]
+    assert hasil.df_wilayah["luas_km2"].tolist() == [2991.0, 118.0, 167.0]
+    assert hasil.df_trend_wide["kode_bps"].tolist() == [3201, 3271, 3273, 3204]
+
+    aturan = hasil.masalah.groupby("aturan")["nama"].apply(list).to_dict()
+    assert aturan["nama_tidak_cocok"] == ["Jakarta"]
+    assert aturan["nama_fuzzy"] == ["Kota Bandungg"]
+    assert aturan["kode_ganda"] == ["Bogor"]  # "Kab Bogor" = baris kedua untuk 3201
+    assert aturan["wilayah_hilang"] == ["Bandung"]  # hanya di file data
+    assert aturan["kasus_tidak_konsisten"] == ["Kota Bogor"]  # 30 vs 31
+    assert aturan["lonjakan_tahunan"] == ["Kota Bandung"]  # 9 -> 50, rasio > 5
+    assert hasil.n_error == 2